@@ -1,171 +1,224 @@
 """
 Script to find periods in historical data where PainBot or GainBot would find trades
 This helps identify good date ranges for backtesting
+
+Usage:
+    python find_tradeable_periods.py                          # All stored symbols, last 90 days
+    python find_tradeable_periods.py --days 0                 # Full stored D1 history
+    python find_tradeable_periods.py --symbols "PainX 400" --sync   # Update the store from MT5 first
+
+Reads D1 bars from the local bar store (see generate_synthetic_data.py or
+--sync), so no terminal is needed.
 """
 
-import MetaTrader5 as mt5
-from datetime import datetime, timedelta
+import argparse
+import time
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from pain_gain_bot.config import config
+from pain_gain_bot.data.store import BarStore
+from pain_gain_bot.data.mt5_connector import connector
 from pain_gain_bot.indicators import indicators
 
-def analyze_daily_bias_history(symbol: str, days_back: int = 90):
+HISTORY_BARS = 5  # D1 bars per check_wick_direction window
+STREAK_MAX_GAP_DAYS = 3  # Allow 2-day gaps (weekends) inside a streak
+STREAK_MIN_DAYS = 3
+
+
+def daily_bias_series(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Daily bias for every D1 bar of a history in one pass
+
+    Row i is what check_wick_direction(df.iloc[i-5:i]) reports: the
+    dominant wick of candle i-2. The first five bars have no bias.
+
+    Args:
+        df: D1 OHLC DataFrame
+
+    Returns:
+        DataFrame indexed like df with 'bias' ('SELL', 'BUY' or None),
+        'wick_size' and 'wick_50'
+    """
+    wick_up, wick_size, wick_50 = indicators.wick_direction_series(
+        df['open'], df['high'], df['low'], df['close']
+    )
+
+    # Shift the candle analysis two bars forward onto the day it is reported for
+    count = len(df)
+    source = np.arange(count) - 2
+    valid = np.arange(count) >= HISTORY_BARS
+    source = np.where(valid, source, 0)
+
+    bias = np.where(wick_up[source], 'BUY', 'SELL').astype(object)
+    bias[~valid] = None
+
+    return pd.DataFrame({
+        'bias': bias,
+        'wick_size': np.where(valid, wick_size[source], np.nan),
+        'wick_50': np.where(valid, wick_50[source], np.nan),
+    }, index=df.index)
+
+
+def find_streaks(dates: pd.DatetimeIndex, max_gap_days: int = STREAK_MAX_GAP_DAYS,
+                 min_days: int = STREAK_MIN_DAYS) -> List[Tuple[int, int]]:
+    """
+    Group bias days into streaks with run-length encoding
+
+    Args:
+        dates: Sorted dates of the days with a given bias
+        max_gap_days: Largest calendar gap between consecutive days of a streak
+        min_days: Shortest streak kept
+
+    Returns:
+        (first, last) positions into dates, longest streak first
+        (chronological among equal lengths)
+    """
+    if len(dates) == 0:
+        return []
+
+    days = dates.values.astype('datetime64[D]').astype(np.int64)
+    breaks = np.flatnonzero(np.diff(days) > max_gap_days) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(days)])) - 1
+    lengths = ends - starts + 1
+
+    keep = np.flatnonzero(lengths >= min_days)
+    order = keep[np.argsort(-lengths[keep], kind='stable')]
+    return [(int(starts[i]), int(ends[i])) for i in order]
+
+
+def analyze_daily_bias_history(symbol: str, days_back: int = 90,
+                               store: Optional[BarStore] = None) -> Optional[Dict]:
     """
     Analyze historical daily bias to find good periods for backtesting
 
     Args:
         symbol: Trading symbol
-        days_back: How many days to analyze
+        days_back: How many D1 bars to analyze (0 = full stored history)
+        store: Bar store to read from (default: data.bar_store_dir)
+
+    Returns:
+        Dict with the bias series and the SELL/BUY streaks, or None without data
     """
+    store = store or BarStore()
+    df = store.load(symbol, 'D1', count=days_back or None)
+    if df is None or len(df) == 0:
+        return None
+
+    series = daily_bias_series(df)
+    result = {'symbol': symbol, 'days': len(df), 'series': series}
+    for bias in ('SELL', 'BUY'):
+        dates = series.index[series['bias'].to_numpy() == bias]
+        result[bias] = {'dates': dates, 'streaks': find_streaks(dates)}
+    return result
+
+
+def print_bias_report(result: Dict, days_back: int):
+    """Print bias counts and the top 5 streaks per bot for one symbol"""
+    symbol = result['symbol']
     print(f"\n{'='*70}")
-    print(f" Analyzing {symbol} - Last {days_back} Days")
+    print(f" Analyzing {symbol} - Last {days_back or result['days']} Days")
     print(f"{'='*70}\n")
+    print(f"Analyzing {result['days']} days of data...\n")
+
+    sell, buy = result['SELL'], result['BUY']
+    print(f"SELL Bias Days (good for PainBot): {len(sell['dates'])}")
+    print(f"BUY Bias Days (good for GainBot): {len(buy['dates'])}")
+    print(f"Neutral Days: {result['days'] - len(sell['dates']) - len(buy['dates'])}\n")
+
+    for i, (name, bot, bot_name) in enumerate([('SELL', 'pain', 'PAINBOT'), ('BUY', 'gain', 'GAINBOT')]):
+        bias = result[name]
+        if len(bias['dates']) == 0:
+            continue
+
+        print(("\n" if i else "") + "=" * 70)
+        print(f"RECOMMENDED PERIODS FOR {bot_name} ({name} bias):")
+        print("=" * 70)
+
+        # Print top 5 streaks
+        for rank, (first, last) in enumerate(bias['streaks'][:5], 1):
+            start = bias['dates'][first].strftime('%Y-%m-%d')
+            end = bias['dates'][last].strftime('%Y-%m-%d')
+            print(f"\n{rank}. {start} to {end} ({last - first + 1} {name} days)")
+            print(f"   Run: python run_backtest.py --symbol '{symbol}' --start {start} --days 7 --bot {bot}")
+
+    print("\n" + "=" * 70 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find date ranges with a clear daily bias")
+
+    parser.add_argument(
+        '--symbols',
+        nargs='+',
+        help='Symbols to analyze (default: every symbol in the bar store)'
+    )
+
+    parser.add_argument(
+        '--days',
+        type=int,
+        default=90,
+        help='D1 bars to analyze per symbol, 0 = full history (default: 90)'
+    )
+
+    parser.add_argument(
+        '--store-dir',
+        type=str,
+        help='Bar store directory (default: data.bar_store_dir from config)'
+    )
+
+    parser.add_argument(
+        '--sync',
+        action='store_true',
+        help='Download new D1 bars from MT5 into the store before analyzing'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Symbols analyzed concurrently (default: one per symbol)'
+    )
+
+    args = parser.parse_args()
+    store = BarStore(args.store_dir)
 
-    # Initialize MT5
-    if not mt5.initialize():
-        print(f"ERROR: Failed to initialize MT5: {mt5.last_error()}")
-        return
-
-    try:
-        # Get daily data
-        end_date = datetime.now()
-        rates = mt5.copy_rates_from(symbol, mt5.TIMEFRAME_D1, end_date, days_back)
-
-        if rates is None or len(rates) == 0:
-            print(f"ERROR: No data for {symbol}")
-            return
-
-        # Convert to DataFrame
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        df.set_index('time', inplace=True)
-
-        print(f"Analyzing {len(df)} days of data...\n")
-
-        # Analyze bias for each period
-        sell_periods = []
-        buy_periods = []
-
-        for i in range(5, len(df)):
-            # Get last 5 days
-            df_subset = df.iloc[i-5:i]
-
-            # Check bias
-            direction, wick_size, wick_50 = indicators.check_wick_direction(df_subset)
-
-            date = df.index[i].strftime('%Y-%m-%d')
-
-            if direction == 'DOWN':
-                sell_periods.append({
-                    'date': date,
-                    'bias': 'SELL',
-                    'wick_size': wick_size,
-                    'good_for': 'PainBot'
-                })
-            elif direction == 'UP':
-                buy_periods.append({
-                    'date': date,
-                    'bias': 'BUY',
-                    'wick_size': wick_size,
-                    'good_for': 'GainBot'
-                })
-
-        # Print results
-        print(f"SELL Bias Days (good for PainBot): {len(sell_periods)}")
-        print(f"BUY Bias Days (good for GainBot): {len(buy_periods)}")
-        print(f"Neutral Days: {len(df) - len(sell_periods) - len(buy_periods)}\n")
-
-        # Find consecutive SELL periods
-        if sell_periods:
-            print("=" * 70)
-            print("RECOMMENDED PERIODS FOR PAINBOT (SELL bias):")
-            print("=" * 70)
-
-            # Group consecutive days
-            current_streak = [sell_periods[0]]
-            streaks = []
-
-            for i in range(1, len(sell_periods)):
-                prev_date = datetime.strptime(sell_periods[i-1]['date'], '%Y-%m-%d')
-                curr_date = datetime.strptime(sell_periods[i]['date'], '%Y-%m-%d')
-
-                if (curr_date - prev_date).days <= 3:  # Allow 2-day gaps
-                    current_streak.append(sell_periods[i])
-                else:
-                    if len(current_streak) >= 3:  # At least 3 days
-                        streaks.append(current_streak)
-                    current_streak = [sell_periods[i]]
-
-            if len(current_streak) >= 3:
-                streaks.append(current_streak)
-
-            # Print top 5 streaks
-            streaks.sort(key=lambda x: len(x), reverse=True)
-
-            for i, streak in enumerate(streaks[:5], 1):
-                start = streak[0]['date']
-                end = streak[-1]['date']
-                days = len(streak)
-                print(f"\n{i}. {start} to {end} ({days} SELL days)")
-                print(f"   Run: python run_backtest.py --symbol '{symbol}' --start {start} --days 7 --bot pain")
-
-        # Find consecutive BUY periods
-        if buy_periods:
-            print("\n" + "=" * 70)
-            print("RECOMMENDED PERIODS FOR GAINBOT (BUY bias):")
-            print("=" * 70)
-
-            # Group consecutive days
-            current_streak = [buy_periods[0]]
-            streaks = []
-
-            for i in range(1, len(buy_periods)):
-                prev_date = datetime.strptime(buy_periods[i-1]['date'], '%Y-%m-%d')
-                curr_date = datetime.strptime(buy_periods[i]['date'], '%Y-%m-%d')
-
-                if (curr_date - prev_date).days <= 3:
-                    current_streak.append(buy_periods[i])
-                else:
-                    if len(current_streak) >= 3:
-                        streaks.append(current_streak)
-                    current_streak = [buy_periods[i]]
-
-            if len(current_streak) >= 3:
-                streaks.append(current_streak)
-
-            # Print top 5 streaks
-            streaks.sort(key=lambda x: len(x), reverse=True)
-
-            for i, streak in enumerate(streaks[:5], 1):
-                start = streak[0]['date']
-                end = streak[-1]['date']
-                days = len(streak)
-                print(f"\n{i}. {start} to {end} ({days} BUY days)")
-                print(f"   Run: python run_backtest.py --symbol '{symbol}' --start {start} --days 7 --bot gain")
-
-        print("\n" + "=" * 70 + "\n")
-
-    finally:
-        mt5.shutdown()
-
-
-if __name__ == "__main__":
     print("\n" + "=" * 70)
     print(" HISTORICAL BIAS ANALYSIS")
     print(" Finding good periods for backtesting PainBot and GainBot")
     print("=" * 70)
 
-    # Analyze main symbols
-    symbols = [
-        "PainX 400",
-        "PainX 600",
-        "GainX 400"
-    ]
-
-    for symbol in symbols:
-        analyze_daily_bias_history(symbol, days_back=90)
-
+    symbols = args.symbols or store.symbols() or config.symbols.pain_symbols + config.symbols.gain_symbols
+    if args.sync:
+        if not connector.initialize():
+            print("ERROR: Failed to connect to MT5 - analyzing stored bars only")
+        else:
+            try:
+                for symbol in symbols:
+                    store.sync(symbol, 'D1')
+            finally:
+                connector.shutdown()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers or len(symbols)) as pool:
+        results = list(pool.map(lambda symbol: analyze_daily_bias_history(symbol, args.days, store), symbols))
+    elapsed = time.perf_counter() - started
+
+    for symbol, result in zip(symbols, results):
+        if result is None:
+            print(f"\nERROR: No D1 data for {symbol}")
+        else:
+            print_bias_report(result, args.days)
+
+    total_days = sum(result['days'] for result in results if result is not None)
     print("\n" + "=" * 70)
     print(" ANALYSIS COMPLETE")
     print("=" * 70)
+    print(f"\nScanned {total_days:,} D1 bars across {len(symbols)} symbols in {elapsed * 1000:.1f} ms")
     print("\nUse the recommended commands above to run backtests on periods")
     print("where the strategy should actually find trades!\n")
+
+
+if __name__ == "__main__":
+    main()
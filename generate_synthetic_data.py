@@ -0,0 +1,100 @@
+"""
+Generate synthetic PainX/GainX history into the local bar store
+
+Usage:
+    python generate_synthetic_data.py                                   # All 8 symbols, 2 years
+    python generate_synthetic_data.py --symbols "PainX 400" --years 20  # ~10M M1 bars
+    python generate_synthetic_data.py --store-dir synthetic_store --seed 7
+    python generate_synthetic_data.py --symbols "PainX 400" --years 0.25 --ticks  # + tick paths for --ticks backtests
+
+Backtests and the offline MT5 simulator then run on this data without a
+terminal (set data.bar_store_dir to the same directory).
+"""
+
+import argparse
+import time
+from pain_gain_bot.config import config
+from pain_gain_bot.data.store import BarStore
+from pain_gain_bot.data.synthetic import SpikeIndexGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Pain/Gain index bars")
+
+    parser.add_argument(
+        '--symbols',
+        nargs='+',
+        help='Symbols to generate (default: all configured Pain and Gain symbols)'
+    )
+
+    parser.add_argument(
+        '--start',
+        type=str,
+        default='2023-01-01',
+        help='First day in YYYY-MM-DD format (default: 2023-01-01)'
+    )
+
+    parser.add_argument(
+        '--years',
+        type=float,
+        default=2.0,
+        help='Years of M1 history per symbol (default: 2)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Random seed; each symbol uses seed + its position (default: 42)'
+    )
+
+    parser.add_argument(
+        '--price',
+        type=float,
+        default=10000.0,
+        help='Starting price (default: 10000)'
+    )
+
+    parser.add_argument(
+        '--store-dir',
+        type=str,
+        help='Bar store directory (default: data.bar_store_dir from config)'
+    )
+
+    parser.add_argument(
+        '--ticks',
+        action='store_true',
+        help='Also write a tick path through every M1 bar (for tick-replay backtests)'
+    )
+
+    args = parser.parse_args()
+
+    symbols = args.symbols or config.symbols.pain_symbols + config.symbols.gain_symbols
+    days = int(args.years * 365)
+    store = BarStore(args.store_dir)
+
+    print("\n" + "="*70)
+    print(" Synthetic Pain/Gain Data Generator")
+    print("="*70)
+    print(f"\nStore: {store.root}")
+    print(f"Period: {args.start} + {days} days ({days * 1440:,} M1 bars per symbol)\n")
+
+    for i, symbol in enumerate(symbols):
+        generator = SpikeIndexGenerator(symbol, seed=args.seed + i, start_price=args.price)
+        started = time.perf_counter()
+        bars = generator.write_to_store(args.start, days, store)
+        elapsed = time.perf_counter() - started
+        print(f"[OK] {symbol}: {bars:,} M1 bars + M5..D1 in {elapsed:.1f}s")
+
+        if args.ticks:
+            started = time.perf_counter()
+            ticks = generator.write_ticks_to_store(args.start, days, store, config.simulator.spread_points)
+            elapsed = time.perf_counter() - started
+            print(f"[OK] {symbol}: {ticks:,} ticks in {elapsed:.1f}s")
+
+    print("\nDone!")
+    print("="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,12 @@
 Backtesting module for Pain/Gain trading system
 """
 
+from .bar_index import BarWindowIndex
 from .historical_backtester import HistoricalBacktester
+from .vectorized_backtester import VectorizedBacktester
+from .tick_replay import TickReplayBacktester
+from .parallel import BacktestJob, ParallelBacktestRunner
+from .sweep import ParameterSweep
 
-__all__ = ['HistoricalBacktester']
+__all__ = ['BarWindowIndex', 'HistoricalBacktester', 'VectorizedBacktester', 'TickReplayBacktester',
+           'BacktestJob', 'ParallelBacktestRunner', 'ParameterSweep']
@@ -0,0 +1,150 @@
+"""
+Bar window index for historical backtesting
+Provides O(log n) "as of" access to cached bars without boolean masking
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from ..data.bars import BarSeries
+
+
+class BarWindowIndex:
+    """
+    Time-sliced access to cached OHLC bars
+
+    Each (symbol, timeframe) series is stored once as a DataFrame plus
+    contiguous NumPy column arrays. Bar open times are kept as a sorted
+    int64 array, so the cut point for a simulation time is found with
+    searchsorted and the last `count` bars are returned as positional
+    slices (views) instead of filtering the whole frame on every check.
+    """
+
+    def __init__(self):
+        self._frames = {}   # (symbol, timeframe) -> DataFrame
+        self._times = {}    # (symbol, timeframe) -> int64 nanosecond open times
+        self._arrays = {}   # (symbol, timeframe) -> {column: ndarray}
+        self._series = {}   # (symbol, timeframe) -> BarSeries over the same arrays
+
+    @staticmethod
+    def _to_ns(current_time) -> int:
+        """Convert datetime / Timestamp / datetime64 to int64 nanoseconds"""
+        return int(np.datetime64(current_time, 'ns').astype(np.int64))
+
+    def add(self, symbol: str, timeframe: str, df: pd.DataFrame):
+        """
+        Register bars for a symbol/timeframe
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe (D1, H4, H1, M30, M15, M5, M1)
+            df: OHLC DataFrame indexed by bar open time
+        """
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+
+        key = (symbol, timeframe)
+        self._frames[key] = df
+        self._times[key] = np.ascontiguousarray(
+            df.index.values.astype('datetime64[ns]').view(np.int64)
+        )
+        self._arrays[key] = {
+            column: np.ascontiguousarray(df[column].to_numpy())
+            for column in df.columns
+        }
+        arrays = self._arrays[key]
+        self._series[key] = BarSeries(
+            self._times[key], arrays['open'], arrays['high'], arrays['low'], arrays['close'],
+            arrays.get('tick_volume')
+        )
+
+    def has(self, symbol: str, timeframe: str) -> bool:
+        """Check whether bars are registered for a symbol/timeframe"""
+        return (symbol, timeframe) in self._frames
+
+    def remove(self, symbol: str):
+        """Drop all timeframes registered for a symbol"""
+        for key in [k for k in self._frames if k[0] == symbol]:
+            del self._frames[key]
+            del self._times[key]
+            del self._arrays[key]
+            del self._series[key]
+
+    def frame(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Full registered DataFrame for a symbol/timeframe"""
+        return self._frames.get((symbol, timeframe))
+
+    def times(self, symbol: str, timeframe: str) -> Optional[np.ndarray]:
+        """Sorted int64 nanosecond bar open times for a symbol/timeframe"""
+        return self._times.get((symbol, timeframe))
+
+    def column(self, symbol: str, timeframe: str, column: str) -> Optional[np.ndarray]:
+        """Full-history column array for a symbol/timeframe"""
+        arrays = self._arrays.get((symbol, timeframe))
+        return None if arrays is None else arrays.get(column)
+
+    def cut(self, symbol: str, timeframe: str, current_time: datetime) -> int:
+        """
+        Number of bars opened at or before current_time
+
+        Returns:
+            Position one past the last visible bar (0 if none / unknown)
+        """
+        times = self._times.get((symbol, timeframe))
+        if times is None:
+            return 0
+        return int(np.searchsorted(times, self._to_ns(current_time), side='right'))
+
+    def _bounds(self, symbol: str, timeframe: str, current_time: datetime,
+                count: int) -> Optional[Tuple[int, int]]:
+        """Positional [start, end) bounds of the visible window"""
+        end = self.cut(symbol, timeframe, current_time)
+        if end == 0:
+            return None
+        return max(0, end - count), end
+
+    def window(self, symbol: str, timeframe: str, current_time: datetime,
+               count: int = 500) -> Optional[pd.DataFrame]:
+        """
+        Last `count` bars opened at or before current_time
+
+        Returns:
+            DataFrame slice (no future bars) or None if nothing is visible
+        """
+        bounds = self._bounds(symbol, timeframe, current_time, count)
+        if bounds is None:
+            return None
+        start, end = bounds
+        return self._frames[(symbol, timeframe)].iloc[start:end]
+
+    def series(self, symbol: str, timeframe: str, current_time: datetime,
+               count: int = 500) -> Optional[BarSeries]:
+        """
+        Same window as `window`, as a BarSeries of zero-copy views
+
+        Returns:
+            BarSeries (no future bars) or None if nothing is visible
+        """
+        bounds = self._bounds(symbol, timeframe, current_time, count)
+        if bounds is None:
+            return None
+        start, end = bounds
+        return self._series[(symbol, timeframe)][start:end]
+
+    def arrays(self, symbol: str, timeframe: str, current_time: datetime,
+               count: int = 500) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Same window as `window`, returned as zero-copy NumPy views
+
+        Returns:
+            Dictionary of column -> ndarray view, plus 'time' (int64 ns)
+        """
+        bounds = self._bounds(symbol, timeframe, current_time, count)
+        if bounds is None:
+            return None
+        start, end = bounds
+        key = (symbol, timeframe)
+        views = {column: values[start:end] for column, values in self._arrays[key].items()}
+        views['time'] = self._times[key][start:end]
+        return views
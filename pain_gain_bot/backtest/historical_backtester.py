@@ -4,13 +4,17 @@ Uses actual historical data from MT5 to simulate strategy performance
 """
 
 import pandas as pd
-import MetaTrader5 as mt5
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from ..data.mt5_connector import connector
+from ..data.mt5_api import mt5
+from ..data.mt5_connector import connector, timeframe_constant, rates_to_dataframe
+from ..data.store import bar_store
+from ..data.bars import BarSeries
+from ..data.resample import resample_all, sync_resampled, daily_close_offset
 from ..indicators.technical import indicators
 from ..utils.logger import logger
 from ..config import config
+from .bar_index import BarWindowIndex
 
 
 class HistoricalBacktester:
@@ -18,6 +22,19 @@ class HistoricalBacktester:
     Proper backtesting engine that replays historical data chronologically
     """
 
+    # M1 is optional - not all brokers keep long M1 history
+    TIMEFRAMES = ['D1', 'H4', 'H1', 'M30', 'M15', 'M5']
+
+    BARS_PER_DAY = {
+        'D1': 1,
+        'H4': 6,
+        'H1': 24,
+        'M30': 48,
+        'M15': 96,
+        'M5': 288,
+        'M1': 1440
+    }
+
     def __init__(self, start_date: str, end_date: str, initial_balance: float = 500.0):
         """
         Initialize backtester
@@ -38,11 +55,76 @@ class HistoricalBacktester:
 
         # Cache for historical data
         self.historical_cache = {}
+        self.bar_index = BarWindowIndex()
+
+        # Load from the bar store only, without connecting to the terminal
+        self.offline = False
 
         print(f"[BACKTEST] Initializing historical backtester")
         print(f"[BACKTEST] Period: {start_date} to {end_date}")
         print(f"[BACKTEST] Initial balance: ${initial_balance}")
 
+    def timeframes(self) -> List[str]:
+        """Timeframes loaded per symbol (M1 too when it is the resample base)"""
+        if config.data.resample_base == 'M1':
+            return self.TIMEFRAMES + ['M1']
+        return list(self.TIMEFRAMES)
+
+    def sync_history(self, symbol: str) -> int:
+        """
+        Bring the bar store up to date for a symbol (no-op when offline)
+
+        An empty store is filled back to 100 days before start_date. With
+        data.resample_base set, only the base timeframe is downloaded and
+        the higher timeframes are built from it (also without a terminal
+        connection). Offline backtesters (pool workers) never write to the
+        store: the parent process syncs it once before they start.
+
+        Returns:
+            Number of bars added across all timeframes
+        """
+        if self.offline:
+            return 0
+
+        history_days = (datetime.now() - self.start_date).days + 100
+        base = config.data.resample_base
+        total = 0
+        for tf_name in ([base] if base else self.TIMEFRAMES):
+            added = bar_store.sync(symbol, tf_name, count=history_days * self.BARS_PER_DAY[tf_name] + 500)
+            if added:
+                print(f"[BACKTEST]   Bar store: +{added} new {symbol} {tf_name} bars")
+            total += added
+
+        if base:
+            for tf_name, added in sync_resampled(symbol, base, self.TIMEFRAMES).items():
+                if added:
+                    print(f"[BACKTEST]   Bar store: +{added} {symbol} {tf_name} bars resampled from {base}")
+                total += added
+        return total
+
+    def _download(self, symbol: str, bars_needed: Dict[str, int]) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Fetch the backtest windows straight from MT5 (bar store disabled)
+
+        With data.resample_base set, the base timeframe is the only transfer
+        and every higher timeframe is aggregated from it.
+        """
+        base = config.data.resample_base
+        if base:
+            rates = mt5.copy_rates_from(symbol, timeframe_constant(base), self.end_date, bars_needed[base])
+            if rates is None or len(rates) == 0:
+                return {}
+            resampled = resample_all(rates, [tf for tf in bars_needed if tf != base], daily_close_offset())
+            resampled[base] = rates
+            return {tf: rates_to_dataframe(resampled[tf]) for tf in bars_needed if len(resampled.get(tf, ()))}
+
+        frames = {}
+        for tf_name, count in bars_needed.items():
+            # Get historical bars from MT5
+            rates = mt5.copy_rates_from(symbol, timeframe_constant(tf_name), self.end_date, count)
+            frames[tf_name] = rates_to_dataframe(rates) if rates is not None and len(rates) > 0 else None
+        return frames
+
     def load_historical_data(self, symbol: str) -> bool:
         """
         Pre-load all historical data needed for backtesting
@@ -57,44 +139,31 @@ class HistoricalBacktester:
 
         # Calculate total days needed
         days_needed = (self.end_date - self.start_date).days + 100  # Extra buffer
+        use_store = config.data.use_bar_store
 
-        # M1 is optional - not all brokers keep long M1 history
-        timeframes = {
-            'D1': mt5.TIMEFRAME_D1,
-            'H4': mt5.TIMEFRAME_H4,
-            'H1': mt5.TIMEFRAME_H1,
-            'M30': mt5.TIMEFRAME_M30,
-            'M15': mt5.TIMEFRAME_M15,
-            'M5': mt5.TIMEFRAME_M5,
-        }
+        # Calculate bars needed based on timeframe
+        bars_needed = {tf_name: days_needed * self.BARS_PER_DAY.get(tf_name, 100) + 500
+                       for tf_name in self.timeframes()}
+
+        if use_store:
+            # Download only bars newer than the store, then read the windows from disk
+            self.sync_history(symbol)
+            downloaded = {}
+        else:
+            downloaded = self._download(symbol, bars_needed)
 
         self.historical_cache[symbol] = {}
+        self.bar_index.remove(symbol)
 
-        for tf_name, tf_const in timeframes.items():
+        for tf_name in self.timeframes():
             print(f"[BACKTEST]   Loading {tf_name} data...")
 
-            # Calculate bars needed based on timeframe
-            bars_per_day = {
-                'D1': 1,
-                'H4': 6,
-                'H1': 24,
-                'M30': 48,
-                'M15': 96,
-                'M5': 288,
-                'M1': 1440
-            }
-
-            bars_needed = days_needed * bars_per_day.get(tf_name, 100) + 500
-
-            # Get historical bars from MT5
-            rates = mt5.copy_rates_from(
-                symbol,
-                tf_const,
-                self.end_date,
-                bars_needed
-            )
+            if use_store:
+                df = bar_store.load(symbol, tf_name, end=self.end_date, count=bars_needed[tf_name])
+            else:
+                df = downloaded.get(tf_name)
 
-            if rates is None or len(rates) == 0:
+            if df is None or len(df) == 0:
                 print(f"[BACKTEST] WARNING: No {tf_name} data for {symbol}")
                 # M1 is optional - continue without it
                 if tf_name == 'M1':
@@ -104,17 +173,41 @@ class HistoricalBacktester:
                     print(f"[BACKTEST] ERROR: Missing required {tf_name} data")
                     return False
 
-            # Convert to DataFrame
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('time', inplace=True)
-
             self.historical_cache[symbol][tf_name] = df
+            self.bar_index.add(symbol, tf_name, df)
             print(f"[BACKTEST]   ✓ Loaded {len(df)} {tf_name} bars")
 
         print(f"[BACKTEST] Historical data loaded successfully")
         return True
 
+    def prepare_data(self, symbol: str) -> bool:
+        """
+        Connect to MT5 and load historical data for a symbol
+
+        Without a terminal connection the backtest still runs from bars
+        already cached in the local bar store.
+
+        Returns:
+            True if data is ready for simulation
+        """
+        if self.offline or not connector.initialize(use_demo=True):
+            base = config.data.resample_base or 'M5'
+            if not (config.data.use_bar_store and bar_store.last_time(symbol, base) is not None):
+                if self.offline:
+                    print(f"[BACKTEST] ERROR: No bar store history for {symbol} ({bar_store.root})")
+                else:
+                    print("[BACKTEST] ERROR: Failed to connect to MT5")
+                    print("[BACKTEST] Make sure MetaTrader 5 is open and logged in!")
+                return False
+            if not self.offline:
+                print(f"[BACKTEST] MT5 not available - using bar store history ({bar_store.root})")
+
+        if not self.load_historical_data(symbol):
+            print("[BACKTEST] ERROR: Failed to load historical data")
+            return False
+
+        return True
+
     def get_bars_up_to(self, symbol: str, timeframe: str, current_time: datetime, count: int = 500) -> Optional[pd.DataFrame]:
         """
         Get historical bars UP TO a specific point in time (no future peeking)
@@ -128,22 +221,19 @@ class HistoricalBacktester:
         Returns:
             DataFrame with bars up to current_time
         """
-        if symbol not in self.historical_cache:
-            return None
-
-        if timeframe not in self.historical_cache[symbol]:
-            return None
-
-        df = self.historical_cache[symbol][timeframe]
+        # Binary search on bar open times - only bars at or BEFORE current_time
+        # are visible (no future peeking!)
+        return self.bar_index.window(symbol, timeframe, current_time, count)
 
-        # Get only bars BEFORE current_time (no future peeking!)
-        df_filtered = df[df.index <= current_time]
-
-        if len(df_filtered) == 0:
-            return None
+    def get_series_up_to(self, symbol: str, timeframe: str, current_time: datetime,
+                         count: int = 500) -> Optional[BarSeries]:
+        """
+        Same bars as get_bars_up_to as an array-backed BarSeries
 
-        # Return last 'count' bars
-        return df_filtered.tail(count)
+        Used by the per-check signal logic; DataFrames are only built for
+        reporting.
+        """
+        return self.bar_index.series(symbol, timeframe, current_time, count)
 
     def check_signal_at_time(self, symbol: str, check_time: datetime, bot_type: str, verbose: bool = False) -> Optional[Dict]:
         """
@@ -162,7 +252,7 @@ class HistoricalBacktester:
             # This implements the 6-step confirmation process using historical data
 
             # Step 1: Daily bias from D1
-            df_d1 = self.get_bars_up_to(symbol, 'D1', check_time, count=5)
+            df_d1 = self.get_series_up_to(symbol, 'D1', check_time, count=5)
             if df_d1 is None or len(df_d1) < 2:
                 if verbose:
                     print(f"[VERBOSE] {check_time}: No D1 data")
@@ -193,7 +283,7 @@ class HistoricalBacktester:
                 print(f"[VERBOSE] {check_time}: ✓ Step 1: Daily bias = {daily_bias}")
 
             # Step 2: Check daily stop (50% wick filled)
-            current_price = df_d1['close'].iloc[-1]
+            current_price = df_d1['close'][-1]
             if indicators.is_wick_50_percent_filled(current_price, direction, wick_50_level):
                 if verbose:
                     print(f"[VERBOSE] {check_time}: ✗ Step 2: Daily stop reached (50% wick filled)")
@@ -203,13 +293,15 @@ class HistoricalBacktester:
                 print(f"[VERBOSE] {check_time}: ✓ Step 2: Daily stop not reached")
 
             # Step 3: H4 50% Fibonacci confirmation
-            df_h4 = self.get_bars_up_to(symbol, 'H4', check_time, count=10)
-            df_m15 = self.get_bars_up_to(symbol, 'M15', check_time, count=50)
+            df_h4 = self.get_series_up_to(symbol, 'H4', check_time, count=10)
+            df_m15 = self.get_series_up_to(symbol, 'M15', check_time, count=50)
 
             if df_h4 is None or df_m15 is None:
                 return None
 
-            h4_confirmed, fib_level = indicators.check_h4_50_percent_coverage(df_h4, df_m15, daily_bias)
+            h4_confirmed, fib_level = indicators.check_h4_50_percent_coverage(
+                df_h4, df_m15, daily_bias, lookback=config.strategy.swing_lookbacks.get('M15', 20)
+            )
             if not h4_confirmed:
                 if verbose:
                     print(f"[VERBOSE] {check_time}: ✗ Step 3: H4 50% Fib not confirmed")
@@ -219,15 +311,15 @@ class HistoricalBacktester:
                 print(f"[VERBOSE] {check_time}: ✓ Step 3: H4 50% Fib confirmed")
 
             # Step 4: H1 shingle confirmation
-            df_h1 = self.get_bars_up_to(symbol, 'H1', check_time, count=100)
+            df_h1 = self.get_series_up_to(symbol, 'H1', check_time, count=100)
             if df_h1 is None:
                 return None
 
             shingle, color = indicators.calculate_shingle(df_h1, config.strategy.shingle_ema)
             if daily_bias == 'BUY':
-                h1_confirmed = current_price > shingle.iloc[-1] and color == 'GREEN'
+                h1_confirmed = current_price > shingle[-1] and color == 'GREEN'
             else:  # SELL
-                h1_confirmed = current_price < shingle.iloc[-1] and color == 'RED'
+                h1_confirmed = current_price < shingle[-1] and color == 'RED'
 
             if not h1_confirmed:
                 if verbose:
@@ -238,7 +330,7 @@ class HistoricalBacktester:
                 print(f"[VERBOSE] {check_time}: ✓ Step 4: H1 shingle confirmed")
 
             # Step 5: M30/M15 snake filter
-            df_m30 = self.get_bars_up_to(symbol, 'M30', check_time, count=100)
+            df_m30 = self.get_series_up_to(symbol, 'M30', check_time, count=100)
             if df_m30 is None:
                 return None
 
@@ -269,8 +361,8 @@ class HistoricalBacktester:
 
             # Step 6: M5/M1 entry with purple line
             # Use M1 if available, otherwise use M5
-            df_m5 = self.get_bars_up_to(symbol, 'M5', check_time, count=20)
-            df_m1 = self.get_bars_up_to(symbol, 'M1', check_time, count=20)
+            df_m5 = self.get_series_up_to(symbol, 'M5', check_time, count=20)
+            df_m1 = self.get_series_up_to(symbol, 'M1', check_time, count=20)
 
             if df_m5 is None:
                 return None
@@ -292,7 +384,7 @@ class HistoricalBacktester:
                 return None
 
             # All 6 steps confirmed! Generate signal
-            entry_price = df_entry['close'].iloc[-1]
+            entry_price = df_entry['close'][-1]
 
             if verbose:
                 print(f"[VERBOSE] {check_time}: ✓✓✓ ALL 6 STEPS CONFIRMED! SIGNAL GENERATED!")
@@ -328,16 +420,27 @@ class HistoricalBacktester:
             P/L in USD
         """
         # Get M1 data at exit time, or M5 if M1 not available
-        df_m1 = self.get_bars_up_to(symbol, 'M1', exit_time, count=1)
+        bars = self.bar_index.arrays(symbol, 'M1', exit_time, count=1)
 
-        if df_m1 is not None and len(df_m1) > 0:
-            exit_price = df_m1['close'].iloc[-1]
-        else:
+        if bars is None:
             # Fallback to M5 if M1 not available
-            df_m5 = self.get_bars_up_to(symbol, 'M5', exit_time, count=1)
-            if df_m5 is None or len(df_m5) == 0:
+            bars = self.bar_index.arrays(symbol, 'M5', exit_time, count=1)
+            if bars is None:
                 return 0.0
-            exit_price = df_m5['close'].iloc[-1]
+        return self.trade_pnl(position, float(bars['close'][-1]))
+
+    @staticmethod
+    def trade_pnl(position: Dict, exit_price: float) -> float:
+        """
+        P/L in USD of closing a position at a given price
+
+        Args:
+            position: Position dictionary (action, entry_price, volume)
+            exit_price: Close price
+
+        Returns:
+            P/L in USD
+        """
         entry_price = position['entry_price']
         volume = position['volume']
         action = position['action']
@@ -370,15 +473,8 @@ class HistoricalBacktester:
         print(f"[BACKTEST] Bot type: {bot_type}")
         print(f"[BACKTEST] ========================================\n")
 
-        # Connect to MT5
-        if not connector.initialize(use_demo=True):
-            print("[BACKTEST] ERROR: Failed to connect to MT5")
-            print("[BACKTEST] Make sure MetaTrader 5 is open and logged in!")
-            return None
-
-        # Load all historical data
-        if not self.load_historical_data(symbol):
-            print("[BACKTEST] ERROR: Failed to load historical data")
+        # Connect to MT5 (or fall back to the bar store) and load all historical data
+        if not self.prepare_data(symbol):
             return None
 
         # Run simulation day by day, checking every 5 minutes
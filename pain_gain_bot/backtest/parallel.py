@@ -0,0 +1,196 @@
+"""
+Parallel backtest runner
+Fans (symbol, bot type, date range) jobs out over a process pool
+"""
+
+import contextlib
+import io
+import os
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional
+from ..config import config, Config
+from ..data.mt5_connector import connector
+from .historical_backtester import HistoricalBacktester
+from .relaxed_backtester import RelaxedBacktester
+from .vectorized_backtester import VectorizedBacktester
+
+ENGINES = {
+    'historical': HistoricalBacktester,
+    'relaxed': RelaxedBacktester,
+    'vectorized': VectorizedBacktester,
+}
+
+
+@dataclass
+class BacktestJob:
+    """One backtest run"""
+    symbol: str
+    bot_type: str  # 'PAIN' or 'GAIN'
+    start_date: str  # 'YYYY-MM-DD'
+    end_date: str
+    initial_balance: float = 500.0
+    engine: str = 'vectorized'  # historical, relaxed or vectorized
+
+
+def _init_worker(settings: Config):
+    """Copy the parent's configuration into the worker's global config"""
+    for field in fields(Config):
+        setattr(config, field.name, getattr(settings, field.name))
+
+
+def run_job(job: BacktestJob) -> Dict:
+    """
+    Run a single job from the bar store (executed in a worker process)
+
+    Workers never connect to the terminal; each one memory-maps the bars
+    it needs from the shared on-disk store, so no DataFrames are pickled
+    between processes. Backtester output is captured instead of printed.
+
+    Returns:
+        Result dictionary (job fields, statistics, trades, output)
+    """
+    started = time.perf_counter()
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        backtester = ENGINES[job.engine](job.start_date, job.end_date, job.initial_balance)
+        backtester.offline = True
+        try:
+            results = backtester.run_backtest(job.symbol, bot_type=job.bot_type)
+        except Exception as e:
+            print(f"[BACKTEST] ERROR: {type(e).__name__}: {e}")
+            results = None
+
+    result = {field.name: getattr(job, field.name) for field in fields(BacktestJob)}
+    result.update(results or {'error': 'Backtest failed', 'trades': []})
+    result['seconds'] = time.perf_counter() - started
+    result['output'] = output.getvalue()
+    return result
+
+
+class ParallelBacktestRunner:
+    """
+    Runs backtest jobs across a ProcessPoolExecutor
+
+    The parent process syncs the bar store once (downloading when a
+    terminal is available, resampling from data.resample_base either way);
+    workers only read their slices from disk. Jobs are independent, so
+    throughput scales with the number of cores.
+    """
+
+    def __init__(self, jobs: List[BacktestJob], max_workers: Optional[int] = None):
+        """
+        Args:
+            jobs: Jobs to run
+            max_workers: Worker processes (default: CPU count, capped at len(jobs))
+        """
+        self.jobs = jobs
+        self.max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+        self.results: List[Dict] = []
+
+    def sync_store(self, download: bool = True) -> bool:
+        """
+        Update the bar store for every job symbol
+
+        Downloads new bars from MT5 when connected and builds higher
+        timeframes from data.resample_base (also offline), so workers never
+        append to the shared store themselves.
+
+        Args:
+            download: Connect to MT5 and download new bars first
+
+        Returns:
+            True if connected (False means workers use whatever is stored)
+        """
+        if not config.data.use_bar_store:
+            return False
+        connected = download and connector.initialize(use_demo=True)
+        if not connected and not config.data.resample_base:
+            return False
+
+        for symbol in sorted({job.symbol for job in self.jobs}):
+            start = min(job.start_date for job in self.jobs if job.symbol == symbol)
+            end = max(job.end_date for job in self.jobs if job.symbol == symbol)
+            with contextlib.redirect_stdout(io.StringIO()):
+                syncer = HistoricalBacktester(start, end)
+            syncer.sync_history(symbol)
+        return connected
+
+    def run(self, sync: bool = True) -> List[Dict]:
+        """
+        Run all jobs
+
+        Args:
+            sync: Update the bar store from MT5 first
+
+        Returns:
+            Results in job order
+        """
+        connected = self.sync_store(download=sync)
+        if sync:
+            print("[BACKTEST] Bar store synced from MT5" if connected
+                  else "[BACKTEST] MT5 not available - using bar store history")
+
+        print(f"[BACKTEST] Running {len(self.jobs)} jobs on {self.max_workers} workers")
+        started = time.perf_counter()
+        results = [None] * len(self.jobs)
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(config,)) as pool:
+            futures = {pool.submit(run_job, job): i for i, job in enumerate(self.jobs)}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                status = result.get('error') or f"{result['total_trades']} trades, P/L ${result['total_pnl']:.2f}"
+                print(f"[BACKTEST]   {result['symbol']} {result['bot_type']}: {status} "
+                      f"({result['seconds']:.1f}s)")
+
+        print(f"[BACKTEST] All jobs finished in {time.perf_counter() - started:.1f}s")
+        self.results = results
+        return results
+
+    def summary(self) -> pd.DataFrame:
+        """One row per job with its statistics"""
+        columns = [
+            'symbol', 'bot_type', 'start_date', 'end_date', 'engine', 'total_trades',
+            'winning_trades', 'losing_trades', 'win_rate', 'total_pnl', 'return_pct',
+            'final_balance', 'avg_win', 'avg_loss', 'seconds', 'error',
+        ]
+        df = pd.DataFrame(self.results)
+        return df.reindex(columns=columns)
+
+    def trades(self) -> pd.DataFrame:
+        """All trades from all jobs"""
+        rows = [
+            dict(trade, bot_type=result['bot_type'])
+            for result in self.results
+            for trade in result.get('trades', [])
+        ]
+        return pd.DataFrame(rows)
+
+    def combined_report(self) -> Dict:
+        """Statistics across all jobs (each job trades its own balance)"""
+        trades = self.trades()
+        ok = [r for r in self.results if 'error' not in r]
+        if trades.empty:
+            return {'jobs': len(self.results), 'failed_jobs': len(self.results) - len(ok),
+                    'total_trades': 0, 'winning_trades': 0, 'win_rate': 0, 'total_pnl': 0}
+
+        winning = int((trades['pnl'] > 0).sum())
+        return {
+            'jobs': len(self.results),
+            'failed_jobs': len(self.results) - len(ok),
+            'total_trades': len(trades),
+            'winning_trades': winning,
+            'win_rate': winning / len(trades) * 100,
+            'total_pnl': float(trades['pnl'].sum()),
+        }
+
+    def export_results(self, prefix: str = "parallel_backtest"):
+        """Write <prefix>_summary.csv and <prefix>_trades.csv"""
+        self.summary().to_csv(f"{prefix}_summary.csv", index=False)
+        self.trades().to_csv(f"{prefix}_trades.csv", index=False)
+        print(f"[BACKTEST] Results exported to: {prefix}_summary.csv, {prefix}_trades.csv")
@@ -29,7 +29,7 @@ class RelaxedBacktester(HistoricalBacktester):
         """
         try:
             # Step 1: Daily bias (INFORMATIONAL ONLY)
-            df_d1 = self.get_bars_up_to(symbol, 'D1', check_time, count=5)
+            df_d1 = self.get_series_up_to(symbol, 'D1', check_time, count=5)
             if df_d1 is None or len(df_d1) < 2:
                 if verbose:
                     print(f"[VERBOSE] {check_time}: No D1 data")
@@ -58,7 +58,7 @@ class RelaxedBacktester(HistoricalBacktester):
             signal_bias = 'SELL' if bot_type == 'PAIN' else 'BUY'
 
             # Step 2: Daily stop (WARNING ONLY)
-            current_price = df_d1['close'].iloc[-1]
+            current_price = df_d1['close'][-1]
             if indicators.is_wick_50_percent_filled(current_price, direction, wick_50_level):
                 if verbose:
                     print(f"[VERBOSE] {check_time}: ⚠ Step 2: Daily stop reached (continuing anyway)")
@@ -67,13 +67,15 @@ class RelaxedBacktester(HistoricalBacktester):
                     print(f"[VERBOSE] {check_time}: ✓ Step 2: Daily stop not reached")
 
             # Step 3: H4 50% Fibonacci (OPTIONAL)
-            df_h4 = self.get_bars_up_to(symbol, 'H4', check_time, count=10)
-            df_m15 = self.get_bars_up_to(symbol, 'M15', check_time, count=50)
+            df_h4 = self.get_series_up_to(symbol, 'H4', check_time, count=10)
+            df_m15 = self.get_series_up_to(symbol, 'M15', check_time, count=50)
 
             if df_h4 is None or df_m15 is None:
                 return None
 
-            h4_confirmed, fib_level = indicators.check_h4_50_percent_coverage(df_h4, df_m15, signal_bias)
+            h4_confirmed, fib_level = indicators.check_h4_50_percent_coverage(
+                df_h4, df_m15, signal_bias, lookback=config.strategy.swing_lookbacks.get('M15', 20)
+            )
             if not h4_confirmed:
                 if verbose:
                     print(f"[VERBOSE] {check_time}: ⚠ Step 3: H4 Fib not confirmed (continuing anyway)")
@@ -82,15 +84,15 @@ class RelaxedBacktester(HistoricalBacktester):
                     print(f"[VERBOSE] {check_time}: ✓ Step 3: H4 Fib confirmed")
 
             # Step 4: H1 shingle (OPTIONAL)
-            df_h1 = self.get_bars_up_to(symbol, 'H1', check_time, count=100)
+            df_h1 = self.get_series_up_to(symbol, 'H1', check_time, count=100)
             if df_h1 is None:
                 return None
 
             shingle, color = indicators.calculate_shingle(df_h1, config.strategy.shingle_ema)
             if signal_bias == 'BUY':
-                h1_confirmed = current_price > shingle.iloc[-1] and color == 'GREEN'
+                h1_confirmed = current_price > shingle[-1] and color == 'GREEN'
             else:  # SELL
-                h1_confirmed = current_price < shingle.iloc[-1] and color == 'RED'
+                h1_confirmed = current_price < shingle[-1] and color == 'RED'
 
             if not h1_confirmed:
                 if verbose:
@@ -100,7 +102,7 @@ class RelaxedBacktester(HistoricalBacktester):
                     print(f"[VERBOSE] {check_time}: ✓ Step 4: H1 shingle confirmed")
 
             # Step 5: M30/M15 snake (REQUIRE AT LEAST ONE - RELAXED)
-            df_m30 = self.get_bars_up_to(symbol, 'M30', check_time, count=100)
+            df_m30 = self.get_series_up_to(symbol, 'M30', check_time, count=100)
             if df_m30 is None:
                 return None
 
@@ -138,8 +140,8 @@ class RelaxedBacktester(HistoricalBacktester):
                     print(f"[VERBOSE] {check_time}: ✓ Step 5: M15 snake confirmed (M30:{m30_color})")
 
             # Step 6: M5/M1 entry (OPTIONAL)
-            df_m5 = self.get_bars_up_to(symbol, 'M5', check_time, count=20)
-            df_m1 = self.get_bars_up_to(symbol, 'M1', check_time, count=20)
+            df_m5 = self.get_series_up_to(symbol, 'M5', check_time, count=20)
+            df_m1 = self.get_series_up_to(symbol, 'M1', check_time, count=20)
 
             if df_m5 is None:
                 return None
@@ -163,7 +165,7 @@ class RelaxedBacktester(HistoricalBacktester):
                     print(f"[VERBOSE] {check_time}: ✓ Step 6: Purple line confirmed")
 
             # Generate signal (only M30/M15 snake required)
-            entry_price = df_entry['close'].iloc[-1]
+            entry_price = df_entry['close'][-1]
 
             if verbose:
                 print(f"[VERBOSE] {check_time}: ✓✓✓ SIGNAL GENERATED (RELAXED MODE)!")
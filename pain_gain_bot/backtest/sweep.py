@@ -0,0 +1,221 @@
+"""
+Strategy parameter sweep
+Grid, random and Latin hypercube search over StrategyConfig on the vectorized engine
+"""
+
+import contextlib
+import io
+import itertools
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+from ..config import config, Config, StrategyConfig
+from ..data.mt5_connector import connector
+from .vectorized_backtester import VectorizedBacktester
+
+# Default search ranges (squid_period can be swept too, but backtest signals
+# do not use the squid)
+DEFAULT_SPACE = {
+    'snake_fast_ema': (5, 13),
+    'snake_slow_ema': (15, 34),
+    'shingle_ema': (30, 80),
+    'purple_line_ema': (20, 50),
+    'hold_minutes': (3, 15),
+}
+
+
+def grid_combinations(grid: Dict[str, Sequence]) -> List[Dict]:
+    """Every combination of the listed values"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def random_combinations(space: Dict[str, Tuple[int, int]], samples: int, seed: int = 42) -> List[Dict]:
+    """Uniform random integer samples from inclusive [low, high] ranges"""
+    rng = np.random.default_rng(seed)
+    columns = {name: rng.integers(low, high + 1, samples) for name, (low, high) in space.items()}
+    return [{name: int(columns[name][i]) for name in space} for i in range(samples)]
+
+
+def latin_hypercube(space: Dict[str, Tuple[int, int]], samples: int, seed: int = 42) -> List[Dict]:
+    """
+    Latin hypercube samples from inclusive [low, high] integer ranges
+
+    Each parameter's range is split into `samples` equal strata and every
+    stratum is used exactly once, so all parameters are covered evenly.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (low, high) in space.items():
+        strata = (rng.permutation(samples) + rng.random(samples)) / samples
+        columns[name] = np.minimum(low + np.floor(strata * (high - low + 1)), high).astype(int)
+    return [{name: int(columns[name][i]) for name in space} for i in range(samples)]
+
+
+class SweepEvaluator:
+    """
+    Evaluates parameter combinations on one loaded VectorizedBacktester
+
+    The backtester's series cache is keyed by indicator period, so an EMA
+    column computed for one combination is reused by every later
+    combination with the same period. After the first few combinations
+    almost every step is a cache hit and only signal combination and trade
+    simulation remain.
+    """
+
+    def __init__(self, symbol: str, bot_type: str, start_date: str, end_date: str,
+                 initial_balance: float = 500.0, offline: bool = True):
+        self.symbol = symbol
+        self.bot_type = bot_type
+        self.base = config.strategy
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.backtester = VectorizedBacktester(start_date, end_date, initial_balance)
+            self.backtester.offline = offline
+            self.ready = self.backtester.prepare_data(symbol)
+
+    def evaluate(self, params: Dict) -> Dict:
+        """Run one combination and return its statistics"""
+        bt = self.backtester
+        bt.strategy = replace(self.base, **params)
+        bt.balance = bt.initial_balance
+        bt.positions = []
+        bt.trades = []
+
+        signals = bt.compute_signals(self.symbol, self.bot_type)
+        with contextlib.redirect_stdout(io.StringIO()):
+            bt.simulate_trades(self.symbol, signals, self.bot_type)
+        stats = bt._calculate_statistics()
+
+        balances = np.r_[bt.initial_balance, [t['balance_after'] for t in bt.trades]]
+        drawdown = float((np.maximum.accumulate(balances) - balances).max())
+
+        row = dict(params)
+        row.update({key: stats[key] for key in (
+            'total_trades', 'winning_trades', 'win_rate', 'total_pnl',
+            'return_pct', 'final_balance', 'avg_win', 'avg_loss',
+        )})
+        row['max_drawdown'] = drawdown
+        row['signals'] = int(signals['signal'].sum())
+        return row
+
+
+# Per-process evaluator (created once by the pool initializer)
+_worker_evaluator = None
+
+
+def _init_worker(settings: Config, args: tuple):
+    global _worker_evaluator
+    for field in fields(Config):
+        setattr(config, field.name, getattr(settings, field.name))
+    _worker_evaluator = SweepEvaluator(*args)
+
+
+def _evaluate_chunk(combinations: List[Dict]) -> List[Dict]:
+    if not _worker_evaluator.ready:
+        return [dict(params, error='Data not available') for params in combinations]
+    return [_worker_evaluator.evaluate(params) for params in combinations]
+
+
+class ParameterSweep:
+    """
+    Searches StrategyConfig parameters for one symbol and bot type
+
+    Combinations are split into chunks and evaluated across worker
+    processes. Each worker loads the symbol's bars from the bar store once
+    and keeps its indicator cache for all of its chunks.
+    """
+
+    def __init__(self, symbol: str, bot_type: str, start_date: str, end_date: str,
+                 initial_balance: float = 500.0, max_workers: Optional[int] = None):
+        """
+        Args:
+            symbol: Trading symbol
+            bot_type: 'PAIN' or 'GAIN'
+            start_date: Start date 'YYYY-MM-DD'
+            end_date: End date 'YYYY-MM-DD'
+            initial_balance: Starting balance for every combination
+            max_workers: Worker processes (default: CPU count, 1 = in-process)
+        """
+        self.symbol = symbol
+        self.bot_type = bot_type
+        self.start_date = start_date
+        self.end_date = end_date
+        self.initial_balance = initial_balance
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.results = pd.DataFrame()
+
+    def _validate(self, combinations: List[Dict]):
+        known = {field.name for field in fields(StrategyConfig)}
+        for params in combinations:
+            unknown = set(params) - known
+            if unknown:
+                raise ValueError(f"Unknown strategy parameters: {sorted(unknown)}")
+
+    def _sync(self, download: bool = True):
+        """
+        Update the bar store once before workers start
+
+        Downloads from MT5 when connected and resamples from
+        data.resample_base either way; the (offline) workers only read.
+        """
+        if not config.data.use_bar_store:
+            return
+        connected = download and connector.initialize(use_demo=True)
+        if download and not connected:
+            print("[SWEEP] MT5 not available - using bar store history")
+        if connected or config.data.resample_base:
+            with contextlib.redirect_stdout(io.StringIO()):
+                syncer = VectorizedBacktester(self.start_date, self.end_date)
+            syncer.sync_history(self.symbol)
+
+    def run(self, combinations: List[Dict], rank_by: str = 'total_pnl', sync: bool = True) -> pd.DataFrame:
+        """
+        Evaluate all combinations
+
+        Args:
+            combinations: Parameter dictionaries (see grid_combinations etc.)
+            rank_by: Result column to sort by (descending)
+            sync: Update the bar store from MT5 first
+
+        Returns:
+            Ranked results table (one row per combination)
+        """
+        self._validate(combinations)
+        self._sync(download=sync)
+
+        workers = max(1, min(self.max_workers, len(combinations)))
+        args = (self.symbol, self.bot_type, self.start_date, self.end_date, self.initial_balance)
+
+        print(f"[SWEEP] {self.symbol} {self.bot_type}: {len(combinations)} combinations on {workers} workers")
+        started = time.perf_counter()
+
+        if workers == 1:
+            _init_worker(config, args)
+            rows = _evaluate_chunk(combinations)
+        else:
+            size = max(1, int(np.ceil(len(combinations) / (workers * 4))))
+            chunks = [combinations[i:i + size] for i in range(0, len(combinations), size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(config, args)) as pool:
+                rows = [row for chunk in pool.map(_evaluate_chunk, chunks) for row in chunk]
+
+        elapsed = time.perf_counter() - started
+        print(f"[SWEEP] Finished in {elapsed:.1f}s ({elapsed / max(len(combinations), 1) * 1000:.1f} ms/combination)")
+
+        results = pd.DataFrame(rows)
+        if rank_by in results:
+            results = results.sort_values(rank_by, ascending=False, kind='stable')
+        self.results = results.reset_index(drop=True)
+        self.results.index += 1
+        self.results.index.name = 'rank'
+        return self.results
+
+    def export_results(self, filepath: str = "parameter_sweep.csv"):
+        """Write the ranked results table to CSV"""
+        self.results.to_csv(filepath)
+        print(f"[SWEEP] Results exported to: {filepath}")
@@ -0,0 +1,283 @@
+"""
+Tick-level replay backtester
+Executes entries and exits on recorded bid/ask ticks instead of bar closes
+"""
+
+import random
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..data.mt5_connector import connector
+from ..data.store import bar_store, TICKS_DTYPE
+from ..config import config
+from .historical_backtester import HistoricalBacktester
+
+
+def _msc(value: datetime) -> int:
+    """Epoch milliseconds of a (naive, server clock) datetime"""
+    return pd.Timestamp(value).value // 1_000_000
+
+
+def _datetime(time_msc: int) -> datetime:
+    return pd.Timestamp(int(time_msc), unit='ms').to_pydatetime()
+
+
+class TickCursor:
+    """
+    Forward-only position in a chunked tick stream
+
+    Only the current chunk is held; seeking past its end pulls the next
+    one from the iterator.
+    """
+
+    def __init__(self, chunks: Iterator[np.ndarray]):
+        self._chunks = chunks
+        self._ticks = np.empty(0, dtype=TICKS_DTYPE)
+        self._times = self._ticks['time_msc']  # Contiguous copy for searchsorted
+        self._pos = 0
+        self.last = None  # Last tick passed over
+
+    def seek(self, time_msc: int) -> Tuple[np.ndarray, Optional[np.void]]:
+        """
+        Advance to the first tick at or after time_msc
+
+        Returns:
+            (ticks passed over since the previous seek, tick at the cursor
+            or None past the end of the stream)
+        """
+        passed = []
+        while True:
+            end = max(self._pos, int(np.searchsorted(self._times, time_msc, side='left')))
+            passed.append(self._ticks[self._pos:end])
+            self._pos = end
+            if end < len(self._ticks):
+                break
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._ticks, self._pos = chunk, 0
+            self._times = np.ascontiguousarray(chunk['time_msc'])
+
+        passed = passed[0] if len(passed) == 1 else np.concatenate(passed)
+        if len(passed):
+            self.last = passed[-1]
+        tick = self._ticks[self._pos] if self._pos < len(self._ticks) else None
+        return passed, tick
+
+
+class TickReplayBacktester(HistoricalBacktester):
+    """
+    Backtester that fills on recorded ticks
+
+    Signals come from the same check_signal_at_time as the bar backtester,
+    every 5 minutes on bars up to the check. Execution then follows the
+    tick stream (copy_ticks_range layout, see BarStore.read_ticks):
+
+    - Entries fill at the first tick at or after the check - BUY at the
+      ask, SELL at the bid - plus random adverse slippage of up to
+      backtest.slippage_pips. Entries are skipped when that tick's spread
+      exceeds risk.max_spread_pips or the slippage exceeds
+      risk.max_slippage_pips.
+    - Exits fill at the first tick after the hold period (BUY at the bid,
+      SELL at the ask), not at the next check, and each trade records its
+      max adverse / favourable excursion over the ticks it was open.
+
+    Ticks are streamed from the bar store backtest.tick_chunk_size at a
+    time, so memory stays bounded for months of ticks.
+    """
+
+    def __init__(self, start_date: str, end_date: str, initial_balance: float = 500.0):
+        super().__init__(start_date, end_date, initial_balance)
+        self._rng = random.Random(config.backtest.seed)
+        self.skipped = {'spread': 0, 'slippage': 0, 'no_tick': 0}
+        print(f"[BACKTEST] Execution: tick replay (bid/ask fills)")
+
+    def prepare_data(self, symbol: str) -> bool:
+        """Load bars as the bar backtester does, then bring recorded ticks up to date"""
+        if not super().prepare_data(symbol):
+            return False
+
+        if not self.offline and config.data.use_bar_store:
+            added = bar_store.sync_ticks(symbol, self.start_date, self.end_date + timedelta(days=1))
+            if added:
+                print(f"[BACKTEST]   Bar store: +{added:,} new {symbol} ticks")
+
+        ticks = bar_store.read_ticks(symbol)
+        if len(ticks) == 0 or ticks['time_msc'][-1] < _msc(self.start_date):
+            print(f"[BACKTEST] ERROR: No recorded ticks for {symbol} in {bar_store.root}")
+            print("[BACKTEST] Connect MT5 or run generate_synthetic_data.py --ticks")
+            return False
+        return True
+
+    def _point(self, symbol: str) -> float:
+        """Symbol point from the terminal, else the simulator's digits"""
+        return connector.symbols_info.get(symbol, {}).get('point') or 10.0 ** -config.simulator.digits
+
+    def _slippage(self, point: float) -> float:
+        if config.backtest.slippage_pips <= 0:
+            return 0.0
+        return self._rng.uniform(0.0, config.backtest.slippage_pips) * point
+
+    def _open(self, symbol: str, signal: Dict, tick) -> Optional[Dict]:
+        """Fill a signal at a tick, or None if the spread/slippage check rejects it"""
+        point = self._point(symbol)
+        spread = float(tick['ask'] - tick['bid'])
+        if spread > config.risk.max_spread_pips * point + 1e-12:
+            self.skipped['spread'] += 1
+            return None
+
+        slippage = self._slippage(point)
+        if slippage > config.risk.max_slippage_pips * point:
+            self.skipped['slippage'] += 1
+            return None
+
+        buy = signal['action'] == 'BUY'
+        entry_time = _datetime(tick['time_msc'])
+        return {
+            'symbol': symbol,
+            'action': signal['action'],
+            'signal_price': signal['price'],
+            'entry_price': float(tick['ask']) + slippage if buy else float(tick['bid']) - slippage,
+            'entry_time': entry_time,
+            'entry_spread': spread,
+            'volume': config.risk.lot_size,
+            'hold_minutes': config.strategy.hold_minutes,
+            'exit_due': entry_time + timedelta(minutes=config.strategy.hold_minutes),
+            'low': float(tick['bid'] if buy else tick['ask']),
+            'high': float(tick['bid'] if buy else tick['ask']),
+        }
+
+    @staticmethod
+    def _track(positions: List[Dict], ticks: np.ndarray):
+        """Widen each open position's price range with ticks it was open for"""
+        if len(ticks) == 0:
+            return
+        for pos in positions:
+            side = ticks['bid'] if pos['action'] == 'BUY' else ticks['ask']
+            pos['low'] = min(pos['low'], float(side.min()))
+            pos['high'] = max(pos['high'], float(side.max()))
+
+    def _close(self, pos: Dict, tick, reason: str):
+        """Fill an exit at a tick and record the trade"""
+        buy = pos['action'] == 'BUY'
+        slippage = self._slippage(self._point(pos['symbol']))
+        exit_price = float(tick['bid']) - slippage if buy else float(tick['ask']) + slippage
+        pnl = self.trade_pnl(pos, exit_price)
+        self.balance += pnl
+
+        worst, best = (pos['low'], pos['high']) if buy else (pos['high'], pos['low'])
+        trade_record = {
+            **{k: v for k, v in pos.items() if k not in ('exit_due', 'low', 'high')},
+            'exit_price': exit_price,
+            'exit_time': _datetime(tick['time_msc']),
+            'exit_reason': reason,
+            'pnl': pnl,
+            'mae': min(self.trade_pnl(pos, worst), 0.0),
+            'mfe': max(self.trade_pnl(pos, best), 0.0),
+            'balance_after': self.balance
+        }
+        self.trades.append(trade_record)
+        self.positions.remove(pos)
+        print(f"[BACKTEST]   Closed: P/L ${pnl:.2f} @ {exit_price:.2f} | Balance: ${self.balance:.2f}")
+
+    def run_backtest(self, symbol: str, bot_type: str = 'PAIN') -> Dict:
+        """
+        Run complete backtest with tick execution
+
+        Args:
+            symbol: Trading symbol
+            bot_type: 'PAIN' or 'GAIN'
+
+        Returns:
+            Results dictionary
+        """
+        print(f"\n[BACKTEST] ========================================")
+        print(f"[BACKTEST] Running tick-replay backtest for {symbol}")
+        print(f"[BACKTEST] Bot type: {bot_type}")
+        print(f"[BACKTEST] ========================================\n")
+
+        if not self.prepare_data(symbol):
+            return None
+
+        cursor = TickCursor(bar_store.iter_ticks(
+            symbol, self.start_date, self.end_date + timedelta(days=1), config.backtest.tick_chunk_size
+        ))
+        current_date = self.start_date
+        trade_count = 0
+        checks_done = 0
+
+        print(f"\n[BACKTEST] Starting simulation...")
+        print(f"[BACKTEST] Checking every 5 minutes for signals, filling on ticks...\n")
+
+        while current_date <= self.end_date:
+            day_str = current_date.strftime('%Y-%m-%d')
+
+            for minutes in range(0, 24 * 60, 5):
+                check_time = current_date + timedelta(minutes=minutes)
+                if check_time > self.end_date:
+                    break
+
+                # Exits due since the last check, each at its own tick
+                for pos in sorted(self.positions, key=lambda p: p['exit_due']):
+                    if pos['exit_due'] > check_time:
+                        break
+                    passed, tick = cursor.seek(_msc(pos['exit_due']))
+                    self._track(self.positions, passed)
+                    if tick is not None:
+                        self._close(pos, tick, 'Hold period complete')
+
+                passed, tick = cursor.seek(_msc(check_time))
+                self._track(self.positions, passed)
+
+                checks_done += 1
+                signal = self.check_signal_at_time(symbol, check_time, bot_type, verbose=checks_done <= 50)
+                if not signal:
+                    continue
+
+                # No tick before the position would have to close: market gap
+                if tick is None or tick['time_msc'] >= _msc(check_time + timedelta(minutes=config.strategy.hold_minutes)):
+                    self.skipped['no_tick'] += 1
+                    continue
+
+                position = self._open(symbol, signal, tick)
+                if position is None:
+                    continue
+
+                self.positions.append(position)
+                trade_count += 1
+                print(f"[BACKTEST] Trade #{trade_count}: {position['action']} @ {position['entry_price']:.2f} "
+                      f"(signal {signal['price']:.2f}, spread {position['entry_spread']:.2f}) "
+                      f"at {position['entry_time'].strftime('%Y-%m-%d %H:%M:%S')}")
+
+            if current_date.day == 1 or current_date == self.end_date:
+                print(f"[BACKTEST] Progress: {day_str} | Trades: {trade_count} | Balance: ${self.balance:.2f}")
+
+            current_date += timedelta(days=1)
+
+        # Close any remaining positions at the first tick after the end (or the last tick)
+        for pos in sorted(self.positions, key=lambda p: p['exit_due']):
+            passed, tick = cursor.seek(_msc(min(pos['exit_due'], self.end_date)))
+            self._track(self.positions, passed)
+            tick = tick if tick is not None else cursor.last
+            if tick is not None:
+                self._close(pos, tick, 'Backtest end')
+
+        self.positions = []
+
+        results = self._calculate_statistics()
+        results['skipped'] = dict(self.skipped)
+
+        print(f"\n[BACKTEST] ========================================")
+        print(f"[BACKTEST] BACKTEST COMPLETE")
+        print(f"[BACKTEST] ========================================")
+        print(f"[BACKTEST] Signal checks: {checks_done}")
+        print(f"[BACKTEST] Total trades: {results['total_trades']}")
+        print(f"[BACKTEST] Skipped entries: {self.skipped['spread']} spread, "
+              f"{self.skipped['slippage']} slippage, {self.skipped['no_tick']} no tick")
+        print(f"[BACKTEST] Winning trades: {results['winning_trades']} ({results['win_rate']:.1f}%)")
+        print(f"[BACKTEST] Final balance: ${results['final_balance']:.2f}")
+        print(f"[BACKTEST] Total P/L: ${results['total_pnl']:.2f} ({results['return_pct']:.2f}%)")
+        print(f"[BACKTEST] ========================================\n")
+
+        return results
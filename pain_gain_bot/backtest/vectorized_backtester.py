@@ -0,0 +1,307 @@
+"""
+Vectorized Historical Backtesting Engine
+Evaluates the 6-step confirmation process over the whole history at once
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from ..indicators.technical import indicators
+from ..config import config, StrategyConfig
+from .historical_backtester import HistoricalBacktester
+
+
+class VectorizedBacktester(HistoricalBacktester):
+    """
+    Backtester that computes every confirmation step once per timeframe as a
+    full-history series, then aligns the series to the 5-minute check grid
+    with as-of (backward) joins on bar open times
+
+    Each indicator is evaluated over exactly the trailing window of bars that
+    check_signal_at_time fetches (see WINDOWS), so EMA seeding and the
+    resulting signal set match the step-by-step engine.
+    """
+
+    # Bar counts requested per timeframe by check_signal_at_time
+    WINDOWS = {'D1': 5, 'H4': 10, 'H1': 100, 'M30': 100, 'M15': 50, 'M5': 20, 'M1': 20}
+
+    BREAK_LOOKBACK = 5
+    RETEST_TOLERANCE = 0.0002
+
+    def __init__(self, start_date: str, end_date: str, initial_balance: float = 500.0,
+                 strategy: Optional[StrategyConfig] = None):
+        """
+        Initialize vectorized backtester
+
+        Args:
+            start_date: Start date 'YYYY-MM-DD'
+            end_date: End date 'YYYY-MM-DD'
+            initial_balance: Starting balance
+            strategy: Strategy parameters (defaults to config.strategy)
+        """
+        super().__init__(start_date, end_date, initial_balance)
+        self.strategy = strategy if strategy is not None else config.strategy
+
+        # (symbol, timeframe, name, *params) -> full-history array
+        self._series_cache = {}
+
+    def check_grid(self) -> pd.DatetimeIndex:
+        """5-minute check times from start_date to end_date (inclusive)"""
+        return pd.date_range(self.start_date, self.end_date, freq='5min')
+
+    def _series(self, key: tuple, compute):
+        """Memoize a full-history series for the lifetime of the backtester"""
+        if key not in self._series_cache:
+            self._series_cache[key] = compute()
+        return self._series_cache[key]
+
+    def _column(self, symbol: str, timeframe: str, column: str) -> np.ndarray:
+        """Full-history column array for a symbol/timeframe"""
+        return self.bar_index.column(symbol, timeframe, column)
+
+    def _asof(self, symbol: str, timeframe: str, grid_ns: np.ndarray) -> np.ndarray:
+        """
+        As-of join of the check grid onto bar open times
+
+        Returns:
+            Number of visible bars at each check time (0 = none / not loaded)
+        """
+        times = self.bar_index.times(symbol, timeframe)
+        if times is None:
+            return np.zeros(len(grid_ns), dtype=np.int64)
+        return np.searchsorted(times, grid_ns, side='right')
+
+    def _window_ema(self, symbol: str, timeframe: str, period: int, lag: int = 0) -> np.ndarray:
+        """EMA of the close over the timeframe's fetch window, at every bar"""
+        window = self.WINDOWS[timeframe]
+        return self._series(
+            (symbol, timeframe, 'ema', period, window, lag),
+            lambda: indicators.calculate_window_ema(
+                self._column(symbol, timeframe, 'close'), period, window, lag
+            )
+        )
+
+    def _d1_wick(self, symbol: str):
+        """Per D1 bar: dominant wick is upward, and its 50% level"""
+        def compute():
+            wick_up, _, wick_50 = indicators.wick_direction_series(
+                self._column(symbol, 'D1', 'open'),
+                self._column(symbol, 'D1', 'high'),
+                self._column(symbol, 'D1', 'low'),
+                self._column(symbol, 'D1', 'close'),
+            )
+            return wick_up, wick_50
+
+        return self._series((symbol, 'D1', 'wick'), compute)
+
+    def _h4_coverage(self, symbol: str, bias: str) -> np.ndarray:
+        """
+        Per M15 bar: the largest-body H4 candle of the three before the
+        forming H4 bar spans the 50% level of the M15 swing
+        """
+        lookback = self.strategy.swing_lookbacks.get('M15', 20)
+
+        def compute():
+            # H4 opens fall on M15 opens, so the H4 bars visible at an M15 bar's
+            # open are the ones visible at any check time inside that bar
+            h4_count = np.searchsorted(self.bar_index.times(symbol, 'H4'),
+                                       self.bar_index.times(symbol, 'M15'), side='right')
+            return indicators.h4_50_percent_coverage_series(
+                self._column(symbol, 'M15', 'high'),
+                self._column(symbol, 'M15', 'low'),
+                self._column(symbol, 'H4', 'open'),
+                self._column(symbol, 'H4', 'close'),
+                self._column(symbol, 'H4', 'high'),
+                self._column(symbol, 'H4', 'low'),
+                h4_count, bias, lookback=lookback,
+            )['covers']
+
+        return self._series((symbol, 'M15', 'h4_coverage', bias, lookback), compute)
+
+    def _break_retest(self, symbol: str, timeframe: str, bias: str) -> np.ndarray:
+        """
+        Per entry bar: purple line break in the previous BREAK_LOOKBACK bars
+        followed by a retest touch on the current bar
+        """
+        period = self.strategy.purple_line_ema
+
+        def compute():
+            # Each lag is tested against the EMA of the window fetched at that bar
+            return indicators.purple_line_break_retest_series(
+                self._column(symbol, timeframe, 'open'),
+                self._column(symbol, timeframe, 'close'),
+                self._column(symbol, timeframe, 'low'),
+                self._column(symbol, timeframe, 'high'),
+                self._window_ema(symbol, timeframe, period),
+                bias,
+                lookback=self.BREAK_LOOKBACK,
+                tolerance=self.RETEST_TOLERANCE,
+                purple_at_lag=lambda lag: self._window_ema(symbol, timeframe, period, lag),
+            )
+
+        return self._series((symbol, timeframe, 'break_retest', bias, period), compute)
+
+    @staticmethod
+    def _take(values: np.ndarray, visible: np.ndarray, offset: int = 1) -> np.ndarray:
+        """Gather values[visible - offset], clamping positions with no bar to 0"""
+        return values[np.maximum(visible - offset, 0)]
+
+    def compute_signals(self, symbol: str, bot_type: str) -> pd.DataFrame:
+        """
+        Evaluate all six confirmation steps at every check time
+
+        Args:
+            symbol: Trading symbol (historical data must be loaded)
+            bot_type: 'PAIN' (SELL) or 'GAIN' (BUY)
+
+        Returns:
+            DataFrame indexed by check time with one boolean column per step,
+            the combined 'signal' mask and the entry 'price'
+        """
+        grid = self.check_grid()
+        grid_ns = grid.values.astype('datetime64[ns]').view(np.int64)
+        bias = 'SELL' if bot_type == 'PAIN' else 'BUY'
+        is_buy = bias == 'BUY'
+        strategy = self.strategy
+
+        visible = {tf: self._asof(symbol, tf, grid_ns) for tf in self.WINDOWS}
+
+        # Step 1: Daily bias from the previous D1 candle's dominant wick
+        wick_up, wick_50 = self._d1_wick(symbol)
+        d1_wick_up = self._take(wick_up, visible['D1'], offset=2)
+        d1_bias = (visible['D1'] >= 2) & (d1_wick_up if is_buy else ~d1_wick_up)
+
+        # Step 2: Daily stop (50% of the wick filled by the current D1 close)
+        current_price = self._take(self._column(symbol, 'D1', 'close'), visible['D1'])
+        d1_wick_50 = self._take(wick_50, visible['D1'], offset=2)
+        day_stopped = current_price >= d1_wick_50 if is_buy else current_price <= d1_wick_50
+
+        # Step 3: H4 largest-body candle covers the M15 swing 50% Fibonacci level
+        swing_lookback = strategy.swing_lookbacks.get('M15', 20)
+        h4_50_percent = ((visible['H4'] >= 2) & (visible['M15'] >= swing_lookback) &
+                         self._take(self._h4_coverage(symbol, bias), visible['M15']))
+
+        # Step 4: H1 shingle
+        shingle = self._take(self._window_ema(symbol, 'H1', strategy.shingle_ema), visible['H1'])
+        h1_close = self._take(self._column(symbol, 'H1', 'close'), visible['H1'])
+        if is_buy:
+            h1_shingle = (current_price > shingle) & (h1_close > shingle)
+        else:
+            h1_shingle = (current_price < shingle) & ~(h1_close > shingle)
+        h1_shingle &= visible['H1'] >= 1
+
+        # Step 5: M30 and M15 snake colors
+        snake_green = {}
+        for tf in ('M30', 'M15'):
+            fast = self._take(self._window_ema(symbol, tf, strategy.snake_fast_ema), visible[tf])
+            slow = self._take(self._window_ema(symbol, tf, strategy.snake_slow_ema), visible[tf])
+            snake_green[tf] = fast > slow
+        if is_buy:
+            m30_m15_snake = snake_green['M30'] & snake_green['M15']
+        else:
+            m30_m15_snake = ~snake_green['M30'] & ~snake_green['M15']
+        m30_m15_snake &= visible['M30'] >= 1
+
+        # Step 6: Purple line break/retest on M1 when available, otherwise M5
+        use_m1 = visible['M1'] >= 1
+        entry = self._take(self._break_retest(symbol, 'M5', bias), visible['M5'])
+        price = self._take(self._column(symbol, 'M5', 'close'), visible['M5'])
+        if use_m1.any():
+            entry = np.where(use_m1, self._take(self._break_retest(symbol, 'M1', bias), visible['M1']), entry)
+            price = np.where(use_m1, self._take(self._column(symbol, 'M1', 'close'), visible['M1']), price)
+        m5_m1_entry = entry & (visible['M5'] >= 1)
+
+        signal = (d1_bias & ~day_stopped & (visible['H4'] >= 1) & (visible['M15'] >= 1) &
+                  h4_50_percent & h1_shingle & m30_m15_snake & m5_m1_entry)
+
+        return pd.DataFrame({
+            'd1_bias': d1_bias,
+            'day_stopped': day_stopped,
+            'h4_50_percent': h4_50_percent,
+            'h1_shingle': h1_shingle,
+            'm30_m15_snake': m30_m15_snake,
+            'm5_m1_entry': m5_m1_entry,
+            'signal': signal,
+            'price': np.where(signal, price, np.nan),
+        }, index=grid)
+
+    def simulate_trades(self, symbol: str, signals: pd.DataFrame, bot_type: str):
+        """
+        Open a position at every signal and close it at the first check time
+        at least hold_minutes later (same ordering as the step-by-step loop)
+        """
+        grid = signals.index
+        action = 'SELL' if bot_type == 'PAIN' else 'BUY'
+        hold_minutes = self.strategy.hold_minutes
+
+        entries = np.flatnonzero(signals['signal'].to_numpy())
+        exits = grid.searchsorted(grid[entries] + pd.Timedelta(minutes=hold_minutes), side='left')
+        order = np.argsort(exits, kind='stable')
+
+        for n in order:
+            entry_time = grid[entries[n]].to_pydatetime()
+            position = {
+                'symbol': symbol,
+                'action': action,
+                'entry_price': float(signals['price'].iloc[entries[n]]),
+                'entry_time': entry_time,
+                'volume': config.risk.lot_size,
+                'hold_minutes': hold_minutes
+            }
+
+            if exits[n] < len(grid):
+                exit_time = grid[exits[n]].to_pydatetime()
+                exit_reason = 'Hold period complete'
+            else:
+                exit_time = self.end_date
+                exit_reason = 'Backtest end'
+
+            pnl = self.simulate_trade_exit(position, exit_time, symbol)
+            self.balance += pnl
+
+            self.trades.append({
+                **position,
+                'exit_time': exit_time,
+                'exit_reason': exit_reason,
+                'pnl': pnl,
+                'balance_after': self.balance
+            })
+
+    def run_backtest(self, symbol: str, bot_type: str = 'PAIN') -> Dict:
+        """
+        Run complete backtest with vectorized signal evaluation
+
+        Args:
+            symbol: Trading symbol
+            bot_type: 'PAIN' or 'GAIN'
+
+        Returns:
+            Results dictionary
+        """
+        print(f"\n[BACKTEST] ========================================")
+        print(f"[BACKTEST] Running vectorized backtest for {symbol}")
+        print(f"[BACKTEST] Bot type: {bot_type}")
+        print(f"[BACKTEST] ========================================\n")
+
+        # Connect to MT5 (or fall back to the bar store) and load all historical data
+        if not self.prepare_data(symbol):
+            return None
+
+        signals = self.compute_signals(symbol, bot_type)
+        print(f"[BACKTEST] Evaluated {len(signals)} checks | Signals: {int(signals['signal'].sum())}")
+
+        self.simulate_trades(symbol, signals, bot_type)
+
+        results = self._calculate_statistics()
+
+        print(f"\n[BACKTEST] ========================================")
+        print(f"[BACKTEST] BACKTEST COMPLETE")
+        print(f"[BACKTEST] ========================================")
+        print(f"[BACKTEST] Signal checks: {len(signals)}")
+        print(f"[BACKTEST] Total trades: {results['total_trades']}")
+        print(f"[BACKTEST] Winning trades: {results['winning_trades']} ({results['win_rate']:.1f}%)")
+        print(f"[BACKTEST] Final balance: ${results['final_balance']:.2f}")
+        print(f"[BACKTEST] Total P/L: ${results['total_pnl']:.2f} ({results['return_pct']:.2f}%)")
+        print(f"[BACKTEST] ========================================\n")
+
+        return results
@@ -2,5 +2,7 @@
 
 from .pain_bot import PainBot
 from .gain_bot import GainBot
+from .scheduler import BarCloseScheduler
+from .runtime import TradingRuntime
 
-__all__ = ['PainBot', 'GainBot']
+__all__ = ['PainBot', 'GainBot', 'BarCloseScheduler', 'TradingRuntime']
@@ -3,16 +3,19 @@ GainBot - Automated BUY trading bot for GainX symbols
 Implements the Pain/Gain BUY strategy with multi-timeframe confirmations
 """
 
-import time
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from ..data.mt5_connector import connector
+from ..data.snapshot import MarketSnapshot
 from ..strategy.signals import SignalEngine
 from ..strategy.order_manager import OrderManager
 from ..strategy.risk_manager import risk_manager
 from ..utils.logger import logger
+from ..utils.latency import latency
+from ..utils.metrics import metrics
 from ..utils.trade_exporter import trade_exporter
 from ..config import config
+from .scheduler import BarCloseScheduler
 
 class GainBot:
     """
@@ -28,16 +31,18 @@ class GainBot:
         self.symbols = config.symbols.gain_symbols
         self.signal_engine = SignalEngine()
         self.order_manager = OrderManager(self.bot_type, self.magic_number)
+        self.scheduler = BarCloseScheduler(self.symbols)
 
         self.running = False
         self.iteration = 0
+        self.snapshot = None  # MarketSnapshot of the current cycle
 
     def initialize(self) -> bool:
         """Initialize bot and connect to MT5"""
         logger.info(f"=== Initializing {self.name} ===")
 
-        # Connect to MT5
-        if not connector.initialize(use_demo=config.broker.use_demo):
+        # Connect to MT5 (unless a shared runtime already holds the session)
+        if not connector.connected and not connector.initialize(use_demo=config.broker.use_demo):
             logger.error("Failed to connect to MT5")
             return False
 
@@ -51,6 +56,7 @@ class GainBot:
             return False
 
         self.symbols = valid_symbols
+        self.scheduler.symbols = valid_symbols
         logger.info(f"[OK] Active symbols: {self.symbols}")
 
         # Initialize risk manager
@@ -69,41 +75,14 @@ class GainBot:
 
         try:
             while self.running:
-                self.iteration += 1
-
-                # Check daily reset
-                risk_manager.check_daily_reset()
-
-                # Check if we can trade
-                can_trade, reason = risk_manager.check_daily_limits()
-                if not can_trade:
-                    logger.info(f"⏸ Trading paused: {reason}")
-                    time.sleep(60)  # Wait 1 minute before rechecking
-                    continue
-
-                # Check trading session
-                if not risk_manager.is_trading_session():
-                    if self.iteration % 60 == 1:  # Log every 60 iterations
-                        logger.info("⏸ Outside trading session")
-                    time.sleep(60)
-                    continue
-
-                # Manage existing positions
-                self.order_manager.manage_positions()
-
-                # Scan symbols for signals
-                for symbol in self.symbols:
-                    try:
-                        self.process_symbol(symbol)
-                    except Exception as e:
-                        logger.error(f"Error processing {symbol}", e)
-
-                # Log status periodically
-                if self.iteration % 20 == 0:
-                    self.log_status()
-
-                # Sleep between iterations (e.g., check every 30 seconds)
-                time.sleep(30)
+                # Sleep until the next M1/M5 close (or an earlier hold expiry)
+                if not self.scheduler.wait(self.hold_expiries()):
+                    break
+
+                if self.start_cycle():
+                    for symbol in self.symbols:
+                        self.scan_symbol(symbol)
+                    self.finish_cycle()
 
         except KeyboardInterrupt:
             logger.info(f"\n{self.name} stopped by user")
@@ -112,17 +91,78 @@ class GainBot:
         finally:
             self.shutdown()
 
-    def process_symbol(self, symbol: str):
-        """Process trading logic for a single symbol"""
+    def hold_expiries(self) -> List[datetime]:
+        """Hold expiry times of open positions (the scheduler also wakes for these)"""
+        return [p['hold_until'] for p in self.order_manager.active_positions.values()]
+
+    def start_cycle(self) -> bool:
+        """
+        Run the per-cycle checks and manage open positions
+
+        Returns:
+            True if symbols should be scanned this cycle
+        """
+        self.iteration += 1
+        metrics.inc('paingain_iterations_total', bot=self.bot_type)
+        self.snapshot = MarketSnapshot()
+
+        # Check daily reset
+        risk_manager.check_daily_reset()
+
+        # Check if we can trade
+        can_trade, reason = risk_manager.check_daily_limits(self.snapshot)
+        if not can_trade:
+            logger.info(f"⏸ Trading paused: {reason}")
+            return False
+
+        # Check trading session
+        if not risk_manager.is_trading_session():
+            if self.iteration % 60 == 1:  # Log every 60 iterations
+                logger.info("⏸ Outside trading session")
+            return False
+
+        # Manage existing positions
+        self.order_manager.manage_positions(self.snapshot)
+
+        return True
+
+    def scan_symbol(self, symbol: str):
+        """Evaluate one symbol if any of its bars closed since the last scan"""
+        try:
+            closed = self.scheduler.closed_timeframes(symbol)
+            if not closed:
+                return  # Woken for a hold expiry, no bar closed
+            self.process_symbol(symbol, closed, self.snapshot)
+        except Exception as e:
+            logger.error(f"Error processing {symbol}", e)
+
+    def finish_cycle(self):
+        """Log status periodically"""
+        if self.iteration % 20 == 0:
+            self.log_status()
+
+    def process_symbol(self, symbol: str, closed_timeframes: Optional[List[str]] = None,
+                       snapshot: Optional[MarketSnapshot] = None):
+        """
+        Process trading logic for a single symbol
+
+        Args:
+            symbol: Trading symbol
+            closed_timeframes: Timeframes whose bar just closed (None = evaluate all stages)
+            snapshot: Market data shared by this cycle's checks (default: a new one)
+        """
+        snapshot = snapshot or MarketSnapshot()
         # Generate signal
-        signal = self.signal_engine.generate_signal(symbol)
+        signal = self.signal_engine.generate_signal(symbol, closed_timeframes, snapshot)
+        metrics.inc('paingain_signals_total', bot=self.bot_type, symbol=symbol,
+                    gate=self.signal_engine.outcome(signal))
 
         # Check if we have a BUY signal
         if signal['action'] == 'BUY':
             logger.info(f"[#] BUY signal detected for {symbol}")
 
             # Get account info for position sizing
-            account_info = connector.get_account_info()
+            account_info = snapshot.get_account_info()
             if not account_info:
                 logger.warning(f"Cannot get account info for {symbol}")
                 return
@@ -131,7 +171,7 @@ class GainBot:
             lot_size = risk_manager.calculate_position_size(symbol, account_info['balance'])
 
             # Validate trade
-            can_trade, reason = risk_manager.validate_trade(symbol, 'BUY', lot_size)
+            can_trade, reason = risk_manager.validate_trade(symbol, 'BUY', lot_size, snapshot)
             if not can_trade:
                 logger.warning(f"Trade validation failed for {symbol}: {reason}")
                 return
@@ -144,7 +184,9 @@ class GainBot:
                 action='BUY',
                 volume=lot_size,
                 sl=0.0,  # SL managed by purple line logic
-                tp=0.0   # TP managed by hold time logic
+                tp=0.0,  # TP managed by hold time logic
+                snapshot=snapshot,
+                signal_price=signal['price']
             )
 
             if result:
@@ -173,13 +215,33 @@ class GainBot:
             f"{'='*60}"
         )
 
+        for symbol in self.symbols:
+            stats = connector.execution_stats.get(symbol)
+            if stats is not None and stats.orders:
+                execution = stats.summary()
+                logger.info(
+                    f"Execution {symbol}: {execution['filled']}/{execution['orders']} filled "
+                    f"({execution['fill_rate']:.0f}%), {execution['retries']} retries | "
+                    f"ack p50/p99 {execution['ack_ms_p50']:.1f}/{execution['ack_ms_p99']:.1f} ms | "
+                    f"slippage avg {execution['avg_slippage_points']:.1f} / worst {execution['worst_slippage_points']:.1f} pts | "
+                    f"signal drift avg {execution['avg_signal_drift_points']:.1f} pts"
+                )
+        if latency.enabled:
+            logger.info(latency.report())
+
     def stop(self):
         """Stop the bot"""
         logger.info(f"Stopping {self.name}...")
         self.running = False
+        self.scheduler.stop()
+
+    def shutdown(self, disconnect: bool = True):
+        """
+        Clean shutdown
 
-    def shutdown(self):
-        """Clean shutdown"""
+        Args:
+            disconnect: Close the MT5 session (False when a shared runtime owns it)
+        """
         logger.info(f"Shutting down {self.name}...")
 
         # Close any remaining positions
@@ -187,10 +249,11 @@ class GainBot:
             self.order_manager.close_position(ticket, "Bot shutdown")
 
         # Disconnect from MT5
-        connector.shutdown()
+        if disconnect:
+            connector.shutdown()
 
         # Export trade history to CSV
-        print("[DEBUG] Exporting trade history to CSV...")
+        logger.debug("Exporting trade history to CSV...")
         trade_exporter.print_summary()
         trade_exporter.export_to_csv()
         trade_exporter.export_to_json()
@@ -206,6 +269,8 @@ class GainBot:
             f"Total Trades: {risk_status['trades_today']}\n"
             f"{'='*60}\n"
         )
+        if latency.enabled:
+            logger.info(latency.report())
 
         logger.info(f"[OK] {self.name} shutdown complete")
 
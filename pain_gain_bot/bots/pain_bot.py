@@ -3,16 +3,19 @@ PainBot - Automated SELL trading bot for PainX symbols
 Implements the Pain/Gain SELL strategy with multi-timeframe confirmations
 """
 
-import time
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from ..data.mt5_connector import connector
+from ..data.snapshot import MarketSnapshot
 from ..strategy.signals import SignalEngine
 from ..strategy.order_manager import OrderManager
 from ..strategy.risk_manager import risk_manager
 from ..utils.logger import logger
+from ..utils.latency import latency
+from ..utils.metrics import metrics
 from ..utils.trade_exporter import trade_exporter
 from ..config import config
+from .scheduler import BarCloseScheduler
 
 class PainBot:
     """
@@ -21,38 +24,40 @@ class PainBot:
     """
 
     def __init__(self):
-        print("[DEBUG] PainBot.__init__() started")
+        logger.debug("PainBot.__init__() started")
         self.name = "PainBot"
         self.bot_type = "PAIN"
         self.magic_number = 100001  # Unique identifier for PainBot orders
 
-        print(f"[DEBUG] Loading pain_symbols from config: {config.symbols.pain_symbols}")
+        logger.debug("Loading pain_symbols from config: %s", config.symbols.pain_symbols)
         self.symbols = config.symbols.pain_symbols
-        print("[DEBUG] Creating SignalEngine...")
+        logger.debug("Creating SignalEngine...")
         self.signal_engine = SignalEngine()
-        print("[DEBUG] Creating OrderManager...")
+        logger.debug("Creating OrderManager...")
         self.order_manager = OrderManager(self.bot_type, self.magic_number)
+        self.scheduler = BarCloseScheduler(self.symbols)
 
         self.running = False
         self.iteration = 0
-        print("[DEBUG] PainBot.__init__() completed")
+        self.snapshot = None  # MarketSnapshot of the current cycle
+        logger.debug("PainBot.__init__() completed")
 
     def initialize(self) -> bool:
         """Initialize bot and connect to MT5"""
-        print("[DEBUG] PainBot.initialize() started")
+        logger.debug("PainBot.initialize() started")
         logger.info(f"=== Initializing {self.name} ===")
 
-        # Connect to MT5
-        print(f"[DEBUG] Calling connector.initialize() with use_demo={config.broker.use_demo}")
-        if not connector.initialize(use_demo=config.broker.use_demo):
+        # Connect to MT5 (unless a shared runtime already holds the session)
+        logger.debug("Calling connector.initialize() with use_demo=%s", config.broker.use_demo)
+        if not connector.connected and not connector.initialize(use_demo=config.broker.use_demo):
             logger.error("Failed to connect to MT5")
-            print("[DEBUG] connector.initialize() returned False")
+            logger.debug("connector.initialize() returned False")
             return False
 
-        print("[DEBUG] connector.initialize() succeeded")
+        logger.debug("connector.initialize() succeeded")
         # Verify symbols
         logger.info(f"Verifying symbols: {self.symbols}")
-        print(f"[DEBUG] Calling connector.verify_symbols({self.symbols})")
+        logger.debug("Calling connector.verify_symbols(%s)", self.symbols)
         verification = connector.verify_symbols(self.symbols)
 
         valid_symbols = [s for s, v in verification.items() if v]
@@ -61,6 +66,7 @@ class PainBot:
             return False
 
         self.symbols = valid_symbols
+        self.scheduler.symbols = valid_symbols
         logger.info(f"[OK] Active symbols: {self.symbols}")
 
         # Initialize risk manager
@@ -71,66 +77,24 @@ class PainBot:
 
     def run(self):
         """Main trading loop"""
-        print("[DEBUG] PainBot.run() started")
+        logger.debug("PainBot.run() started")
         logger.info(f"🚀 {self.name} starting...")
         logger.info(f"Strategy: SELL signals on {len(self.symbols)} symbols")
         logger.info(f"Session: {config.session.session_start} - {config.session.session_end}")
 
         self.running = True
-        print("[DEBUG] Entering main loop...")
+        logger.debug("Entering main loop...")
 
         try:
             while self.running:
-                self.iteration += 1
-                print(f"[DEBUG] === Iteration {self.iteration} ===")
-
-                # Check daily reset
-                print("[DEBUG] Checking daily reset")
-                risk_manager.check_daily_reset()
-
-                # Check if we can trade
-                print("[DEBUG] Checking daily limits")
-                can_trade, reason = risk_manager.check_daily_limits()
-                print(f"[DEBUG] Can trade: {can_trade}, reason: {reason}")
-                if not can_trade:
-                    logger.info(f"⏸ Trading paused: {reason}")
-                    print("[DEBUG] Cannot trade - sleeping 60s")
-                    time.sleep(60)  # Wait 1 minute before rechecking
-                    continue
-
-                # Check trading session
-                print("[DEBUG] Checking trading session")
-                if not risk_manager.is_trading_session():
-                    if self.iteration % 60 == 1:  # Log every 60 iterations
-                        logger.info("⏸ Outside trading session")
-                        print("[DEBUG] Outside trading session - sleeping 60s")
-                    time.sleep(60)
-                    continue
-
-                print("[DEBUG] Inside trading session - proceeding")
-
-                # Manage existing positions
-                print("[DEBUG] Managing existing positions")
-                self.order_manager.manage_positions()
-
-                # Scan symbols for signals
-                print(f"[DEBUG] Scanning {len(self.symbols)} symbols: {self.symbols}")
-                for symbol in self.symbols:
-                    try:
-                        print(f"[DEBUG] Processing symbol: {symbol}")
-                        self.process_symbol(symbol)
-                    except Exception as e:
-                        logger.error(f"Error processing {symbol}", e)
-                        print(f"[DEBUG] Exception processing {symbol}: {type(e).__name__}: {e}")
-
-                # Log status periodically
-                if self.iteration % 20 == 0:
-                    print("[DEBUG] Logging status (every 20 iterations)")
-                    self.log_status()
-
-                # Sleep between iterations (e.g., check every 30 seconds)
-                print("[DEBUG] Sleeping 30 seconds before next iteration...")
-                time.sleep(30)
+                # Sleep until the next M1/M5 close (or an earlier hold expiry)
+                if not self.scheduler.wait(self.hold_expiries()):
+                    break
+
+                if self.start_cycle():
+                    for symbol in self.symbols:
+                        self.scan_symbol(symbol)
+                    self.finish_cycle()
 
         except KeyboardInterrupt:
             logger.info(f"\n{self.name} stopped by user")
@@ -139,21 +103,96 @@ class PainBot:
         finally:
             self.shutdown()
 
-    def process_symbol(self, symbol: str):
-        """Process trading logic for a single symbol"""
-        print(f"[DEBUG] process_symbol({symbol}) called")
+    def hold_expiries(self) -> List[datetime]:
+        """Hold expiry times of open positions (the scheduler also wakes for these)"""
+        return [p['hold_until'] for p in self.order_manager.active_positions.values()]
+
+    def start_cycle(self) -> bool:
+        """
+        Run the per-cycle checks and manage open positions
+
+        Returns:
+            True if symbols should be scanned this cycle
+        """
+        self.iteration += 1
+        metrics.inc('paingain_iterations_total', bot=self.bot_type)
+        self.snapshot = MarketSnapshot()
+        logger.debug("=== Iteration %s ===", self.iteration)
+
+        # Check daily reset
+        logger.debug("Checking daily reset")
+        risk_manager.check_daily_reset()
+
+        # Check if we can trade
+        logger.debug("Checking daily limits")
+        can_trade, reason = risk_manager.check_daily_limits(self.snapshot)
+        logger.debug("Can trade: %s, reason: %s", can_trade, reason)
+        if not can_trade:
+            logger.info(f"⏸ Trading paused: {reason}")
+            logger.debug("Cannot trade - waiting for next bar close")
+            return False
+
+        # Check trading session
+        logger.debug("Checking trading session")
+        if not risk_manager.is_trading_session():
+            if self.iteration % 60 == 1:  # Log every 60 iterations
+                logger.info("⏸ Outside trading session")
+                logger.debug("Outside trading session - waiting for next bar close")
+            return False
+
+        logger.debug("Inside trading session - proceeding")
+
+        # Manage existing positions
+        logger.debug("Managing existing positions")
+        self.order_manager.manage_positions(self.snapshot)
+
+        logger.debug("Scanning %s symbols: %s", len(self.symbols), self.symbols)
+        return True
+
+    def scan_symbol(self, symbol: str):
+        """Evaluate one symbol if any of its bars closed since the last scan"""
+        try:
+            closed = self.scheduler.closed_timeframes(symbol)
+            if not closed:
+                return  # Woken for a hold expiry, no bar closed
+            logger.debug("Processing symbol: %s (closed: %s)", symbol, closed)
+            self.process_symbol(symbol, closed, self.snapshot)
+        except Exception as e:
+            logger.error(f"Error processing {symbol}", e)
+            logger.debug("Exception processing %s: %s: %s", symbol, type(e).__name__, e)
+
+    def finish_cycle(self):
+        """Log status periodically"""
+        if self.iteration % 20 == 0:
+            logger.debug("Logging status (every 20 iterations)")
+            self.log_status()
+
+    def process_symbol(self, symbol: str, closed_timeframes: Optional[List[str]] = None,
+                       snapshot: Optional[MarketSnapshot] = None):
+        """
+        Process trading logic for a single symbol
+
+        Args:
+            symbol: Trading symbol
+            closed_timeframes: Timeframes whose bar just closed (None = evaluate all stages)
+            snapshot: Market data shared by this cycle's checks (default: a new one)
+        """
+        snapshot = snapshot or MarketSnapshot()
+        logger.debug("process_symbol(%s) called", symbol)
         # Generate signal
-        print(f"[DEBUG] Calling signal_engine.generate_signal({symbol})")
-        signal = self.signal_engine.generate_signal(symbol)
-        print(f"[DEBUG] Signal result: action={signal.get('action')}, price={signal.get('price')}")
+        logger.debug("Calling signal_engine.generate_signal(%s)", symbol)
+        signal = self.signal_engine.generate_signal(symbol, closed_timeframes, snapshot)
+        metrics.inc('paingain_signals_total', bot=self.bot_type, symbol=symbol,
+                    gate=self.signal_engine.outcome(signal))
+        logger.debug("Signal result: action=%s, price=%s", signal.get('action'), signal.get('price'))
 
         # Check if we have a SELL signal
         if signal['action'] == 'SELL':
             logger.info(f"[#] SELL signal detected for {symbol}")
-            print(f"[DEBUG] SELL signal detected - proceeding with order")
+            logger.debug("SELL signal detected - proceeding with order")
 
             # Get account info for position sizing
-            account_info = connector.get_account_info()
+            account_info = snapshot.get_account_info()
             if not account_info:
                 logger.warning(f"Cannot get account info for {symbol}")
                 return
@@ -162,7 +201,7 @@ class PainBot:
             lot_size = risk_manager.calculate_position_size(symbol, account_info['balance'])
 
             # Validate trade
-            can_trade, reason = risk_manager.validate_trade(symbol, 'SELL', lot_size)
+            can_trade, reason = risk_manager.validate_trade(symbol, 'SELL', lot_size, snapshot)
             if not can_trade:
                 logger.warning(f"Trade validation failed for {symbol}: {reason}")
                 return
@@ -175,7 +214,9 @@ class PainBot:
                 action='SELL',
                 volume=lot_size,
                 sl=0.0,  # SL managed by purple line logic
-                tp=0.0   # TP managed by hold time logic
+                tp=0.0,  # TP managed by hold time logic
+                snapshot=snapshot,
+                signal_price=signal['price']
             )
 
             if result:
@@ -204,13 +245,33 @@ class PainBot:
             f"{'='*60}"
         )
 
+        for symbol in self.symbols:
+            stats = connector.execution_stats.get(symbol)
+            if stats is not None and stats.orders:
+                execution = stats.summary()
+                logger.info(
+                    f"Execution {symbol}: {execution['filled']}/{execution['orders']} filled "
+                    f"({execution['fill_rate']:.0f}%), {execution['retries']} retries | "
+                    f"ack p50/p99 {execution['ack_ms_p50']:.1f}/{execution['ack_ms_p99']:.1f} ms | "
+                    f"slippage avg {execution['avg_slippage_points']:.1f} / worst {execution['worst_slippage_points']:.1f} pts | "
+                    f"signal drift avg {execution['avg_signal_drift_points']:.1f} pts"
+                )
+        if latency.enabled:
+            logger.info(latency.report())
+
     def stop(self):
         """Stop the bot"""
         logger.info(f"Stopping {self.name}...")
         self.running = False
+        self.scheduler.stop()
+
+    def shutdown(self, disconnect: bool = True):
+        """
+        Clean shutdown
 
-    def shutdown(self):
-        """Clean shutdown"""
+        Args:
+            disconnect: Close the MT5 session (False when a shared runtime owns it)
+        """
         logger.info(f"Shutting down {self.name}...")
 
         # Close any remaining positions
@@ -218,10 +279,11 @@ class PainBot:
             self.order_manager.close_position(ticket, "Bot shutdown")
 
         # Disconnect from MT5
-        connector.shutdown()
+        if disconnect:
+            connector.shutdown()
 
         # Export trade history to CSV
-        print("[DEBUG] Exporting trade history to CSV...")
+        logger.debug("Exporting trade history to CSV...")
         trade_exporter.print_summary()
         trade_exporter.export_to_csv()
         trade_exporter.export_to_json()
@@ -237,6 +299,8 @@ class PainBot:
             f"Total Trades: {risk_status['trades_today']}\n"
             f"{'='*60}\n"
         )
+        if latency.enabled:
+            logger.info(latency.report())
 
         logger.info(f"[OK] {self.name} shutdown complete")
 
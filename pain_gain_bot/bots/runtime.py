@@ -0,0 +1,170 @@
+"""
+Shared asyncio runtime for the trading bots
+One MT5 session, one terminal thread and one bar-close clock for all bots
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
+from ..data.mt5_connector import connector
+from ..indicators.technical import indicator_cache
+from ..strategy.risk_manager import risk_manager
+from ..utils.logger import logger
+from ..utils.latency import latency
+from ..utils.metrics import metrics
+from ..config import config
+from .scheduler import BarCloseScheduler
+
+
+class TradingRuntime:
+    """
+    Runs one or more bots on a single event loop
+
+    The MetaTrader5 package is not thread-safe, so every call that can
+    reach the terminal (connect, cycle checks, symbol scans, shutdown) is
+    submitted to a single-thread executor. Symbol scans of all bots are
+    scheduled as tasks on each bar close and queue on that thread instead
+    of racing each other from separate bot threads.
+    """
+
+    def __init__(self, bots: List):
+        """
+        Args:
+            bots: PainBot / GainBot instances (not yet initialized)
+        """
+        self.bots = bots
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="MT5-Terminal")
+        self.scheduler = BarCloseScheduler([])
+        self.loop = None
+        self._stopping = None
+
+    async def call(self, func, *args, **kwargs):
+        """Run a blocking (terminal) call on the terminal thread"""
+        return await self.loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def initialize(self) -> bool:
+        """Connect once and initialize every bot on the terminal thread"""
+        if not self.executor.submit(connector.initialize, use_demo=config.broker.use_demo).result():
+            logger.error("Failed to connect to MT5")
+            self.bots = []
+            return False
+
+        ready = []
+        for bot in self.bots:
+            if self.executor.submit(bot.initialize).result():
+                ready.append(bot)
+            else:
+                logger.error(f"Failed to initialize {bot.name}")
+        self.bots = ready
+        if not ready:
+            return False
+
+        # All bots share one clock; closed timeframes are tracked per symbol
+        self.scheduler.symbols = [symbol for bot in ready for symbol in bot.symbols]
+        for bot in ready:
+            bot.scheduler = self.scheduler
+        metrics.add_collector(self.collect_metrics)
+        return True
+
+    def collect_metrics(self) -> Iterator:
+        """
+        Metric samples read from in-memory state at scrape time
+
+        Runs on the metrics thread, so it never calls the terminal: the
+        P/L figures are the ones the last cycle's daily-limit check left
+        on the risk manager.
+        """
+        for bot in self.bots:
+            yield 'paingain_open_positions', {'bot': bot.bot_type}, len(bot.order_manager.active_positions)
+
+        yield 'paingain_daily_pnl_usd', {}, risk_manager.daily_pnl
+        yield 'paingain_daily_start_balance_usd', {}, risk_manager.daily_start_balance
+        yield 'paingain_trades_today', {}, risk_manager.trades_today
+        yield 'paingain_trading_halted', {}, int(risk_manager.trading_halted)
+
+        for result, count in dict(connector.bar_cache_stats).items():
+            yield 'paingain_bar_cache_requests_total', {'result': result}, count
+        cache = indicator_cache.stats()
+        yield 'paingain_indicator_cache_requests_total', {'result': 'hit'}, cache['hits']
+        yield 'paingain_indicator_cache_requests_total', {'result': 'miss'}, cache['misses']
+        yield 'paingain_indicator_cache_bytes', {}, cache['bytes']
+
+        for symbol, stats in list(connector.execution_stats.items()):
+            labels = {'symbol': symbol}
+            yield 'paingain_order_executions_total', {**labels, 'result': 'filled'}, stats.filled
+            yield 'paingain_order_executions_total', {**labels, 'result': 'rejected'}, stats.rejected
+            yield 'paingain_order_retries_total', labels, stats.retries
+            for retcode, count in list(stats.retcodes.items()):
+                yield 'paingain_order_retcodes_total', {**labels, 'retcode': retcode}, count
+            ack = stats.ack_us.summary()
+            for quantile, key in (('0.5', 'p50'), ('0.99', 'p99')):
+                yield 'paingain_order_ack_seconds', {**labels, 'quantile': quantile}, ack[key] / 1e6
+            yield 'paingain_order_ack_seconds_sum', labels, stats.ack_us.total / 1e6
+            yield 'paingain_order_ack_seconds_count', labels, stats.filled
+            yield 'paingain_order_slippage_points_sum', labels, stats.slippage_points
+            yield 'paingain_order_slippage_points_count', labels, stats.filled
+            yield 'paingain_order_signal_drift_points_sum', labels, stats.signal_drift_points
+            yield 'paingain_order_signal_drift_points_count', labels, stats.signal_drifts
+
+        for (stage, symbol), row in latency.snapshot().items():
+            labels = {'stage': stage, 'symbol': symbol}
+            for quantile, key in (('0.5', 'p50'), ('0.9', 'p90'), ('0.99', 'p99')):
+                yield 'paingain_stage_latency_seconds', {**labels, 'quantile': quantile}, row[key] / 1e6
+            yield 'paingain_stage_latency_seconds_sum', labels, row['mean'] * row['count'] / 1e6
+            yield 'paingain_stage_latency_seconds_count', labels, row['count']
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep unless stopped; returns False if stop() was called"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    async def _run(self):
+        self.loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+
+        for bot in self.bots:
+            bot.running = True
+            logger.info(f"🚀 {bot.name} starting on {len(bot.symbols)} symbols")
+
+        while not self._stopping.is_set():
+            expiries = [expiry for bot in self.bots for expiry in bot.hold_expiries()]
+            delay = await self.call(self.scheduler.seconds_until_wake, expiries)
+            if not await self._sleep(delay):
+                break
+
+            active = [bot for bot in self.bots if await self.call(bot.start_cycle)]
+            await asyncio.gather(*(
+                self.call(bot.scan_symbol, symbol) for bot in active for symbol in bot.symbols
+            ))
+            for bot in active:
+                await self.call(bot.finish_cycle)
+
+    def run(self):
+        """Run until stopped or interrupted, then shut every bot down"""
+        try:
+            asyncio.run(self._run())
+        except KeyboardInterrupt:
+            logger.info("\nShutting down bots...")
+        except Exception as e:
+            logger.error("Trading runtime crashed", e)
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        """Stop the runtime (safe to call from any thread)"""
+        for bot in self.bots:
+            bot.running = False
+        if self.loop is not None and self._stopping is not None:
+            self.loop.call_soon_threadsafe(self._stopping.set)
+
+    def shutdown(self):
+        """Shut the bots down, then close the shared MT5 session"""
+        for bot in self.bots:
+            self.executor.submit(bot.shutdown, disconnect=False).result()
+        self.executor.submit(connector.shutdown).result()
+        self.executor.shutdown()
+        metrics.remove_collector(self.collect_metrics)
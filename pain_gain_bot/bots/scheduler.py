@@ -0,0 +1,95 @@
+"""
+Bar-close scheduler for the live bots
+Wakes at each M1/M5 close on the trade server clock instead of polling
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from ..data.mt5_connector import connector, TIMEFRAME_SECONDS
+from ..utils.logger import logger
+from ..config import config
+
+
+class BarCloseScheduler:
+    """
+    Sleeps until the next bar close plus config.session.bar_close_offset_ms
+
+    Server time comes from the connector's clock (connector.server_now),
+    which is re-sampled from tick timestamps on every wake. After a wake,
+    closed_timeframes(symbol) lists every timeframe (M1 ... D1) whose bar
+    closed since that symbol was last evaluated.
+    """
+
+    def __init__(self, symbols: List[str], wake_timeframes: Iterable[str] = ('M1', 'M5')):
+        """
+        Args:
+            symbols: Symbols whose ticks provide server time (all verified symbols if empty)
+            wake_timeframes: Timeframes whose closes wake the bot
+        """
+        self.symbols = list(symbols)
+        self.wake_timeframes = tuple(wake_timeframes)
+        self.last_evaluated: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._warned = False
+
+    def sync_clock(self) -> bool:
+        """Sample the server clock from the latest ticks"""
+        return connector.server_time(self.symbols) is not None
+
+    def now(self) -> float:
+        """Estimated server time (epoch seconds; local time if never sampled)"""
+        server = connector.server_now(self.symbols)
+        return time.time() if server is None else server
+
+    def next_close(self, now: Optional[float] = None) -> float:
+        """Server time of the next close of any wake timeframe"""
+        now = self.now() if now is None else now
+        return min((now // TIMEFRAME_SECONDS[tf] + 1) * TIMEFRAME_SECONDS[tf]
+                   for tf in self.wake_timeframes)
+
+    def seconds_until_wake(self, deadlines: Iterable[datetime] = ()) -> float:
+        """
+        Seconds until the next bar close (plus offset) or an earlier deadline
+
+        Args:
+            deadlines: Local times that must also wake the bot (e.g. position hold expiry)
+        """
+        if not self.sync_clock() and not connector.clock_offsets and not self._warned:
+            logger.warning("No ticks available for server time - scheduling on the local clock")
+            self._warned = True
+
+        wake = self.next_close() + config.session.bar_close_offset_ms / 1000.0 - connector.clock_offset
+        current = time.time()
+        for deadline in deadlines:
+            stamp = deadline.timestamp()
+            if stamp > current:
+                wake = min(wake, stamp)
+        return max(0.0, wake - current)
+
+    def wait(self, deadlines: Iterable[datetime] = ()) -> bool:
+        """
+        Block until the next bar close (plus offset) or an earlier deadline
+
+        Returns:
+            False if stop() was called while waiting
+        """
+        return not self._stop.wait(self.seconds_until_wake(deadlines))
+
+    def closed_timeframes(self, symbol: str, now: Optional[float] = None) -> List[str]:
+        """
+        Timeframes whose bar closed since the previous call for this symbol
+
+        The first call for a symbol returns every timeframe.
+        """
+        now = self.now() if now is None else now
+        last = self.last_evaluated.get(symbol)
+        self.last_evaluated[symbol] = now
+        if last is None:
+            return list(TIMEFRAME_SECONDS)
+        return [tf for tf, seconds in TIMEFRAME_SECONDS.items() if now // seconds > last // seconds]
+
+    def stop(self):
+        """Wake any pending wait() and make later waits return immediately"""
+        self._stop.set()
@@ -4,8 +4,9 @@ Centralizes all configurable parameters
 """
 
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List
 from datetime import time
+from .utils.logger import logger
 
 @dataclass
 class BrokerConfig:
@@ -38,11 +39,17 @@ class RiskConfig:
     daily_target_usd: float = 100.0
     max_consecutive_orders: int = 3
     max_spread_pips: float = 2.0
-    max_slippage_pips: float = 2.0
+    max_slippage_pips: float = 2.0  # Order deviation; resends stop past this drift
     trade_target_usd: float = 1.5  # Min target per trade
     trade_target_max_usd: float = 2.0
     min_lot: float = 0.01
     max_lot: float = 1.0
+    order_retries: int = 3  # Resends after a requote / price change (fresh quote each time)
+    # Retry waits block the single terminal thread, delaying every other symbol's
+    # scan. Worst case per order: sum of min(backoff * 2**n, cap) for n < order_retries
+    # (defaults: 25 + 50 + 100 = 175 ms)
+    order_retry_backoff_ms: float = 25.0  # First retry delay, doubled per retry
+    order_retry_max_backoff_ms: float = 200.0  # Retry delay cap
 
 @dataclass
 class SessionConfig:
@@ -52,7 +59,9 @@ class SessionConfig:
     session_end: time = time(6, 0)     # 6:00 AM (next day)
     daily_close_time: time = time(16, 0)  # 4:00 PM - D1 candle close
     timezone_offset: int = -5  # Colombia UTC-5
+    server_utc_offset: int = 3  # Trade server clock (bar timestamps) is UTC+3
     allow_extended_hours: bool = False  # Enable after backtesting
+    bar_close_offset_ms: int = 250  # Bots wake this long after each M1/M5 bar close
 
 @dataclass
 class StrategyConfig:
@@ -69,6 +78,7 @@ class StrategyConfig:
     # H4 Fibonacci
     h4_fib_level: float = 0.5  # 50% retracement
     use_m15_for_fib: bool = True  # Use M15 for Fib points
+    swing_lookbacks: Dict[str, int] = None  # Bars in the swing high/low, per timeframe
 
     # Indicator periods (to be refined after template analysis)
     snake_fast_ema: int = 8
@@ -81,6 +91,42 @@ class StrategyConfig:
     news_filter_enabled: bool = False  # Disabled per client request
     news_buffer_minutes: int = 30
 
+    def __post_init__(self):
+        if self.swing_lookbacks is None:
+            self.swing_lookbacks = {"M15": 20}
+
+@dataclass
+class DataConfig:
+    """Market data storage configuration"""
+    use_bar_store: bool = True  # Cache closed bars on disk, sync only new bars
+    bar_store_dir: str = "bar_store"
+    mt5_backend: str = "terminal"  # terminal (MetaTrader5 package) or simulated
+    bar_cache_timeframes: List[str] = None  # Connector caches closed bars of these; the forming bar is fetched every call
+    resample_base: str = ""  # M1 or M5: download only this timeframe and build the higher ones from it
+
+    def __post_init__(self):
+        if self.bar_cache_timeframes is None:
+            # M1/M5 forming bars drive entries and exits and are always fetched fresh
+            self.bar_cache_timeframes = ["M15", "M30", "H1", "H4", "D1"]
+
+@dataclass
+class SimulatorConfig:
+    """Offline MT5 stand-in (used when data.mt5_backend = "simulated")"""
+    start_time: str = ""  # Replay start 'YYYY-MM-DD HH:MM' (empty = 1 day before end of stored bars)
+    speed: float = 1.0  # Simulated seconds per wall-clock second (0 = clock only moves on advance())
+    latency_ms: float = 0.0  # Added to every data call
+    order_latency_ms: float = 0.0  # Added to every order_send
+    spread_points: int = 2
+    slippage_points: int = 0  # Max adverse slippage per fill (uniform 0..N)
+    requote_rate: float = 0.0  # Probability an order is requoted
+    digits: int = 2
+    contract_size: float = 1.0
+    volume_min: float = 0.01
+    volume_max: float = 100.0
+    volume_step: float = 0.01
+    initial_balance: float = 500.0
+    seed: int = 42
+
 @dataclass
 class BacktestConfig:
     """Backtesting parameters"""
@@ -89,6 +135,9 @@ class BacktestConfig:
     start_date: str = "2024-01-01"
     end_date: str = "2025-10-14"
     export_format: str = "both"  # csv, excel, or both
+    slippage_pips: float = 0.0  # Tick replay: max adverse slippage per fill (uniform 0..N)
+    tick_chunk_size: int = 500000  # Tick replay: ticks held in memory at a time
+    seed: int = 42  # Tick replay: slippage random seed
 
 @dataclass
 class AlertConfig:
@@ -106,6 +155,17 @@ class AlertConfig:
     log_level: str = "INFO"  # DEBUG, INFO, WARNING, ERROR
     log_to_file: bool = True
     log_to_console: bool = True
+    log_rotation: str = "midnight"  # midnight (one file per day) or size
+    log_max_mb: float = 10.0  # Size rotation threshold per log file
+    log_backup_count: int = 14  # Rotated files kept per log
+
+@dataclass
+class MonitoringConfig:
+    """Runtime instrumentation"""
+    latency_enabled: bool = False  # Time terminal calls, indicators, signal stages and orders
+    metrics_enabled: bool = False  # Serve Prometheus-style metrics over HTTP
+    metrics_host: str = "127.0.0.1"  # Local only by default
+    metrics_port: int = 9108
 
 @dataclass
 class Config:
@@ -115,8 +175,11 @@ class Config:
     risk: RiskConfig = None
     session: SessionConfig = None
     strategy: StrategyConfig = None
+    data: DataConfig = None
+    simulator: SimulatorConfig = None
     backtest: BacktestConfig = None
     alerts: AlertConfig = None
+    monitoring: MonitoringConfig = None
 
     def __post_init__(self):
         if self.broker is None:
@@ -129,10 +192,16 @@ class Config:
             self.session = SessionConfig()
         if self.strategy is None:
             self.strategy = StrategyConfig()
+        if self.data is None:
+            self.data = DataConfig()
+        if self.simulator is None:
+            self.simulator = SimulatorConfig()
         if self.backtest is None:
             self.backtest = BacktestConfig()
         if self.alerts is None:
             self.alerts = AlertConfig()
+        if self.monitoring is None:
+            self.monitoring = MonitoringConfig()
 
 # Global config instance
 config = Config()
@@ -150,65 +219,68 @@ def load_config(filepath: str = "config.json"):
     import json
     global config
 
-    print(f"[DEBUG] load_config() called with filepath: {filepath}")
+    logger.debug("load_config() called with filepath: %s", filepath)
 
     try:
-        print(f"[DEBUG] Opening config file: {filepath}")
+        logger.debug("Opening config file: %s", filepath)
         with open(filepath, 'r') as f:
             data = json.load(f)
 
-        print(f"[DEBUG] Config file loaded, keys: {list(data.keys())}")
+        logger.debug("Config file loaded, keys: %s", list(data.keys()))
 
         # Remove comment fields (keys starting with _)
-        print("[DEBUG] Removing comment fields starting with '_'")
+        logger.debug("Removing comment fields starting with '_'")
         data = {k: v for k, v in data.items() if not k.startswith('_')}
 
         # Remove _explanations and _note fields from nested dicts
-        print("[DEBUG] Cleaning nested comment fields")
+        logger.debug("Cleaning nested comment fields")
         for key in data:
             if isinstance(data[key], dict):
                 data[key] = {k: v for k, v in data[key].items()
                             if not k.startswith('_')}
 
         # Process session times (convert string to time object)
-        print("[DEBUG] Processing session times")
+        logger.debug("Processing session times")
         session_data = data.get('session', {})
         if 'session_start' in session_data and isinstance(session_data['session_start'], str):
             h, m, s = map(int, session_data['session_start'].split(':'))
             session_data['session_start'] = time(h, m, s)
-            print(f"[DEBUG] session_start converted: {session_data['session_start']}")
+            logger.debug("session_start converted: %s", session_data['session_start'])
         if 'session_end' in session_data and isinstance(session_data['session_end'], str):
             h, m, s = map(int, session_data['session_end'].split(':'))
             session_data['session_end'] = time(h, m, s)
-            print(f"[DEBUG] session_end converted: {session_data['session_end']}")
+            logger.debug("session_end converted: %s", session_data['session_end'])
         if 'daily_close_time' in session_data and isinstance(session_data['daily_close_time'], str):
             h, m, s = map(int, session_data['daily_close_time'].split(':'))
             session_data['daily_close_time'] = time(h, m, s)
-            print(f"[DEBUG] daily_close_time converted: {session_data['daily_close_time']}")
+            logger.debug("daily_close_time converted: %s", session_data['daily_close_time'])
 
-        print("[DEBUG] Creating Config object...")
+        logger.debug("Creating Config object...")
         # Update global config object
         config.broker = BrokerConfig(**data.get('broker', {}))
         config.symbols = SymbolConfig(**data.get('symbols', {}))
         config.risk = RiskConfig(**data.get('risk', {}))
         config.session = SessionConfig(**session_data)
         config.strategy = StrategyConfig(**data.get('strategy', {}))
+        config.data = DataConfig(**data.get('data', {}))
+        config.simulator = SimulatorConfig(**data.get('simulator', {}))
         config.backtest = BacktestConfig(**data.get('backtest', {}))
         config.alerts = AlertConfig(**data.get('alerts', {}))
+        config.monitoring = MonitoringConfig(**data.get('monitoring', {}))
 
         print(f"[OK] Configuration loaded from {filepath}")
-        print(f"[DEBUG] Broker server: {config.broker.server}")
-        print(f"[DEBUG] Demo account: {config.broker.demo_account}")
-        print(f"[DEBUG] Pain symbols: {config.symbols.pain_symbols}")
-        print(f"[DEBUG] Session times: {config.session.session_start} - {config.session.session_end}")
+        logger.debug("Broker server: %s", config.broker.server)
+        logger.debug("Demo account: %s", config.broker.demo_account)
+        logger.debug("Pain symbols: %s", config.symbols.pain_symbols)
+        logger.debug("Session times: %s - %s", config.session.session_start, config.session.session_end)
 
     except FileNotFoundError:
-        print(f"[DEBUG] FileNotFoundError: {filepath} not found")
+        logger.debug("FileNotFoundError: %s not found", filepath)
         print(f"Config file {filepath} not found. Using defaults.")
     except Exception as e:
-        print(f"[DEBUG] Exception during config load: {type(e).__name__}: {e}")
+        logger.debug("Exception during config load: %s: %s", type(e).__name__, e)
         print(f"Error loading config: {e}")
         print("Using default configuration.")
 
-    print("[DEBUG] load_config() completed")
+    logger.debug("load_config() completed")
     return config
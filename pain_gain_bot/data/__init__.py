@@ -1,5 +1,14 @@
 """Data management modules"""
 
+from .mt5_api import MT5Backend, mt5
 from .mt5_connector import MT5Connector, connector
+from .store import BarStore, bar_store, RATES_DTYPE, TICKS_DTYPE
+from .bars import BarSeries
+from .snapshot import MarketSnapshot
+from .mt5_sim import SimulatedMT5
+from .resample import resample_rates, resample_all
+from .synthetic import SpikeIndexGenerator, bars_to_ticks
 
-__all__ = ['MT5Connector', 'connector']
+__all__ = ['MT5Backend', 'mt5', 'MT5Connector', 'connector', 'BarStore', 'bar_store',
+           'RATES_DTYPE', 'TICKS_DTYPE', 'BarSeries', 'MarketSnapshot', 'SimulatedMT5', 'resample_rates', 'resample_all',
+           'SpikeIndexGenerator', 'bars_to_ticks']
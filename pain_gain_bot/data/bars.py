@@ -0,0 +1,88 @@
+"""
+Array-backed bar series
+Lightweight struct-of-arrays stand-in for OHLC DataFrames in hot indicator paths
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+
+class BarSeries:
+    """
+    OHLC bars as contiguous NumPy columns
+
+    Supports the subset of the DataFrame interface the indicators use:
+    len(), bars['close'] (an ndarray), bars.tail(n) and positional slices,
+    all as zero-copy views. Indexing a 20-100 bar window this way costs
+    well under a microsecond, against tens of microseconds for .iloc/.tail
+    on a DataFrame. Convert with to_dataframe() only for reporting.
+    """
+
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'tick_volume')
+
+    COLUMNS = ('open', 'high', 'low', 'close', 'tick_volume')
+
+    def __init__(self, time: np.ndarray, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                 close: np.ndarray, tick_volume: Optional[np.ndarray] = None):
+        """
+        Args:
+            time: Bar open times as int64 nanoseconds since the epoch
+            open_, high, low, close: Price arrays aligned to time
+            tick_volume: Optional volume array
+        """
+        self.time = time
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.tick_volume = tick_volume if tick_volume is not None else np.zeros(len(time), dtype=np.uint64)
+
+    @classmethod
+    def from_rates(cls, rates: np.ndarray) -> 'BarSeries':
+        """Build from an MT5 rates array (time in epoch seconds)"""
+        return cls(
+            rates['time'].astype(np.int64) * 1_000_000_000,
+            np.ascontiguousarray(rates['open'], dtype=float),
+            np.ascontiguousarray(rates['high'], dtype=float),
+            np.ascontiguousarray(rates['low'], dtype=float),
+            np.ascontiguousarray(rates['close'], dtype=float),
+            np.ascontiguousarray(rates['tick_volume']),
+        )
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'BarSeries':
+        """Build from a DataFrame indexed by bar open time"""
+        return cls(
+            df.index.values.astype('datetime64[ns]').view(np.int64),
+            df['open'].to_numpy(dtype=float),
+            df['high'].to_numpy(dtype=float),
+            df['low'].to_numpy(dtype=float),
+            df['close'].to_numpy(dtype=float),
+            df['tick_volume'].to_numpy() if 'tick_volume' in df.columns else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, key):
+        """bars['close'] -> column array; bars[a:b] -> BarSeries view"""
+        if isinstance(key, str):
+            if key not in self.COLUMNS:
+                raise KeyError(key)
+            return getattr(self, key)
+        return BarSeries(self.time[key], self.open[key], self.high[key], self.low[key],
+                         self.close[key], self.tick_volume[key])
+
+    def tail(self, count: int) -> 'BarSeries':
+        """Last `count` bars"""
+        return self[max(len(self) - count, 0):]
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """Bar open times as a DatetimeIndex"""
+        return pd.DatetimeIndex(self.time.astype('datetime64[ns]'), name='time')
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame in the MT5Connector.get_bars layout (for reports and exports)"""
+        return pd.DataFrame({column: getattr(self, column) for column in self.COLUMNS}, index=self.index)
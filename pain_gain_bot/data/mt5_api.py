@@ -0,0 +1,61 @@
+"""
+MetaTrader 5 API backend selection
+Resolves `mt5` to the terminal package or the offline simulator on first use
+"""
+
+from typing import Optional
+from ..config import config
+
+BACKENDS = ('terminal', 'simulated')
+
+
+class MT5Backend:
+    """
+    Lazy stand-in for the `MetaTrader5` module
+
+    Attribute access is forwarded to the selected backend, so callers keep
+    writing mt5.copy_rates_from(...), mt5.TIMEFRAME_M5, etc. The backend is
+    chosen from config.data.mt5_backend the first time it is used, which
+    lets load_config() run before anything touches the terminal.
+    """
+
+    def __init__(self):
+        self._module = None
+        self.name = None
+
+    def use(self, backend: Optional[str] = None):
+        """
+        Select the backend explicitly
+
+        Args:
+            backend: 'terminal' or 'simulated' (defaults to config.data.mt5_backend)
+
+        Returns:
+            The backend module / object
+        """
+        backend = backend or config.data.mt5_backend
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown MT5 backend: {backend} (expected one of {BACKENDS})")
+
+        if backend == 'simulated':
+            from .mt5_sim import SimulatedMT5
+            self._module = SimulatedMT5()
+        else:
+            import MetaTrader5
+            self._module = MetaTrader5
+
+        self.name = backend
+        return self._module
+
+    @property
+    def backend(self):
+        """The resolved backend (selecting it if needed)"""
+        return self._module if self._module is not None else self.use()
+
+    def __getattr__(self, name):
+        # Only called for names not defined on the proxy itself
+        return getattr(self.backend, name)
+
+
+# Global MT5 API instance
+mt5 = MT5Backend()
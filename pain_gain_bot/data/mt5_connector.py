@@ -3,45 +3,142 @@ MetaTrader 5 connection and data management module
 Handles MT5 initialization, symbol data, and market information
 """
 
-import MetaTrader5 as mt5
+import time
 import pandas as pd
 import numpy as np
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Tuple
+from .mt5_api import mt5
 from ..utils.logger import logger
+from ..utils.latency import latency, LatencyHistogram
 from ..config import config
 
+# Supported timeframes and their bar length in seconds
+TIMEFRAME_SECONDS = {
+    'M1': 60,
+    'M5': 300,
+    'M15': 900,
+    'M30': 1800,
+    'H1': 3600,
+    'H4': 14400,
+    'D1': 86400,
+}
+
+
+def timeframe_constant(timeframe: str) -> Optional[int]:
+    """Map a timeframe string (M1 ... D1) to its MT5 TIMEFRAME_* constant"""
+    if timeframe not in TIMEFRAME_SECONDS:
+        return None
+    return getattr(mt5, f"TIMEFRAME_{timeframe}")
+
+
+def rates_to_dataframe(rates) -> pd.DataFrame:
+    """Convert an MT5 rates array to a DataFrame indexed by bar open time"""
+    df = pd.DataFrame(rates)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    df.set_index('time', inplace=True)
+    return df
+
+
+# order_send retcodes worth resending at a fresh price
+RETRY_RETCODES = ('TRADE_RETCODE_REQUOTE', 'TRADE_RETCODE_PRICE_CHANGED', 'TRADE_RETCODE_PRICE_OFF')
+
+
+class ExecutionStats:
+    """
+    Order execution quality for one symbol
+
+    Ack latency is the order_send round trip of the attempt that filled.
+    Slippage is the fill against the quote that attempt was priced at;
+    signal drift is the fill against the price the signal fired at
+    (spread, quote movement and slippage together). Both are in points,
+    positive when the fill is worse.
+    """
+
+    def __init__(self):
+        self.orders = 0
+        self.filled = 0
+        self.rejected = 0
+        self.retries = 0
+        self.retcodes: Dict[int, int] = {}  # Non-DONE retcode -> count
+        self.ack_us = LatencyHistogram()
+        self.slippage_points = 0.0
+        self.worst_slippage_points = 0.0
+        self.signal_drift_points = 0.0
+        self.signal_drifts = 0  # Fills that had a signal price
+
+    def record(self, retcode: int):
+        """Count one order_send result"""
+        if retcode != mt5.TRADE_RETCODE_DONE:
+            self.retcodes[retcode] = self.retcodes.get(retcode, 0) + 1
+
+    def record_fill(self, ack_ns: int, slippage_points: float, signal_drift_points: Optional[float] = None):
+        self.filled += 1
+        self.ack_us.record(ack_ns // 1000)
+        self.slippage_points += slippage_points
+        self.worst_slippage_points = max(self.worst_slippage_points, slippage_points)
+        if signal_drift_points is not None:
+            self.signal_drift_points += signal_drift_points
+            self.signal_drifts += 1
+
+    def summary(self) -> Dict:
+        """Fill rate, retries, ack latency (ms), slippage and signal drift (points)"""
+        ack = self.ack_us.summary()
+        return {
+            'orders': self.orders,
+            'filled': self.filled,
+            'rejected': self.rejected,
+            'fill_rate': self.filled / self.orders * 100 if self.orders else 0.0,
+            'retries': self.retries,
+            'retcodes': dict(self.retcodes),
+            'ack_ms_p50': ack['p50'] / 1000,
+            'ack_ms_p99': ack['p99'] / 1000,
+            'ack_ms_max': ack['max'] / 1000,
+            'avg_slippage_points': self.slippage_points / self.filled if self.filled else 0.0,
+            'worst_slippage_points': self.worst_slippage_points,
+            'avg_signal_drift_points': self.signal_drift_points / self.signal_drifts if self.signal_drifts else 0.0,
+        }
+
+
 class MT5Connector:
     """Manages connection and data retrieval from MetaTrader 5"""
 
+    # Bars fetched when a cached series is topped up after a bar close
+    CACHE_REFRESH_BARS = 2
+
     def __init__(self):
         self.connected = False
         self.account_info = None
         self.symbols_info = {}
+        self.clock_offsets = deque(maxlen=20)  # Server minus local time samples
+        self._bar_cache: Dict[Tuple[str, str, int], Tuple[pd.DataFrame, pd.Timestamp]] = {}
+        self.bar_cache_stats = {'hits': 0, 'refreshes': 0, 'full_fetches': 0}
+        self.execution_stats: Dict[str, ExecutionStats] = {}
 
     def initialize(self, use_demo: bool = True) -> bool:
         """Initialize MT5 connection"""
         try:
-            print("[DEBUG] MT5Connector.initialize() started")
-            print("[DEBUG] Calling mt5.initialize()...")
+            logger.debug("MT5Connector.initialize() started")
+            logger.debug("Calling mt5.initialize()...")
             if not mt5.initialize():
                 error = mt5.last_error()
                 logger.error(f"MT5 initialization failed: {error}")
-                print(f"[DEBUG] mt5.initialize() FAILED with error: {error}")
+                logger.debug("mt5.initialize() FAILED with error: %s", error)
                 return False
 
-            print("[DEBUG] mt5.initialize() succeeded")
+            logger.debug("mt5.initialize() succeeded")
 
             # Check if already logged in
             existing_account = mt5.account_info()
             if existing_account is not None:
-                print(f"[DEBUG] Already connected to account: {existing_account.login}")
-                print(f"[DEBUG] Server: {existing_account.server}")
+                logger.debug("Already connected to account: %s", existing_account.login)
+                logger.debug("Server: %s", existing_account.server)
 
                 # Verify it's the correct account
                 expected_account = config.broker.demo_account if use_demo else config.broker.live_account
                 if existing_account.login == expected_account:
-                    print("[DEBUG] Using existing MT5 connection (already logged in)")
+                    logger.debug("Using existing MT5 connection (already logged in)")
                     self.connected = True
                     self.account_info = existing_account._asdict()
 
@@ -52,25 +149,25 @@ class MT5Connector:
 
                     return True
                 else:
-                    print(f"[DEBUG] Wrong account connected ({existing_account.login} != {expected_account})")
-                    print(f"[DEBUG] Will attempt to switch accounts...")
+                    logger.debug("Wrong account connected (%s != %s)", existing_account.login, expected_account)
+                    logger.debug("Will attempt to switch accounts...")
             else:
-                print("[DEBUG] No existing connection - will login")
+                logger.debug("No existing connection - will login")
 
             # Login to account
             account = config.broker.demo_account if use_demo else config.broker.live_account
             password = config.broker.demo_password if use_demo else config.broker.live_password
             server = config.broker.server
 
-            print(f"[DEBUG] Attempting login: account={account}, server={server}, use_demo={use_demo}")
+            logger.debug("Attempting login: account=%s, server=%s, use_demo=%s", account, server, use_demo)
             if not mt5.login(account, password=password, server=server):
                 error = mt5.last_error()
                 logger.error(f"MT5 login failed: {error}")
-                print(f"[DEBUG] mt5.login() FAILED with error: {error}")
+                logger.debug("mt5.login() FAILED with error: %s", error)
                 mt5.shutdown()
                 return False
 
-            print("[DEBUG] mt5.login() succeeded")
+            logger.debug("mt5.login() succeeded")
 
             self.connected = True
             self.account_info = mt5.account_info()._asdict()
@@ -84,7 +181,7 @@ class MT5Connector:
 
         except Exception as e:
             logger.error(f"MT5 initialization error", e)
-            print(f"[DEBUG] Exception in initialize(): {type(e).__name__}: {e}")
+            logger.debug("Exception in initialize(): %s: %s", type(e).__name__, e)
             return False
 
     def shutdown(self):
@@ -92,6 +189,7 @@ class MT5Connector:
         if self.connected:
             mt5.shutdown()
             self.connected = False
+            self.clear_bar_cache()
             logger.info("MT5 connection closed")
 
     def verify_symbols(self, symbols: List[str]) -> Dict[str, bool]:
@@ -130,10 +228,17 @@ class MT5Connector:
 
         return results
 
+    @latency.timed('connector.get_bars')
     def get_bars(self, symbol: str, timeframe: str, count: int = 500) -> Optional[pd.DataFrame]:
         """
         Retrieve historical bars for a symbol
 
+        Timeframes in config.data.bar_cache_timeframes keep their closed bars
+        in memory. Every call still fetches the forming bar (one bar) and
+        splices it on, so its close is always current. When the forming bar
+        has moved on, only the newest CACHE_REFRESH_BARS bars are fetched to
+        top up the closed series.
+
         Args:
             symbol: Symbol name
             timeframe: MT5 timeframe (M1, M5, M15, M30, H1, H4, D1)
@@ -142,34 +247,55 @@ class MT5Connector:
         Returns:
             DataFrame with OHLCV data
         """
+        if timeframe not in config.data.bar_cache_timeframes:
+            return self._fetch_bars(symbol, timeframe, count)
+
+        key = (symbol, timeframe, count)
+        cached = self._bar_cache.get(key)
+        if cached is not None:
+            closed, forming_time = cached
+            forming = self._fetch_bars(symbol, timeframe, 1)
+            if forming is None:
+                return None
+            if forming.index[0] == forming_time:
+                self.bar_cache_stats['hits'] += 1
+                return pd.concat([closed, forming])
+
+            latest = self._fetch_bars(symbol, timeframe, self.CACHE_REFRESH_BARS)
+            if latest is not None and latest.index[0] <= forming_time:
+                # The old forming bar (now closed) is in the refresh - splice
+                merged = pd.concat([closed[closed.index < latest.index[0]], latest]).tail(count)
+                self._cache_bars(key, merged)
+                self.bar_cache_stats['refreshes'] += 1
+                return merged
+
+        df = self._fetch_bars(symbol, timeframe, count)
+        if df is not None:
+            self._cache_bars(key, df)
+            self.bar_cache_stats['full_fetches'] += 1
+        return df
+
+    def _cache_bars(self, key: Tuple[str, str, int], df: pd.DataFrame):
+        """Keep the closed bars of a series and the open time of its forming bar"""
+        self._bar_cache[key] = (df.iloc[:-1].copy(), df.index[-1])
+
+    def _fetch_bars(self, symbol: str, timeframe: str, count: int) -> Optional[pd.DataFrame]:
+        """Fetch bars straight from the terminal"""
         try:
             # Map timeframe string to MT5 constant
-            tf_map = {
-                'M1': mt5.TIMEFRAME_M1,
-                'M5': mt5.TIMEFRAME_M5,
-                'M15': mt5.TIMEFRAME_M15,
-                'M30': mt5.TIMEFRAME_M30,
-                'H1': mt5.TIMEFRAME_H1,
-                'H4': mt5.TIMEFRAME_H4,
-                'D1': mt5.TIMEFRAME_D1,
-            }
-
-            if timeframe not in tf_map:
+            tf_const = timeframe_constant(timeframe)
+            if tf_const is None:
                 logger.error(f"Invalid timeframe: {timeframe}")
                 return None
 
-            rates = mt5.copy_rates_from_pos(symbol, tf_map[timeframe], 0, count)
+            with latency.timer('mt5.copy_rates', symbol):
+                rates = mt5.copy_rates_from_pos(symbol, tf_const, 0, count)
 
             if rates is None or len(rates) == 0:
                 logger.error(f"No data for {symbol} {timeframe}")
                 return None
 
-            # Convert to DataFrame
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            df.set_index('time', inplace=True)
-
-            return df
+            return rates_to_dataframe(rates)
 
         except Exception as e:
             logger.error(f"Error retrieving bars for {symbol} {timeframe}", e)
@@ -178,7 +304,8 @@ class MT5Connector:
     def get_tick(self, symbol: str) -> Optional[Dict]:
         """Get latest tick for a symbol"""
         try:
-            tick = mt5.symbol_info_tick(symbol)
+            with latency.timer('mt5.symbol_info_tick', symbol):
+                tick = mt5.symbol_info_tick(symbol)
             if tick is None:
                 return None
 
@@ -195,10 +322,69 @@ class MT5Connector:
             logger.error(f"Error getting tick for {symbol}", e)
             return None
 
+    def server_time(self, symbols: Optional[List[str]] = None) -> Optional[float]:
+        """
+        Trade server time from the newest tick
+
+        Bar open times use the same clock, so bar boundaries can be computed
+        directly from this value.
+
+        Args:
+            symbols: Symbols to check (default: all verified symbols)
+
+        Returns:
+            Server time in epoch seconds (with milliseconds), or None if no ticks
+        """
+        newest = None
+        for symbol in symbols or list(self.symbols_info):
+            try:
+                tick = mt5.symbol_info_tick(symbol)
+            except Exception as e:
+                logger.error(f"Error getting server time from {symbol}", e)
+                continue
+            if tick is None:
+                continue
+            stamp = tick.time_msc / 1000.0 if tick.time_msc else float(tick.time)
+            newest = stamp if newest is None else max(newest, stamp)
+        if newest is not None:
+            self.clock_offsets.append(newest - time.time())
+        return newest
+
+    @property
+    def clock_offset(self) -> float:
+        """
+        Server time minus local time in seconds (0.0 before any sample)
+
+        A tick is never newer than the server clock, so the largest recent
+        server_time() sample is the best estimate.
+        """
+        return max(self.clock_offsets) if self.clock_offsets else 0.0
+
+    def server_now(self, symbols: Optional[List[str]] = None) -> Optional[float]:
+        """
+        Estimated current server time (epoch seconds)
+
+        Local time plus clock_offset. Samples the clock from `symbols` first
+        if there are no samples yet.
+
+        Returns:
+            Server time, or None if the clock could not be sampled
+        """
+        if not self.clock_offsets:
+            self.server_time(symbols)
+        if not self.clock_offsets:
+            return None
+        return time.time() + self.clock_offset
+
+    def clear_bar_cache(self):
+        """Drop all cached bars (e.g. after reconnecting)"""
+        self._bar_cache.clear()
+
     def get_account_info(self) -> Dict:
         """Get current account information"""
         try:
-            info = mt5.account_info()
+            with latency.timer('mt5.account_info'):
+                info = mt5.account_info()
             if info is None:
                 return {}
 
@@ -218,10 +404,11 @@ class MT5Connector:
     def get_positions(self, symbol: Optional[str] = None) -> List[Dict]:
         """Get open positions, optionally filtered by symbol"""
         try:
-            if symbol:
-                positions = mt5.positions_get(symbol=symbol)
-            else:
-                positions = mt5.positions_get()
+            with latency.timer('mt5.positions_get', symbol or ''):
+                if symbol:
+                    positions = mt5.positions_get(symbol=symbol)
+                else:
+                    positions = mt5.positions_get()
 
             if positions is None:
                 return []
@@ -250,10 +437,24 @@ class MT5Connector:
 
     def send_order(self, symbol: str, order_type: str, volume: float,
                    sl: float = 0.0, tp: float = 0.0, magic: int = 0,
-                   comment: str = "") -> Optional[Dict]:
+                   comment: str = "", signal_price: Optional[float] = None) -> Optional[Dict]:
         """
         Send market order
 
+        Each attempt prices the order from one tick (bid and ask of the
+        same quote, also used for the spread check). A requote, price
+        change or price off is resent up to risk.order_retries times at
+        the quote returned with the rejection (or a new tick), waiting
+        risk.order_retry_backoff_ms, doubled per retry and capped at
+        risk.order_retry_max_backoff_ms. The order is dropped instead of
+        resent once that quote is more than risk.max_slippage_pips points
+        from the first attempt's price. Ack latency, slippage and signal
+        drift are recorded in execution_stats[symbol].
+
+        The waits run on the calling (terminal) thread and delay every
+        other queued terminal call. The stall per order is bounded by the
+        sum of the retry waits: 25 + 50 + 100 = 175 ms with the defaults.
+
         Args:
             symbol: Symbol name
             order_type: 'BUY' or 'SELL'
@@ -262,63 +463,123 @@ class MT5Connector:
             tp: Take profit price
             magic: Magic number for identification
             comment: Order comment
+            signal_price: Price the signal fired at (signal drift reference;
+                no drift is recorded without one)
 
         Returns:
             Order result dictionary or None
         """
-        print(f"[DEBUG] MT5Connector.send_order() called: {order_type} {volume} {symbol}")
+        logger.debug("MT5Connector.send_order() called: %s %s %s", order_type, volume, symbol)
+        stats = self.execution_stats.setdefault(symbol, ExecutionStats())
+        stats.orders += 1
+        result = self._send_order(stats, symbol, order_type, volume, sl, tp, magic, comment, signal_price)
+        if result is None:
+            stats.rejected += 1
+        return result
+
+    def _send_order(self, stats: ExecutionStats, symbol: str, order_type: str, volume: float,
+                    sl: float, tp: float, magic: int, comment: str,
+                    signal_price: Optional[float]) -> Optional[Dict]:
+        """Price, send and retry one market order (see send_order)"""
         try:
             # Get symbol info
-            print(f"[DEBUG] Getting symbol info for {symbol}")
+            logger.debug("Getting symbol info for %s", symbol)
             symbol_info = mt5.symbol_info(symbol)
             if symbol_info is None:
                 logger.error(f"Symbol {symbol} not found")
-                print(f"[DEBUG] Symbol info is None - symbol not found")
+                logger.debug("Symbol info is None - symbol not found")
                 return None
 
-            print(f"[DEBUG] Symbol info retrieved: spread={symbol_info.spread}")
-
-            # Check spread
-            current_spread = symbol_info.spread * symbol_info.point
-            max_spread = config.risk.max_spread_pips * symbol_info.point
-            if current_spread > max_spread:
-                logger.warning(f"Spread too high: {current_spread:.5f} > {max_spread:.5f}")
-                return None
+            logger.debug("Symbol info retrieved: spread=%s", symbol_info.spread)
 
-            # Determine price and order type
-            if order_type.upper() == 'BUY':
-                price = mt5.symbol_info_tick(symbol).ask
-                mt5_order_type = mt5.ORDER_TYPE_BUY
-            else:
-                price = mt5.symbol_info_tick(symbol).bid
-                mt5_order_type = mt5.ORDER_TYPE_SELL
+            buy = order_type.upper() == 'BUY'
+            mt5_order_type = mt5.ORDER_TYPE_BUY if buy else mt5.ORDER_TYPE_SELL
+            point = symbol_info.point or 10.0 ** -symbol_info.digits
+            retry_codes = {getattr(mt5, name) for name in RETRY_RETCODES if hasattr(mt5, name)}
 
-            # Prepare request
-            request = {
-                "action": mt5.TRADE_ACTION_DEAL,
-                "symbol": symbol,
-                "volume": volume,
-                "type": mt5_order_type,
-                "price": price,
-                "sl": sl,
-                "tp": tp,
-                "deviation": int(config.risk.max_slippage_pips),
-                "magic": magic,
-                "comment": comment,
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
-            }
+            with latency.timer('mt5.symbol_info_tick', symbol):
+                tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                logger.error(f"No quote for {symbol}")
+                return None
+            bid, ask = tick.bid, tick.ask
+            first_price = ask if buy else bid
+
+            attempt = 0
+            while True:
+                # Check spread on the quote the order is priced from
+                current_spread = ask - bid
+                max_spread = config.risk.max_spread_pips * point
+                if current_spread > max_spread + 1e-12:
+                    logger.warning(f"Spread too high: {current_spread:.5f} > {max_spread:.5f}")
+                    return None
+
+                price = ask if buy else bid
+                drift = abs(price - first_price) / point
+                if attempt and drift > config.risk.max_slippage_pips:
+                    logger.warning(f"{order_type} {symbol}: quote moved {drift:.1f} points from "
+                                   f"{first_price} - not resending (max {config.risk.max_slippage_pips})")
+                    return None
+
+                request = {
+                    "action": mt5.TRADE_ACTION_DEAL,
+                    "symbol": symbol,
+                    "volume": volume,
+                    "type": mt5_order_type,
+                    "price": price,
+                    "sl": sl,
+                    "tp": tp,
+                    "deviation": int(config.risk.max_slippage_pips),
+                    "magic": magic,
+                    "comment": comment,
+                    "type_time": mt5.ORDER_TIME_GTC,
+                    "type_filling": mt5.ORDER_FILLING_IOC,
+                }
 
-            # Send order
-            result = mt5.order_send(request)
+                # Send order (submit -> ack)
+                submitted = time.perf_counter_ns()
+                result = mt5.order_send(request)
+                ack_ns = time.perf_counter_ns() - submitted
+                if latency.enabled:
+                    latency.record('mt5.order_send', symbol, ack_ns)
+
+                if result is None:
+                    logger.error("Order send failed - no result")
+                    return None
+
+                stats.record(result.retcode)
+                if result.retcode == mt5.TRADE_RETCODE_DONE:
+                    break
+
+                if result.retcode not in retry_codes or attempt >= config.risk.order_retries:
+                    logger.error(f"Order failed: {result.comment} (code: {result.retcode})"
+                                 + (f" after {attempt} retries" if attempt else ""))
+                    return None
+
+                # Requote / price moved: back off, then resend at a fresh quote
+                attempt += 1
+                stats.retries += 1
+                backoff_ms = min(config.risk.order_retry_backoff_ms * 2 ** (attempt - 1),
+                                 config.risk.order_retry_max_backoff_ms)
+                logger.debug("%s %s: %s (code %s), retry %s/%s in %.0f ms", order_type, symbol,
+                             result.comment, result.retcode, attempt, config.risk.order_retries, backoff_ms)
+                if backoff_ms <= 0 and result.bid > 0 and result.ask > 0:
+                    bid, ask = result.bid, result.ask  # No wait: the requote's own quote is current
+                    continue
 
-            if result is None:
-                logger.error("Order send failed - no result")
-                return None
+                time.sleep(backoff_ms / 1000.0)
+                with latency.timer('mt5.symbol_info_tick', symbol):
+                    tick = mt5.symbol_info_tick(symbol)
+                if tick is None:
+                    logger.error(f"No quote for {symbol} to retry at")
+                    return None
+                bid, ask = tick.bid, tick.ask
 
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
-                logger.error(f"Order failed: {result.comment} (code: {result.retcode})")
-                return None
+            slippage = ((result.price - price) if buy else (price - result.price)) / point
+            signal_drift = None
+            if signal_price:
+                signal_drift = ((result.price - signal_price) if buy else (signal_price - result.price)) / point
+            stats.record_fill(ack_ns, slippage, signal_drift)
 
             logger.trade(
                 action=order_type,
@@ -329,7 +590,11 @@ class MT5Connector:
                     'price': result.price,
                     'sl': sl,
                     'tp': tp,
-                    'comment': comment
+                    'comment': comment,
+                    'retries': attempt,
+                    'ack_ms': round(ack_ns / 1e6, 3),
+                    'slippage_points': round(slippage, 1),
+                    'signal_drift_points': None if signal_drift is None else round(signal_drift, 1)
                 }
             )
 
@@ -338,7 +603,12 @@ class MT5Connector:
                 'volume': result.volume,
                 'price': result.price,
                 'retcode': result.retcode,
-                'comment': result.comment
+                'comment': result.comment,
+                'requested_price': price,
+                'retries': attempt,
+                'ack_ms': ack_ns / 1e6,
+                'slippage_points': slippage,
+                'signal_drift_points': signal_drift
             }
 
         except Exception as e:
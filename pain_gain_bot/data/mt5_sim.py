@@ -0,0 +1,451 @@
+"""
+Offline MetaTrader 5 stand-in
+Replays bars from the local bar store behind the MetaTrader5 module API
+"""
+
+import random
+import time as _time
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from typing import Dict, Optional, Tuple
+from .store import bar_store, RATES_DTYPE, TICKS_DTYPE
+from ..config import config
+
+AccountInfo = namedtuple('AccountInfo', [
+    'login', 'server', 'currency', 'leverage', 'balance', 'equity',
+    'profit', 'margin', 'margin_free', 'margin_level',
+])
+SymbolInfo = namedtuple('SymbolInfo', [
+    'name', 'visible', 'digits', 'point', 'spread', 'bid', 'ask',
+    'trade_contract_size', 'volume_min', 'volume_max', 'volume_step',
+])
+Tick = namedtuple('Tick', ['time', 'bid', 'ask', 'last', 'volume', 'time_msc', 'flags', 'volume_real'])
+TradePosition = namedtuple('TradePosition', [
+    'ticket', 'time', 'type', 'magic', 'volume', 'price_open', 'sl', 'tp',
+    'price_current', 'swap', 'profit', 'symbol', 'comment',
+])
+OrderSendResult = namedtuple('OrderSendResult', [
+    'retcode', 'deal', 'order', 'volume', 'price', 'bid', 'ask', 'comment', 'request_id', 'request',
+])
+
+
+class SimulatedMT5:
+    """
+    Drop-in replacement for the `MetaTrader5` module
+
+    Market data comes from the bar store. A simulated clock decides which
+    bars are visible: bars that closed before the clock are returned as
+    stored, and the forming bar of every timeframe is rebuilt from the
+    finest stored timeframe (M1, else M5) so it never contains future
+    prices. Quotes are the open of the current base bar (bid) plus a fixed
+    spread. Orders fill at market with configurable latency, adverse
+    slippage and requotes; positions, SL/TP and the account balance are
+    tracked in memory.
+    """
+
+    # Constants (same values as the MetaTrader5 package)
+    TIMEFRAME_M1 = 1
+    TIMEFRAME_M5 = 5
+    TIMEFRAME_M15 = 15
+    TIMEFRAME_M30 = 30
+    TIMEFRAME_H1 = 16385
+    TIMEFRAME_H4 = 16388
+    TIMEFRAME_D1 = 16408
+
+    ORDER_TYPE_BUY = 0
+    ORDER_TYPE_SELL = 1
+    TRADE_ACTION_DEAL = 1
+    TRADE_ACTION_SLTP = 6
+    ORDER_TIME_GTC = 0
+    ORDER_FILLING_FOK = 0
+    ORDER_FILLING_IOC = 1
+    ORDER_FILLING_RETURN = 2
+    COPY_TICKS_ALL = -1
+    COPY_TICKS_INFO = 1
+    COPY_TICKS_TRADE = 2
+
+    TRADE_RETCODE_REQUOTE = 10004
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID = 10013
+    TRADE_RETCODE_INVALID_VOLUME = 10014
+    TRADE_RETCODE_MARKET_CLOSED = 10018
+    TRADE_RETCODE_PRICE_CHANGED = 10020
+    TRADE_RETCODE_PRICE_OFF = 10021
+
+    TIMEFRAMES = {
+        TIMEFRAME_M1: ('M1', 60),
+        TIMEFRAME_M5: ('M5', 300),
+        TIMEFRAME_M15: ('M15', 900),
+        TIMEFRAME_M30: ('M30', 1800),
+        TIMEFRAME_H1: ('H1', 3600),
+        TIMEFRAME_H4: ('H4', 14400),
+        TIMEFRAME_D1: ('D1', 86400),
+    }
+
+    def __init__(self, settings=None, store=None):
+        """
+        Args:
+            settings: SimulatorConfig (defaults to config.simulator)
+            store: BarStore to replay (defaults to the global bar store)
+        """
+        self.settings = settings or config.simulator
+        self.store = store or bar_store
+        self._rng = random.Random(self.settings.seed)
+
+        self._initialized = False
+        self._login = None
+        self._error = (1, 'Success')
+
+        self._bars: Dict[Tuple[str, str], np.ndarray] = {}  # loaded bar arrays
+        self._ticks: Dict[str, np.ndarray] = {}  # memory-mapped recorded ticks
+        self._clock_start = None   # Simulated epoch seconds at _wall_start
+        self._wall_start = None
+
+        self._balance = float(self.settings.initial_balance)
+        self._positions: Dict[int, dict] = {}
+        self._next_ticket = 1000
+
+    # ------------------------------------------------------------------
+    # Clock
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _seconds(value) -> int:
+        """Epoch seconds from datetime / Timestamp / number"""
+        if isinstance(value, (int, float, np.integer)):
+            return int(value)
+        return int(pd.Timestamp(value).timestamp())
+
+    def _default_start(self) -> int:
+        """One day before the end of stored history"""
+        ends = [int(rates['time'][-1]) for rates in
+                (self.store.read(symbol, tf) for symbol in self.store.symbols() for tf in ('M1', 'M5'))
+                if len(rates)]
+        return (max(ends) if ends else int(_time.time())) - 86400
+
+    def set_time(self, value):
+        """Move the simulated clock to a given time"""
+        self._clock_start = self._seconds(value)
+        self._wall_start = _time.monotonic()
+
+    def advance(self, seconds: float):
+        """Move the simulated clock forward"""
+        self.set_time(self.now() + seconds)
+
+    def now(self) -> int:
+        """Current simulated time (epoch seconds)"""
+        if self._clock_start is None:
+            start = self.settings.start_time
+            self.set_time(start if start else self._default_start())
+        elapsed = (_time.monotonic() - self._wall_start) * self.settings.speed
+        return int(self._clock_start + elapsed)
+
+    def _delay(self, milliseconds: float):
+        if milliseconds > 0:
+            _time.sleep(milliseconds / 1000.0)
+
+    # ------------------------------------------------------------------
+    # Market data
+    # ------------------------------------------------------------------
+    def _rates(self, symbol: str, timeframe: str) -> np.ndarray:
+        key = (symbol, timeframe)
+        if key not in self._bars:
+            self._bars[key] = np.array(self.store.read(symbol, timeframe))
+        return self._bars[key]
+
+    def _base(self, symbol: str) -> Tuple[np.ndarray, int]:
+        """Finest stored series used to build forming bars and quotes"""
+        for timeframe, seconds in (('M1', 60), ('M5', 300)):
+            rates = self._rates(symbol, timeframe)
+            if len(rates):
+                return rates, seconds
+        return np.empty(0, dtype=RATES_DTYPE), 0
+
+    def _price(self, symbol: str, now: int) -> Optional[float]:
+        """Bid at `now`: open of the current base bar (last close past the data)"""
+        base, seconds = self._base(symbol)
+        pos = int(np.searchsorted(base['time'], now, side='right'))
+        if pos == 0:
+            return None
+        bar = base[pos - 1]
+        return float(bar['open'] if now < bar['time'] + seconds else bar['close'])
+
+    def _visible(self, symbol: str, tf_const: int, now: int) -> Tuple[np.ndarray, int, Optional[np.ndarray]]:
+        """
+        Bars as seen at `now`
+
+        Returns:
+            (stored rates, number of visible bars, rebuilt forming bar or None)
+        """
+        name, seconds = self.TIMEFRAMES[tf_const]
+        rates = self._rates(symbol, name)
+        end = int(np.searchsorted(rates['time'], now, side='right'))
+        if end == 0 or now >= rates['time'][end - 1] + seconds:
+            return rates, end, None  # Nothing visible, or past the data (last bar closed)
+
+        # Rebuild the forming bar from closed base bars and the current base open
+        current = self._price(symbol, now)
+        if current is None:
+            return rates, end, None
+
+        base, base_seconds = self._base(symbol)
+        forming = rates[end - 1:end].copy()
+        lo = int(np.searchsorted(base['time'], forming['time'][0], side='left'))
+        hi = int(np.searchsorted(base['time'], now - base_seconds, side='right'))
+        closed = base[lo:max(lo, hi)]
+
+        forming['high'] = max(closed['high'].max(initial=current), current, forming['open'][0])
+        forming['low'] = min(closed['low'].min(initial=current), current, forming['open'][0])
+        forming['close'] = current
+        forming['tick_volume'] = max(int(closed['tick_volume'].sum()), 1)
+        return rates, end, forming
+
+    @staticmethod
+    def _slice(visible, lo: int, hi: int) -> Optional[np.ndarray]:
+        """Copy visible bars [lo, hi), substituting the forming bar"""
+        rates, end, forming = visible
+        lo, hi = max(lo, 0), min(hi, end)
+        if hi <= lo:
+            return None
+        out = rates[lo:hi].copy()
+        if forming is not None and hi == end:
+            out[-1] = forming[0]
+        return out
+
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        self._delay(self.settings.latency_ms)
+        if timeframe not in self.TIMEFRAMES:
+            self._error = (-2, 'Invalid params')
+            return None
+        visible = self._visible(symbol, timeframe, self.now())
+        end = visible[1] - int(start_pos)
+        return self._slice(visible, end - int(count), end)
+
+    def copy_rates_from(self, symbol, timeframe, date_from, count):
+        self._delay(self.settings.latency_ms)
+        if timeframe not in self.TIMEFRAMES:
+            self._error = (-2, 'Invalid params')
+            return None
+        now = self.now()
+        visible = self._visible(symbol, timeframe, now)
+        end = int(np.searchsorted(visible[0]['time'], min(self._seconds(date_from), now), side='right'))
+        return self._slice(visible, end - int(count), end)
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        self._delay(self.settings.latency_ms)
+        if timeframe not in self.TIMEFRAMES:
+            self._error = (-2, 'Invalid params')
+            return None
+        now = self.now()
+        visible = self._visible(symbol, timeframe, now)
+        times = visible[0]['time']
+        lo = int(np.searchsorted(times, self._seconds(date_from), side='left'))
+        hi = int(np.searchsorted(times, min(self._seconds(date_to), now), side='right'))
+        return self._slice(visible, lo, hi)
+
+    def _recorded_ticks(self, symbol: str) -> np.ndarray:
+        if symbol not in self._ticks:
+            self._ticks[symbol] = self.store.read_ticks(symbol)
+        return self._ticks[symbol]
+
+    def copy_ticks_from(self, symbol, date_from, count, flags):
+        """Recorded ticks from date_from on (never past the clock)"""
+        self._delay(self.settings.latency_ms)
+        ticks = self._recorded_ticks(symbol)
+        times = ticks['time_msc']
+        lo = int(np.searchsorted(times, self._seconds(date_from) * 1000, side='left'))
+        hi = int(np.searchsorted(times, self.now() * 1000, side='right'))
+        return np.array(ticks[lo:max(lo, min(hi, lo + int(count)))], dtype=TICKS_DTYPE)
+
+    def copy_ticks_range(self, symbol, date_from, date_to, flags):
+        """Recorded ticks between date_from and date_to (never past the clock)"""
+        self._delay(self.settings.latency_ms)
+        ticks = self._recorded_ticks(symbol)
+        times = ticks['time_msc']
+        lo = int(np.searchsorted(times, self._seconds(date_from) * 1000, side='left'))
+        hi = int(np.searchsorted(times, min(self._seconds(date_to), self.now()) * 1000, side='right'))
+        return np.array(ticks[lo:max(lo, hi)], dtype=TICKS_DTYPE)
+
+    # ------------------------------------------------------------------
+    # Terminal / account / symbols
+    # ------------------------------------------------------------------
+    def initialize(self, *args, **kwargs) -> bool:
+        if not self.store.symbols():
+            self._error = (-10003, f"No bars in store {self.store.root}")
+            return False
+        self._initialized = True
+        self._error = (1, 'Success')
+        return True
+
+    def login(self, login, password=None, server=None, timeout=None) -> bool:
+        self._login = login
+        return self._initialized
+
+    def shutdown(self):
+        self._initialized = False
+
+    def last_error(self):
+        return self._error
+
+    def _point(self) -> float:
+        return 10.0 ** -self.settings.digits
+
+    def _quote(self, symbol: str) -> Optional[Tuple[float, float]]:
+        bid = self._price(symbol, self.now())
+        if bid is None:
+            return None
+        bid = round(bid, self.settings.digits)
+        return bid, round(bid + self.settings.spread_points * self._point(), self.settings.digits)
+
+    def symbol_info(self, symbol):
+        self._delay(self.settings.latency_ms)
+        quote = self._quote(symbol)
+        if quote is None:
+            return None
+        s = self.settings
+        return SymbolInfo(
+            name=symbol, visible=True, digits=s.digits, point=self._point(),
+            spread=s.spread_points, bid=quote[0], ask=quote[1],
+            trade_contract_size=s.contract_size, volume_min=s.volume_min,
+            volume_max=s.volume_max, volume_step=s.volume_step,
+        )
+
+    def symbol_select(self, symbol, enable=True) -> bool:
+        return symbol in self.store.symbols()
+
+    def symbol_info_tick(self, symbol):
+        self._delay(self.settings.latency_ms)
+        quote = self._quote(symbol)
+        if quote is None:
+            return None
+        now = self.now()
+        return Tick(time=now, bid=quote[0], ask=quote[1], last=0.0, volume=0,
+                    time_msc=now * 1000, flags=6, volume_real=0.0)
+
+    def account_info(self):
+        if not self._initialized:
+            return None
+        self._check_stops()
+        profit = sum(self._profit(p) for p in self._positions.values())
+        margin = sum(p['volume'] * self.settings.contract_size * p['price_open'] / config.broker.leverage
+                     for p in self._positions.values())
+        equity = self._balance + profit
+        login = self._login or (config.broker.demo_account if config.broker.use_demo else config.broker.live_account)
+        return AccountInfo(
+            login=login, server=config.broker.server, currency='USD',
+            leverage=config.broker.leverage, balance=round(self._balance, 2),
+            equity=round(equity, 2), profit=round(profit, 2), margin=round(margin, 2),
+            margin_free=round(equity - margin, 2), margin_level=equity / margin * 100 if margin else 0.0,
+        )
+
+    # ------------------------------------------------------------------
+    # Trading
+    # ------------------------------------------------------------------
+    def _close_price(self, position: dict) -> Optional[float]:
+        quote = self._quote(position['symbol'])
+        if quote is None:
+            return None
+        return quote[0] if position['type'] == self.ORDER_TYPE_BUY else quote[1]
+
+    def _profit(self, position: dict, price: Optional[float] = None) -> float:
+        price = self._close_price(position) if price is None else price
+        if price is None:
+            return 0.0
+        direction = 1 if position['type'] == self.ORDER_TYPE_BUY else -1
+        return (price - position['price_open']) * direction * position['volume'] * self.settings.contract_size
+
+    def _settle(self, ticket: int, price: float):
+        position = self._positions.pop(ticket)
+        self._balance += self._profit(position, price)
+
+    def _check_stops(self):
+        """Close positions whose SL or TP has been reached"""
+        for ticket, position in list(self._positions.items()):
+            price = self._close_price(position)
+            if price is None:
+                continue
+            buy = position['type'] == self.ORDER_TYPE_BUY
+            sl, tp = position['sl'], position['tp']
+            if sl and (price <= sl if buy else price >= sl):
+                self._settle(ticket, sl)
+            elif tp and (price >= tp if buy else price <= tp):
+                self._settle(ticket, tp)
+
+    def positions_get(self, symbol=None, ticket=None, group=None):
+        self._delay(self.settings.latency_ms)
+        self._check_stops()
+        result = []
+        for position in self._positions.values():
+            if symbol is not None and position['symbol'] != symbol:
+                continue
+            if ticket is not None and position['ticket'] != ticket:
+                continue
+            price = self._close_price(position)
+            result.append(TradePosition(
+                price_current=price if price is not None else position['price_open'],
+                swap=0.0, profit=round(self._profit(position, price), 2), **position,
+            ))
+        return tuple(result)
+
+    def _result(self, retcode: int, request: dict, comment: str, price: float = 0.0,
+                volume: float = 0.0, order: int = 0, quote=(0.0, 0.0)):
+        return OrderSendResult(
+            retcode=retcode, deal=order, order=order, volume=volume, price=price,
+            bid=quote[0], ask=quote[1], comment=comment, request_id=0, request=request,
+        )
+
+    def order_send(self, request: dict):
+        self._delay(self.settings.order_latency_ms)
+        s = self.settings
+        symbol = request.get('symbol')
+        quote = self._quote(symbol) if symbol else None
+
+        if request.get('action') == self.TRADE_ACTION_SLTP:
+            position = self._positions.get(request.get('position'))
+            if position is None:
+                return self._result(self.TRADE_RETCODE_INVALID, request, 'Position not found')
+            position['sl'] = request.get('sl', position['sl'])
+            position['tp'] = request.get('tp', position['tp'])
+            return self._result(self.TRADE_RETCODE_DONE, request, 'Request executed')
+
+        if request.get('action') != self.TRADE_ACTION_DEAL:
+            return self._result(self.TRADE_RETCODE_INVALID, request, 'Invalid request')
+        if quote is None:
+            return self._result(self.TRADE_RETCODE_MARKET_CLOSED, request, 'Market closed')
+
+        volume = float(request.get('volume', 0.0))
+        steps = round(volume / s.volume_step, 6)
+        if volume < s.volume_min or volume > s.volume_max or abs(steps - round(steps)) > 1e-6:
+            return self._result(self.TRADE_RETCODE_INVALID_VOLUME, request, 'Invalid volume', quote=quote)
+
+        if self._rng.random() < s.requote_rate:
+            return self._result(self.TRADE_RETCODE_REQUOTE, request, 'Requote', quote=quote)
+
+        # Fill at market with adverse slippage, rejected beyond the allowed deviation
+        buy = request.get('type') == self.ORDER_TYPE_BUY
+        slippage = self._rng.randint(0, s.slippage_points) if s.slippage_points > 0 else 0
+        market = quote[1] if buy else quote[0]
+        fill = round(market + (slippage if buy else -slippage) * self._point(), s.digits)
+        requested = request.get('price')
+        if requested and abs(fill - requested) > request.get('deviation', 0) * self._point() + 1e-12:
+            return self._result(self.TRADE_RETCODE_REQUOTE, request, 'Requote', quote=quote)
+
+        ticket = self._next_ticket
+        self._next_ticket += 1
+
+        if request.get('position'):
+            position = self._positions.get(request['position'])
+            if position is None:
+                return self._result(self.TRADE_RETCODE_INVALID, request, 'Position not found', quote=quote)
+            self._settle(position['ticket'], fill)
+        else:
+            self._positions[ticket] = {
+                'ticket': ticket, 'time': self.now(), 'symbol': symbol,
+                'type': self.ORDER_TYPE_BUY if buy else self.ORDER_TYPE_SELL,
+                'magic': request.get('magic', 0), 'volume': volume, 'price_open': fill,
+                'sl': request.get('sl', 0.0), 'tp': request.get('tp', 0.0),
+                'comment': request.get('comment', ''),
+            }
+
+        return self._result(self.TRADE_RETCODE_DONE, request, 'Request executed',
+                            price=fill, volume=volume, order=ticket, quote=quote)
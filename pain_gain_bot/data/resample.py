@@ -0,0 +1,123 @@
+"""
+Bar resampling helpers
+Aggregates MT5 rates arrays (e.g. M1) into higher timeframes without pandas
+"""
+
+import numpy as np
+from typing import Dict, Iterable, Optional
+from .mt5_connector import TIMEFRAME_SECONDS
+from .store import BarStore, bar_store, RATES_DTYPE
+from ..utils.logger import logger
+from ..config import config
+
+
+def daily_close_offset() -> int:
+    """
+    Bucket offset (seconds) that puts the D1 boundary at the broker's daily close
+
+    session.daily_close_time is local time (UTC + session.timezone_offset)
+    while bar timestamps are server time (UTC + session.server_utc_offset).
+    With the defaults (16:00 Colombia, UTC+3 server) the close is server
+    midnight and the offset is 0, like the terminal's own D1 bars.
+    """
+    close = config.session.daily_close_time
+    hours = close.hour - config.session.timezone_offset + config.session.server_utc_offset
+    return (hours * 3600 + close.minute * 60 + close.second) % TIMEFRAME_SECONDS['D1']
+
+
+def resample_rates(rates: np.ndarray, timeframe: str, offset: int = 0) -> np.ndarray:
+    """
+    Aggregate sorted bars into a higher timeframe
+
+    Args:
+        rates: RATES_DTYPE array sorted by open time
+        timeframe: Target timeframe (M5, M15, M30, H1, H4, D1)
+        offset: Bucket alignment in seconds (0 = aligned to UTC midnight, like MT5)
+
+    Returns:
+        RATES_DTYPE array with one row per non-empty bucket
+    """
+    if len(rates) == 0:
+        return np.empty(0, dtype=RATES_DTYPE)
+
+    seconds = TIMEFRAME_SECONDS[timeframe]
+    bucket = (rates['time'] - offset) // seconds * seconds + offset
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(rates)] - 1
+
+    out = np.empty(len(starts), dtype=RATES_DTYPE)
+    out['time'] = bucket[starts]
+    out['open'] = rates['open'][starts]
+    out['high'] = np.maximum.reduceat(rates['high'], starts)
+    out['low'] = np.minimum.reduceat(rates['low'], starts)
+    out['close'] = rates['close'][ends]
+    out['tick_volume'] = np.add.reduceat(rates['tick_volume'], starts)
+    out['spread'] = np.minimum.reduceat(rates['spread'], starts)
+    out['real_volume'] = np.add.reduceat(rates['real_volume'], starts)
+    return out
+
+
+def resample_all(rates: np.ndarray, timeframes: Iterable[str] = ('M5', 'M15', 'M30', 'H1', 'H4', 'D1'),
+                 offset: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Resample base bars into several timeframes
+
+    Each timeframe is built from the next finer one already computed, so
+    the cost is dominated by the first pass over the base bars.
+
+    Returns:
+        Dictionary of timeframe -> RATES_DTYPE array
+    """
+    result = {}
+    source = rates
+    for timeframe in sorted(timeframes, key=TIMEFRAME_SECONDS.get):
+        result[timeframe] = resample_rates(source, timeframe, offset)
+        # Coarser buckets nest inside this one only if the length divides evenly
+        if all(TIMEFRAME_SECONDS[t] % TIMEFRAME_SECONDS[timeframe] == 0
+               for t in timeframes if TIMEFRAME_SECONDS[t] > TIMEFRAME_SECONDS[timeframe]):
+            source = result[timeframe]
+    return result
+
+
+def sync_resampled(symbol: str, base: str, timeframes: Iterable[str],
+                   store: Optional[BarStore] = None, offset: Optional[int] = None) -> Dict[str, int]:
+    """
+    Append newly completed higher-timeframe bars built from stored base bars
+
+    Only base bars from the first bucket not yet stored onward are read, so
+    repeated calls cost O(new bars). The last bucket is left out until a
+    later base bar shows it is complete (the store keeps closed bars only).
+
+    Args:
+        symbol: Trading symbol
+        base: Stored base timeframe (M1 or M5)
+        timeframes: Higher timeframes to build
+        store: Bar store (defaults to the global one)
+        offset: Bucket alignment in seconds (default: daily_close_offset())
+
+    Returns:
+        Dictionary of timeframe -> bars appended
+    """
+    store = store or bar_store
+    offset = daily_close_offset() if offset is None else offset
+    timeframes = [tf for tf in timeframes if TIMEFRAME_SECONDS[tf] > TIMEFRAME_SECONDS[base]]
+
+    rates = store.read(symbol, base)
+    if len(rates) == 0 or not timeframes:
+        return {}
+
+    # Start at the earliest bucket any timeframe still needs
+    first = len(rates)
+    for timeframe in timeframes:
+        last = store.last_time(symbol, timeframe)
+        after = 0 if last is None else last + TIMEFRAME_SECONDS[timeframe]
+        first = min(first, int(np.searchsorted(rates['time'], after, side='left')))
+    if first >= len(rates):
+        return {tf: 0 for tf in timeframes}
+
+    added = {}
+    for timeframe, bars in resample_all(np.array(rates[first:]), timeframes, offset).items():
+        added[timeframe] = store.append(symbol, timeframe, bars[:-1])
+        if added[timeframe]:
+            logger.debug("Bar store: +%s %s %s bars resampled from %s", added[timeframe], symbol, timeframe, base)
+    return added
@@ -0,0 +1,71 @@
+"""
+Per-cycle market snapshot
+Fetches bars, ticks, positions and account once per bot cycle and shares them
+"""
+
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from .mt5_connector import connector
+
+
+class MarketSnapshot:
+    """
+    Read-through view of the market for one bot cycle
+
+    Exposes the same read methods as MT5Connector (get_bars, get_tick,
+    get_account_info, get_positions). Each value is fetched from the
+    terminal the first time a component asks for it and then served from
+    memory, so the signal engine, order manager and risk manager all decide
+    on the same data and a symbol's M5 bars or tick are pulled once per
+    cycle instead of once per check.
+
+    Order execution keeps using fresh prices; after an order or close the
+    account and positions are dropped with invalidate_account().
+    """
+
+    def __init__(self):
+        self.time = datetime.now()
+        self._bars: Dict[Tuple[str, str], Tuple[int, Optional[pd.DataFrame]]] = {}  # -> (count, bars)
+        self._ticks: Dict[str, Optional[Dict]] = {}
+        self._account: Optional[Dict] = None
+        self._positions: Optional[List[Dict]] = None
+        self.terminal_calls = 0
+
+    def get_bars(self, symbol: str, timeframe: str, count: int = 500) -> Optional[pd.DataFrame]:
+        """Bars as from connector.get_bars (refetched only if more bars are requested)"""
+        key = (symbol, timeframe)
+        fetched, df = self._bars.get(key, (0, None))
+        if count > fetched:
+            df = connector.get_bars(symbol, timeframe, count)
+            self.terminal_calls += 1
+            self._bars[key] = (count, df)
+        return None if df is None else df.tail(count)
+
+    def get_tick(self, symbol: str) -> Optional[Dict]:
+        """Latest tick at the time of the first request this cycle"""
+        if symbol not in self._ticks:
+            self._ticks[symbol] = connector.get_tick(symbol)
+            self.terminal_calls += 1
+        return self._ticks[symbol]
+
+    def get_account_info(self) -> Dict:
+        """Account information (shared by all symbols of the cycle)"""
+        if self._account is None:
+            self._account = connector.get_account_info()
+            self.terminal_calls += 1
+        return self._account
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Dict]:
+        """Open positions, fetched once for all symbols and filtered here"""
+        if self._positions is None:
+            self._positions = connector.get_positions()
+            self.terminal_calls += 1
+        if symbol is None:
+            return list(self._positions)
+        return [p for p in self._positions if p['symbol'] == symbol]
+
+    def invalidate_account(self):
+        """Drop account and positions after an order changed them"""
+        self._account = None
+        self._positions = None
@@ -0,0 +1,331 @@
+"""
+Local on-disk bar store
+Keeps closed MT5 bars per symbol/timeframe in memory-mapped columnar files
+and downloads only bars newer than the last stored timestamp
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+from .mt5_api import mt5
+from .mt5_connector import connector, timeframe_constant, rates_to_dataframe, TIMEFRAME_SECONDS
+from ..utils.logger import logger
+from ..config import config
+
+# Record layout returned by mt5.copy_rates_* (one row per bar)
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('tick_volume', '<u8'),
+    ('spread', '<i4'),
+    ('real_volume', '<u8'),
+])
+
+# Record layout returned by mt5.copy_ticks_* (one row per tick)
+TICKS_DTYPE = np.dtype([
+    ('time', '<i8'),
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('last', '<f8'),
+    ('volume', '<u8'),
+    ('time_msc', '<i8'),
+    ('flags', '<u4'),
+    ('volume_real', '<f8'),
+])
+
+
+class BarStore:
+    """
+    Append-only bar store: <root>/<symbol>/<timeframe>.bin
+
+    Each file is a flat array of RATES_DTYPE records sorted by open time.
+    Reads are memory-mapped and sliced with searchsorted, so loading a
+    date range touches only the pages it needs. Only closed bars are
+    stored; the forming bar is always taken from the terminal.
+
+    Recorded ticks live next to the bars in <root>/<symbol>/ticks.bin
+    (TICKS_DTYPE records sorted by time_msc) and are read in chunks.
+    """
+
+    SYNC_CHUNK = 256  # Bars per incremental fetch (doubled until the gap is covered)
+    TICK_SYNC_SECONDS = 86400  # Tick download window per copy_ticks_range call
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        Args:
+            root: Store directory (defaults to config.data.bar_store_dir)
+        """
+        self._root = root
+
+    @property
+    def root(self) -> Path:
+        return Path(self._root or config.data.bar_store_dir)
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        """File holding the bars for a symbol/timeframe"""
+        return self.root / symbol.replace(' ', '_') / f"{timeframe}.bin"
+
+    def symbols(self) -> List[str]:
+        """Symbols with at least one stored timeframe"""
+        if not self.root.is_dir():
+            return []
+        return sorted(d.name.replace('_', ' ') for d in self.root.iterdir() if d.is_dir())
+
+    @staticmethod
+    def _map(path: Path, dtype: np.dtype) -> np.ndarray:
+        """Memory-map a record file read-only (empty array if missing)"""
+        if not path.exists():
+            return np.empty(0, dtype=dtype)
+
+        # Ignore a torn trailing record left by an interrupted append
+        count = path.stat().st_size // dtype.itemsize
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+    def read(self, symbol: str, timeframe: str) -> np.ndarray:
+        """
+        Memory-map all stored bars (read-only)
+
+        Returns:
+            RATES_DTYPE array (empty if nothing is stored)
+        """
+        return self._map(self.path(symbol, timeframe), RATES_DTYPE)
+
+    def last_time(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Open time (epoch seconds) of the newest stored bar"""
+        rates = self.read(symbol, timeframe)
+        return int(rates['time'][-1]) if len(rates) else None
+
+    def append(self, symbol: str, timeframe: str, rates: np.ndarray) -> int:
+        """
+        Append bars newer than the last stored bar
+
+        Returns:
+            Number of bars written
+        """
+        if rates is None or len(rates) == 0:
+            return 0
+
+        rates = np.asarray(rates).astype(RATES_DTYPE, copy=False)
+        last = self.last_time(symbol, timeframe)
+        if last is not None:
+            rates = rates[rates['time'] > last]
+        if len(rates) == 0:
+            return 0
+
+        path = self.path(symbol, timeframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'ab') as f:
+            f.write(np.ascontiguousarray(rates).tobytes())
+        return len(rates)
+
+    def write(self, symbol: str, timeframe: str, rates: np.ndarray) -> int:
+        """Replace all stored bars for a symbol/timeframe"""
+        path = self.path(symbol, timeframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rates = np.asarray(rates).astype(RATES_DTYPE, copy=False)
+        rates = rates[np.argsort(rates['time'], kind='stable')]
+        with open(path, 'wb') as f:
+            f.write(np.ascontiguousarray(rates).tobytes())
+        return len(rates)
+
+    def sync(self, symbol: str, timeframe: str, count: int = 10000) -> int:
+        """
+        Download closed bars newer than the last stored bar from MT5
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe (M1, M5, M15, M30, H1, H4, D1)
+            count: Bars to download when the store is empty
+
+        Returns:
+            Number of bars appended (0 if up to date or not connected)
+        """
+        if not connector.connected:
+            return 0
+        tf_const = timeframe_constant(timeframe)
+        if tf_const is None:
+            return 0
+
+        last = self.last_time(symbol, timeframe)
+
+        if last is None:
+            rates = mt5.copy_rates_from_pos(symbol, tf_const, 0, count)
+        else:
+            # Fetch newest bars in growing chunks until the stored bar is reached
+            chunk = self.SYNC_CHUNK
+            while True:
+                rates = mt5.copy_rates_from_pos(symbol, tf_const, 0, chunk)
+                if rates is None or len(rates) < chunk or rates['time'][0] <= last:
+                    break
+                chunk *= 2
+
+        if rates is None or len(rates) < 2:
+            return 0
+
+        # Last bar is still forming - store closed bars only
+        added = self.append(symbol, timeframe, rates[:-1])
+        if added:
+            logger.debug("Bar store: +%s %s %s bars", added, symbol, timeframe)
+        return added
+
+    def load(self, symbol: str, timeframe: str, start: Optional[datetime] = None,
+             end: Optional[datetime] = None, count: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        Load stored bars as a DataFrame indexed by bar open time
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            start: First bar open time to include
+            end: Last bar open time to include
+            count: Keep only the last `count` bars of the range
+
+        Returns:
+            DataFrame in the same format as MT5Connector.get_bars, or None
+        """
+        rates = self.read(symbol, timeframe)
+        if len(rates) == 0:
+            return None
+
+        times = rates['time']
+        lo = 0 if start is None else int(np.searchsorted(times, int(pd.Timestamp(start).timestamp()), side='left'))
+        hi = len(rates) if end is None else int(np.searchsorted(times, int(pd.Timestamp(end).timestamp()), side='right'))
+        if count is not None:
+            lo = max(lo, hi - count)
+        if hi <= lo:
+            return None
+
+        return rates_to_dataframe(np.array(rates[lo:hi]))
+
+    def get_bars(self, symbol: str, timeframe: str, count: int = 500) -> Optional[pd.DataFrame]:
+        """
+        Same result as MT5Connector.get_bars, with closed bars served from disk
+
+        Syncs the store, reads the closed bars locally and fetches only the
+        newest two bars from the terminal. Used for long warm-up histories.
+        With data.resample_base set, timeframes above the base are built from
+        the stored base bars instead of being downloaded.
+        """
+        if not config.data.use_bar_store:
+            return connector.get_bars(symbol, timeframe, count)
+
+        base = config.data.resample_base
+        if base and TIMEFRAME_SECONDS[timeframe] > TIMEFRAME_SECONDS[base]:
+            from .resample import sync_resampled  # resample imports this module
+            self.sync(symbol, base, count=count * TIMEFRAME_SECONDS[timeframe] // TIMEFRAME_SECONDS[base])
+            sync_resampled(symbol, base, [timeframe], store=self)
+        else:
+            self.sync(symbol, timeframe, count=count)
+        live = connector.get_bars(symbol, timeframe, count=2)
+        if live is None or len(live) < 2:
+            return live
+
+        closed = self.load(symbol, timeframe, end=live.index[-2], count=count - 1)
+        if closed is None or closed.index[-1] != live.index[-2]:
+            return connector.get_bars(symbol, timeframe, count)
+
+        return pd.concat([closed, live.iloc[-1:]])
+
+    # ------------------------------------------------------------------
+    # Ticks
+    # ------------------------------------------------------------------
+    def read_ticks(self, symbol: str) -> np.ndarray:
+        """
+        Memory-map all stored ticks (read-only)
+
+        Returns:
+            TICKS_DTYPE array (empty if nothing is stored)
+        """
+        return self._map(self.path(symbol, 'ticks'), TICKS_DTYPE)
+
+    def append_ticks(self, symbol: str, ticks: np.ndarray) -> int:
+        """
+        Append ticks newer than the last stored tick
+
+        Returns:
+            Number of ticks written
+        """
+        if ticks is None or len(ticks) == 0:
+            return 0
+
+        ticks = np.asarray(ticks).astype(TICKS_DTYPE, copy=False)
+        stored = self.read_ticks(symbol)
+        if len(stored):
+            ticks = ticks[ticks['time_msc'] > stored['time_msc'][-1]]
+        if len(ticks) == 0:
+            return 0
+
+        path = self.path(symbol, 'ticks')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'ab') as f:
+            f.write(np.ascontiguousarray(ticks).tobytes())
+        return len(ticks)
+
+    def sync_ticks(self, symbol: str, start: datetime, end: datetime) -> int:
+        """
+        Download ticks newer than the last stored tick from MT5
+
+        Ticks are requested one TICK_SYNC_SECONDS window at a time, so a
+        months-long gap never has to fit in memory at once.
+
+        Args:
+            symbol: Trading symbol
+            start: Download from here when no ticks are stored
+            end: Download up to here
+
+        Returns:
+            Number of ticks appended (0 if up to date or not connected)
+        """
+        if not connector.connected:
+            return 0
+
+        stored = self.read_ticks(symbol)
+        begin = int(stored['time'][-1]) if len(stored) else int(pd.Timestamp(start).timestamp())
+        stop = int(pd.Timestamp(end).timestamp())
+
+        added = 0
+        for window in range(begin, stop, self.TICK_SYNC_SECONDS):
+            ticks = mt5.copy_ticks_range(
+                symbol, pd.Timestamp(window, unit='s').to_pydatetime(),
+                pd.Timestamp(min(window + self.TICK_SYNC_SECONDS, stop), unit='s').to_pydatetime(),
+                mt5.COPY_TICKS_ALL
+            )
+            added += self.append_ticks(symbol, ticks)
+        if added:
+            logger.debug("Bar store: +%s %s ticks", added, symbol)
+        return added
+
+    def iter_ticks(self, symbol: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   chunk_size: int = 500000) -> Iterator[np.ndarray]:
+        """
+        Stream stored ticks in chronological chunks
+
+        Only one chunk is copied out of the memory map at a time, so months
+        of ticks replay in bounded memory.
+
+        Args:
+            symbol: Trading symbol
+            start: First tick time to include
+            end: Last tick time to include
+            chunk_size: Ticks per chunk
+
+        Yields:
+            TICKS_DTYPE arrays
+        """
+        ticks = self.read_ticks(symbol)
+        times = ticks['time_msc']
+        lo = 0 if start is None else int(np.searchsorted(times, int(pd.Timestamp(start).timestamp()) * 1000, side='left'))
+        hi = len(ticks) if end is None else int(np.searchsorted(times, int(pd.Timestamp(end).timestamp()) * 1000, side='right'))
+        for pos in range(lo, hi, chunk_size):
+            yield np.array(ticks[pos:min(pos + chunk_size, hi)])
+
+
+# Global bar store instance
+bar_store = BarStore()
@@ -0,0 +1,203 @@
+"""
+Synthetic PainX/GainX data generator
+Produces spike-index M1 bars (drift + random spikes) for benchmarks and tests
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Iterator, Optional, Tuple
+from .store import BarStore, RATES_DTYPE, TICKS_DTYPE, bar_store
+from .resample import resample_all
+
+# Higher timeframes written next to M1
+RESAMPLED_TIMEFRAMES = ('M5', 'M15', 'M30', 'H1', 'H4', 'D1')
+
+
+def parse_spike_symbol(symbol: str) -> Tuple[int, int]:
+    """
+    Spike direction and average interval from a symbol name
+
+    'PainX 400' -> (-1, 400): downward spikes every ~400 ticks
+    'GainX 999' -> (+1, 999): upward spikes every ~999 ticks
+    """
+    match = re.match(r'(pain|gain)\w*\s+(\d+)', symbol.strip(), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Not a PainX/GainX symbol: {symbol}")
+    direction = -1 if match.group(1).lower() == 'pain' else 1
+    return direction, int(match.group(2))
+
+
+def bars_to_ticks(rates: np.ndarray, spread_points: int = 2, digits: int = 2,
+                  spike_spread_factor: float = 3.0) -> np.ndarray:
+    """
+    Tick path through each M1 bar in copy_ticks_range layout
+
+    Every bar becomes four bid ticks at :00, :20, :40 and :59 -
+    open, low, high, close for an up bar and open, high, low, close for a
+    down bar - so replayed ticks reach the same extremes as the bars.
+    The ask is bid + spread; bars with a spike (tick_volume above
+    TICKS_PER_BAR) quote spike_spread_factor times the normal spread,
+    like the broker widening around spikes.
+
+    Args:
+        rates: RATES_DTYPE M1 bars
+        spread_points: Normal spread in points
+        digits: Price rounding (one point = 10 ** -digits)
+
+    Returns:
+        TICKS_DTYPE array, four ticks per bar
+    """
+    up = rates['close'] >= rates['open']
+    path = np.stack([
+        rates['open'],
+        np.where(up, rates['low'], rates['high']),
+        np.where(up, rates['high'], rates['low']),
+        rates['close'],
+    ], axis=1)
+
+    point = 10.0 ** -digits
+    spikes = rates['tick_volume'] > SpikeIndexGenerator.TICKS_PER_BAR
+    spread = np.where(spikes, spread_points * spike_spread_factor, spread_points) * point
+
+    ticks = np.zeros(path.size, dtype=TICKS_DTYPE)
+    time_msc = (rates['time'][:, None] * 1000 + np.array([0, 20000, 40000, 59000])).ravel()
+    ticks['time'] = time_msc // 1000
+    ticks['time_msc'] = time_msc
+    ticks['bid'] = path.ravel()
+    ticks['ask'] = np.round(ticks['bid'] + np.repeat(spread, 4), digits)
+    ticks['flags'] = 6  # TICK_FLAG_BID | TICK_FLAG_ASK
+    return ticks
+
+
+class SpikeIndexGenerator:
+    """
+    Vectorized generator for Pain/Gain style spike indices
+
+    Prices follow a log random walk sampled at one tick per second.
+    Spikes arrive as a Poisson process with the symbol's average tick
+    interval (400/600/800/999) and jump against a slow drift that keeps
+    the long-run expected return at zero, like the broker indices.
+    Everything is generated per M1 bar: spike counts are Poisson(60 /
+    interval), spike sizes are Gamma-distributed sums of exponential
+    jumps, and high/low extend the open/close range by a half-normal
+    intrabar excursion. The same seed (and chunk size) always yields the
+    same bars.
+    """
+
+    TICKS_PER_BAR = 60
+
+    def __init__(self, symbol: str, seed: int = 42, start_price: float = 10000.0,
+                 tick_volatility: float = 0.00003, spike_size: float = 0.004,
+                 digits: int = 2):
+        """
+        Args:
+            symbol: 'PainX <interval>' or 'GainX <interval>'
+            seed: Random seed
+            start_price: First open price
+            tick_volatility: Log-return standard deviation per tick
+            spike_size: Mean log size of a single spike
+            digits: Price rounding
+        """
+        self.symbol = symbol
+        self.direction, self.interval = parse_spike_symbol(symbol)
+        self.seed = seed
+        self.start_price = start_price
+        self.tick_volatility = tick_volatility
+        self.spike_size = spike_size
+        self.digits = digits
+
+    def chunks(self, start, days: int, chunk_days: int = 30) -> Iterator[np.ndarray]:
+        """
+        Generate M1 bars in whole-day chunks
+
+        Chunks always end on a day boundary, so every higher-timeframe
+        bucket is complete within one chunk.
+
+        Args:
+            start: First bar open time (rounded down to midnight)
+            days: Number of days to generate
+            chunk_days: Days per chunk (bounds memory use)
+
+        Yields:
+            RATES_DTYPE arrays of M1 bars
+        """
+        rng = np.random.default_rng(self.seed)
+        t0 = int(pd.Timestamp(start).normalize().timestamp())
+        log_price = np.log(self.start_price)
+
+        spikes_per_bar = self.TICKS_PER_BAR / self.interval
+        drift = -self.direction * spikes_per_bar * self.spike_size  # Offsets the expected spike move
+        bar_vol = self.tick_volatility * np.sqrt(self.TICKS_PER_BAR)
+
+        for day in range(0, days, chunk_days):
+            count = min(chunk_days, days - day) * 1440
+
+            spikes = rng.poisson(spikes_per_bar, count)
+            jumps = rng.gamma(np.maximum(spikes, 1), self.spike_size) * (spikes > 0)
+            moves = drift + rng.normal(0.0, bar_vol, count) + self.direction * jumps
+
+            closes = log_price + np.cumsum(moves)
+            opens = np.r_[log_price, closes[:-1]]
+            log_price = closes[-1]
+
+            wick_up = np.abs(rng.normal(0.0, bar_vol * 0.5, count))
+            wick_down = np.abs(rng.normal(0.0, bar_vol * 0.5, count))
+
+            rates = np.zeros(count, dtype=RATES_DTYPE)
+            rates['time'] = t0 + (day * 1440 + np.arange(count)) * 60
+            rates['open'] = np.round(np.exp(opens), self.digits)
+            rates['close'] = np.round(np.exp(closes), self.digits)
+            rates['high'] = np.round(np.exp(np.maximum(opens, closes) + wick_up), self.digits)
+            rates['low'] = np.round(np.exp(np.minimum(opens, closes) - wick_down), self.digits)
+            rates['high'] = np.maximum(rates['high'], np.maximum(rates['open'], rates['close']))
+            rates['low'] = np.minimum(rates['low'], np.minimum(rates['open'], rates['close']))
+            rates['tick_volume'] = self.TICKS_PER_BAR + spikes
+            yield rates
+
+    def generate(self, start, days: int, chunk_days: int = 30) -> np.ndarray:
+        """Generate all M1 bars at once"""
+        return np.concatenate(list(self.chunks(start, days, chunk_days)))
+
+    def write_to_store(self, start, days: int, store: Optional[BarStore] = None,
+                       chunk_days: int = 30) -> int:
+        """
+        Generate M1 bars and their resampled timeframes into the bar store
+
+        Existing bars for the symbol are replaced.
+
+        Returns:
+            Number of M1 bars written
+        """
+        store = store or bar_store
+        total = 0
+        for rates in self.chunks(start, days, chunk_days):
+            resampled = resample_all(rates, RESAMPLED_TIMEFRAMES)
+            resampled['M1'] = rates
+            for timeframe, bars in resampled.items():
+                if total == 0:
+                    store.write(self.symbol, timeframe, bars)
+                else:
+                    store.append(self.symbol, timeframe, bars)
+            total += len(rates)
+        return total
+
+    def write_ticks_to_store(self, start, days: int, store: Optional[BarStore] = None,
+                             spread_points: int = 2, chunk_days: int = 30) -> int:
+        """
+        Generate the M1 bars' tick paths (see bars_to_ticks) into the bar store
+
+        Existing ticks for the symbol are replaced. Same seed and chunk size
+        as write_to_store give ticks that match the stored bars.
+
+        Returns:
+            Number of ticks written
+        """
+        store = store or bar_store
+        path = store.path(self.symbol, 'ticks')
+        if path.exists():
+            path.unlink()
+        total = 0
+        for rates in self.chunks(start, days, chunk_days):
+            total += store.append_ticks(self.symbol, bars_to_ticks(rates, spread_points, self.digits))
+        return total
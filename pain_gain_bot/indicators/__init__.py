@@ -1,5 +1,7 @@
 """Technical indicators module"""
 
 from .technical import TechnicalIndicators, IndicatorCache, indicators, indicator_cache
+from .streaming import EMAState, RollingExtremum, SwingState, StreamingIndicators, streaming_indicators
 
-__all__ = ['TechnicalIndicators', 'IndicatorCache', 'indicators', 'indicator_cache']
+__all__ = ['TechnicalIndicators', 'IndicatorCache', 'indicators', 'indicator_cache',
+           'EMAState', 'RollingExtremum', 'SwingState', 'StreamingIndicators', 'streaming_indicators']
@@ -0,0 +1,286 @@
+"""
+Incremental (streaming) EMA and swing state for live trading
+Seeds each indicator once from history and updates it in O(1) per closed bar
+"""
+
+import numpy as np
+import pandas as pd
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
+from ..data.mt5_connector import connector
+from ..data.store import bar_store
+from ..utils.logger import logger
+from ..utils.latency import latency
+
+
+class EMAState:
+    """EMA over closed bars, matching ewm(span=period, adjust=False)"""
+
+    __slots__ = ('period', 'alpha', 'value', 'history')
+
+    def __init__(self, period: int, history_size: int = 16):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value = None
+        self.history = deque(maxlen=history_size)  # Recent closed-bar values
+
+    def seed(self, closes: np.ndarray):
+        """Initialize from a run of closed-bar closes (oldest first)"""
+        self.value = None
+        self.history.clear()
+        for close in closes:
+            self.update(close)
+
+    def update(self, close: float) -> float:
+        """Fold one newly closed bar into the EMA"""
+        if self.value is None:
+            self.value = float(close)
+        else:
+            self.value += self.alpha * (float(close) - self.value)
+        self.history.append(self.value)
+        return self.value
+
+    def peek(self, close: float) -> float:
+        """Provisional value including the forming bar (state unchanged)"""
+        if self.value is None:
+            return float(close)
+        return self.value + self.alpha * (float(close) - self.value)
+
+
+class RollingExtremum:
+    """
+    Max (or min) of the last `window` values via a monotonic deque
+
+    The deque holds (position, value) pairs with values strictly decreasing
+    (max) or increasing (min) from the front, so the front is the current
+    extremum. Each value is pushed and popped at most once: O(1) amortized.
+    """
+
+    __slots__ = ('window', 'mode', 'count', 'deque')
+
+    def __init__(self, window: int, mode: str = 'max'):
+        self.window = window
+        self.mode = mode
+        self.count = 0
+        self.deque = deque()
+
+    def update(self, value: float) -> Optional[float]:
+        """Push one value, dropping those that left the window or can never be the extremum"""
+        value = float(value)
+        if self.mode == 'max':
+            while self.deque and self.deque[-1][1] <= value:
+                self.deque.pop()
+        else:
+            while self.deque and self.deque[-1][1] >= value:
+                self.deque.pop()
+        self.deque.append((self.count, value))
+        self.count += 1
+        while self.deque[0][0] <= self.count - 1 - self.window:
+            self.deque.popleft()
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        """Extremum of the window (None before the first value)"""
+        return self.deque[0][1] if self.deque else None
+
+
+class SwingState:
+    """
+    Swing high/low of the last `lookback` bars, forming bar included
+
+    Closed bars feed two rolling extrema over lookback-1 bars; the forming
+    bar is combined on read, like find_swing_high_low on a fresh fetch.
+    """
+
+    __slots__ = ('lookback', 'highs', 'lows')
+
+    def __init__(self, lookback: int):
+        self.lookback = lookback
+        self.highs = RollingExtremum(lookback - 1, 'max')
+        self.lows = RollingExtremum(lookback - 1, 'min')
+
+    def seed(self, highs: np.ndarray, lows: np.ndarray):
+        """Initialize from closed bars (oldest first); only the last lookback-1 matter"""
+        self.highs = RollingExtremum(self.lookback - 1, 'max')
+        self.lows = RollingExtremum(self.lookback - 1, 'min')
+        start = max(len(highs) - (self.lookback - 1), 0)
+        for high, low in zip(highs[start:], lows[start:]):
+            self.update(high, low)
+
+    def update(self, high: float, low: float):
+        """Fold one newly closed bar into the swing"""
+        if self.lookback > 1:
+            self.highs.update(high)
+            self.lows.update(low)
+
+    def peek(self, high: float, low: float) -> Optional[Tuple[float, float]]:
+        """(swing_high, swing_low) including the forming bar, None until lookback bars exist"""
+        if self.highs.count < self.lookback - 1:
+            return None
+        if self.lookback == 1:
+            return float(high), float(low)
+        return max(self.highs.value, float(high)), min(self.lows.value, float(low))
+
+
+class StreamingIndicators:
+    """
+    Stateful EMA and swing layer keyed by (symbol, timeframe, period/lookback)
+
+    The first update for a symbol/timeframe pulls `warmup_bars` bars and
+    seeds every requested period from the closed bars. Later updates fetch
+    only the newest few bars and fold in the bars that closed since the
+    previous update, so snake, shingle, squid and purple line values are
+    warm-up correct and cost O(1) per closed bar. The forming (last) bar
+    is applied provisionally on read, like calculate_ema(...).iloc[-1].
+    Swing highs/lows (Fibonacci inputs) are kept the same way with
+    monotonic deques instead of rescanning the last `lookback` bars.
+    """
+
+    REFRESH_BARS = 3  # Two closed bars + the forming bar
+
+    def __init__(self, warmup_bars: int = 500, history_size: int = 16):
+        self.warmup_bars = warmup_bars
+        self.history_size = history_size
+
+        self._states: Dict[Tuple[str, str], Dict[int, EMAState]] = {}  # (symbol, tf) -> period -> state
+        self._swings: Dict[Tuple[str, str], Dict[int, SwingState]] = {}  # (symbol, tf) -> lookback -> state
+        self._recent: Dict[Tuple[str, str], pd.DataFrame] = {}  # closed bars + forming bar
+
+    def _seed(self, symbol: str, timeframe: str, periods: Iterable[int],
+              lookbacks: Iterable[int] = ()) -> bool:
+        """Seed all requested periods and swing lookbacks for a symbol/timeframe from history"""
+        df = bar_store.get_bars(symbol, timeframe, count=self.warmup_bars)
+        if df is None or len(df) < 2:
+            return False
+
+        closed = df.iloc[:-1]
+        closes = closed['close'].to_numpy()
+        states = {}
+        for period in periods:
+            states[period] = EMAState(period, self.history_size)
+            states[period].seed(closes)
+
+        swings = {}
+        for lookback in lookbacks:
+            swings[lookback] = SwingState(lookback)
+            swings[lookback].seed(closed['high'].to_numpy(), closed['low'].to_numpy())
+
+        self._states[(symbol, timeframe)] = states
+        self._swings[(symbol, timeframe)] = swings
+        self._recent[(symbol, timeframe)] = df.tail(self.history_size)
+        logger.debug("Streaming indicators seeded: %s %s periods=%s swings=%s from %s closed bars", symbol, timeframe, sorted(periods), sorted(lookbacks), len(df) - 1)
+        return True
+
+    @latency.timed('indicators.update')
+    def update(self, symbol: str, timeframe: str, periods: Iterable[int], snapshot=None,
+               swing_lookbacks: Iterable[int] = ()) -> bool:
+        """
+        Bring the EMA and swing states for a symbol/timeframe up to date
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe (M1, M5, M15, M30, H1, H4, D1)
+            periods: EMA periods the caller will read
+            snapshot: MarketSnapshot to read the refresh bars from (default: connector)
+            swing_lookbacks: Swing lookbacks the caller will read
+
+        Returns:
+            True if current values are available
+        """
+        key = (symbol, timeframe)
+        recent = self._recent.get(key)
+        states = self._states.get(key, {})
+        swings = self._swings.get(key, {})
+
+        if recent is None or not states.keys() >= set(periods) or not swings.keys() >= set(swing_lookbacks):
+            return self._seed(symbol, timeframe, set(periods) | states.keys(),
+                              set(swing_lookbacks) | swings.keys())
+
+        df = (snapshot or connector).get_bars(symbol, timeframe, count=self.REFRESH_BARS)
+        if df is None or len(df) < 2:
+            return False
+
+        last_closed = recent.index[-2] if len(recent) >= 2 else None
+        closed = df.iloc[:-1]
+        new_closed = closed[closed.index > last_closed] if last_closed is not None else closed
+
+        if len(new_closed) > 0 and closed.index[0] > recent.index[-1]:
+            # The previous forming bar is not in the refresh: more bars closed
+            # than one refresh covers - reseed instead of skipping bars
+            return self._seed(symbol, timeframe, states.keys(), swings.keys())
+
+        for close in new_closed['close'].to_numpy():
+            for state in states.values():
+                state.update(close)
+        for high, low in zip(new_closed['high'].to_numpy(), new_closed['low'].to_numpy()):
+            for swing in swings.values():
+                swing.update(high, low)
+
+        self._recent[key] = pd.concat([recent.iloc[:-1], new_closed, df.iloc[-1:]]).tail(self.history_size)
+        return True
+
+    def bars(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Recent bars (closed bars followed by the forming bar)"""
+        return self._recent.get((symbol, timeframe))
+
+    def last_close(self, symbol: str, timeframe: str) -> Optional[float]:
+        """Close of the forming bar"""
+        recent = self._recent.get((symbol, timeframe))
+        return None if recent is None else float(recent['close'].iloc[-1])
+
+    def ema(self, symbol: str, timeframe: str, period: int) -> Optional[float]:
+        """Current EMA value including the forming bar"""
+        state = self._states.get((symbol, timeframe), {}).get(period)
+        close = self.last_close(symbol, timeframe)
+        if state is None or close is None:
+            return None
+        return state.peek(close)
+
+    def ema_values(self, symbol: str, timeframe: str, period: int, count: int) -> Optional[pd.Series]:
+        """
+        Last `count` EMA values aligned to bars(symbol, timeframe).tail(count)
+
+        Returns:
+            Series indexed by bar time (closed-bar values, then the forming bar)
+        """
+        state = self._states.get((symbol, timeframe), {}).get(period)
+        recent = self._recent.get((symbol, timeframe))
+        if state is None or recent is None:
+            return None
+
+        count = min(count, len(recent), len(state.history) + 1)
+        values = list(state.history)[len(state.history) - (count - 1):] if count > 1 else []
+        values.append(state.peek(recent['close'].iloc[-1]))
+        return pd.Series(values, index=recent.index[-count:])
+
+    def swing(self, symbol: str, timeframe: str, lookback: int) -> Optional[Tuple[float, float]]:
+        """
+        Current swing over the last `lookback` bars including the forming bar
+
+        Returns:
+            (swing_high, swing_low), or None if not tracked / not enough bars
+        """
+        state = self._swings.get((symbol, timeframe), {}).get(lookback)
+        recent = self._recent.get((symbol, timeframe))
+        if state is None or recent is None:
+            return None
+        return state.peek(recent['high'].iloc[-1], recent['low'].iloc[-1])
+
+    def reset(self, symbol: Optional[str] = None):
+        """Drop state for one symbol (or everything) so it is reseeded"""
+        if symbol is None:
+            self._states.clear()
+            self._swings.clear()
+            self._recent.clear()
+            return
+        for key in [k for k in self._states if k[0] == symbol]:
+            del self._states[key]
+        for key in [k for k in self._swings if k[0] == symbol]:
+            del self._swings[key]
+        for key in [k for k in self._recent if k[0] == symbol]:
+            del self._recent[key]
+
+
+# Global streaming indicator instance
+streaming_indicators = StreamingIndicators()
@@ -3,18 +3,94 @@ Technical indicators for Pain/Gain strategy
 Implements snake, shingle, squid, purple line, and Fibonacci calculations
 """
 
+import sys
+import threading
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple, Optional
 from ..utils.logger import logger
+from ..utils.latency import latency
 
 class TechnicalIndicators:
-    """Collection of technical indicators for Pain/Gain strategy"""
+    """
+    Collection of technical indicators for Pain/Gain strategy
+
+    Methods taking `df` accept a pandas OHLC DataFrame or a BarSeries.
+    With a BarSeries, columns are NumPy arrays and EMA outputs are arrays
+    instead of Series, which avoids pandas overhead on short windows.
+    """
+
+    @staticmethod
+    def _at(values, position: int = -1) -> float:
+        """Element at a position of a Series or array"""
+        return values.iloc[position] if isinstance(values, pd.Series) else values[position]
 
     @staticmethod
-    def calculate_ema(data: pd.Series, period: int) -> pd.Series:
-        """Calculate Exponential Moving Average"""
-        return data.ewm(span=period, adjust=False).mean()
+    def calculate_ema(data, period: int):
+        """
+        Calculate Exponential Moving Average
+
+        Returns:
+            Series for Series input, otherwise an array (same values as
+            ewm(span=period, adjust=False))
+        """
+        if isinstance(data, pd.Series):
+            return data.ewm(span=period, adjust=False).mean()
+
+        # Same update (and rounding) as pandas' adjust=False ewm, on plain floats
+        alpha = 2.0 / (period + 1)
+        keep = 1.0 - alpha
+        total = keep + alpha
+        values = np.asarray(data, dtype=float).tolist()
+        result = np.empty(len(values))
+        if not values:
+            return result
+        weighted = values[0]
+        for i, value in enumerate(values):
+            if weighted != value:
+                weighted = (keep * weighted + alpha * value) / total
+            result[i] = weighted
+        return result
+
+    @staticmethod
+    def calculate_window_ema(data, period: int, window: int, lag: int = 0) -> np.ndarray:
+        """
+        Calculate the EMA of every trailing window in one pass
+
+        Element i equals calculate_ema(data[i-window+1:i+1], period).iloc[-1-lag],
+        i.e. the EMA seeded at the first bar of a `count=window` fetch ending
+        at bar i, read `lag` bars before the window end. With S the EMA
+        recursion seeded at zero, the EMA seeded at bar j and read at bar k
+        is decay**(k-j) * (x[j] - S[j]) + S[k].
+
+        Args:
+            data: Price series (Series or array)
+            period: EMA period
+            window: Number of bars in each trailing window
+            lag: Bars back from the window end to read the value at
+
+        Returns:
+            Array aligned to data (NaN where the window is shorter than lag+1)
+        """
+        values = np.asarray(data, dtype=float)
+        count = len(values)
+        decay = 1.0 - 2.0 / (period + 1)
+
+        zero_seeded = pd.Series(np.concatenate(([0.0], values))).ewm(
+            span=period, adjust=False
+        ).mean().to_numpy()[1:]
+
+        positions = np.arange(count)
+        seed = np.maximum(positions - window + 1, 0)
+        at = positions - lag
+        valid = at >= seed
+
+        result = np.full(count, np.nan)
+        j = seed[valid]
+        k = at[valid]
+        result[valid] = decay ** (k - j) * (values[j] - zero_seeded[j]) + zero_seeded[k]
+        return result
 
     @staticmethod
     def calculate_sma(data: pd.Series, period: int) -> pd.Series:
@@ -36,7 +112,8 @@ class TechnicalIndicators:
         slow_ema = TechnicalIndicators.calculate_ema(df['close'], slow_period)
 
         # Determine color: GREEN when fast > slow, RED when fast < slow
-        current_color = 'GREEN' if fast_ema.iloc[-1] > slow_ema.iloc[-1] else 'RED'
+        at = TechnicalIndicators._at
+        current_color = 'GREEN' if at(fast_ema) > at(slow_ema) else 'RED'
 
         return fast_ema, slow_ema, current_color
 
@@ -52,8 +129,8 @@ class TechnicalIndicators:
         ema = TechnicalIndicators.calculate_ema(df['close'], period)
 
         # Color based on price relative to EMA
-        current_price = df['close'].iloc[-1]
-        current_color = 'GREEN' if current_price > ema.iloc[-1] else 'RED'
+        current_price = TechnicalIndicators._at(df['close'])
+        current_color = 'GREEN' if current_price > TechnicalIndicators._at(ema) else 'RED'
 
         return ema, current_color
 
@@ -79,7 +156,8 @@ class TechnicalIndicators:
 
         # Determine color based on slope/trend
         if len(ema) >= 2:
-            current_color = 'GREEN' if ema.iloc[-1] > ema.iloc[-2] else 'RED'
+            at = TechnicalIndicators._at
+            current_color = 'GREEN' if at(ema, -1) > at(ema, -2) else 'RED'
         else:
             current_color = 'GREEN'
 
@@ -110,11 +188,65 @@ class TechnicalIndicators:
 
         return levels
 
+    @staticmethod
+    def rolling_extremum(values, window: int, mode: str = 'max') -> np.ndarray:
+        """
+        Rolling max/min of every trailing window in O(N)
+
+        Uses block prefix/suffix extrema (van Herk / Gil-Werman): the window
+        ending at bar i spans at most two blocks of `window` bars, so its
+        extremum is the suffix extremum of the first block combined with the
+        prefix extremum of the second. No window is rescanned.
+
+        Args:
+            values: Price series (Series or array)
+            window: Number of bars in each window
+            mode: 'max' or 'min'
+
+        Returns:
+            Array aligned to values (NaN for the first window-1 bars)
+        """
+        values = np.asarray(values, dtype=float)
+        count = len(values)
+        result = np.full(count, np.nan)
+        if window < 1 or count < window:
+            return result
+
+        combine = np.maximum if mode == 'max' else np.minimum
+        pad = -np.inf if mode == 'max' else np.inf
+        blocks = -(-count // window)
+        padded = np.full(blocks * window, pad)
+        padded[:count] = values
+        padded = padded.reshape(blocks, window)
+
+        prefix = combine.accumulate(padded, axis=1).ravel()[:count]
+        suffix = combine.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()[:count]
+
+        ends = np.arange(window - 1, count)
+        result[window - 1:] = combine(suffix[ends - window + 1], prefix[ends])
+        return result
+
+    @staticmethod
+    def rolling_swing_series(high, low, lookback: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Swing high/low of the `lookback` bars ending at every bar
+
+        Batch form of find_swing_high_low (and of the live SwingState).
+
+        Returns:
+            (swing_high, swing_low) arrays aligned to the bars
+        """
+        return (TechnicalIndicators.rolling_extremum(high, lookback, 'max'),
+                TechnicalIndicators.rolling_extremum(low, lookback, 'min'))
+
     @staticmethod
     def find_swing_high_low(df: pd.DataFrame, lookback: int = 20) -> Tuple[float, float]:
         """
         Find swing high and low in recent bars
 
+        Live code should read streaming_indicators.swing() instead, which keeps
+        the extremes incrementally.
+
         Args:
             df: OHLC DataFrame
             lookback: Number of bars to look back
@@ -145,12 +277,10 @@ class TechnicalIndicators:
             return 'NONE', 0.0, 0.0
 
         # Get previous day's candle (index -2, since -1 is current incomplete day)
-        prev_candle = df_daily.iloc[-2]
-
-        open_price = prev_candle['open']
-        close_price = prev_candle['close']
-        high_price = prev_candle['high']
-        low_price = prev_candle['low']
+        open_price = TechnicalIndicators._at(df_daily['open'], -2)
+        close_price = TechnicalIndicators._at(df_daily['close'], -2)
+        high_price = TechnicalIndicators._at(df_daily['high'], -2)
+        low_price = TechnicalIndicators._at(df_daily['low'], -2)
 
         # Determine body
         body_top = max(open_price, close_price)
@@ -185,13 +315,39 @@ class TechnicalIndicators:
         wick_50_percent = (wick_start + wick_end) / 2
 
         logger.debug(
-            f"D1 Wick Analysis: direction={direction}, "
-            f"body_ratio={body_ratio:.2f}, wick_size={wick_size:.5f}, "
-            f"50%_level={wick_50_percent:.5f}"
+            "D1 Wick Analysis: direction=%s, body_ratio=%.2f, wick_size=%.5f, 50%%_level=%.5f",
+            direction, body_ratio, wick_size, wick_50_percent
         )
 
         return direction, wick_size, wick_50_percent
 
+    @staticmethod
+    def wick_direction_series(open_, high, low, close) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        check_wick_direction's analysis for every D1 candle at once
+
+        Args:
+            open_, high, low, close: D1 price arrays (or Series)
+
+        Returns:
+            (wick_up, wick_size, wick_50_percent) arrays aligned to the candles;
+            wick_up is False ('DOWN') when the wicks are equal
+        """
+        open_ = np.asarray(open_, dtype=float)
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        close = np.asarray(close, dtype=float)
+
+        body_top = np.maximum(open_, close)
+        body_bottom = np.minimum(open_, close)
+        upper_wick = high - body_top
+        lower_wick = body_bottom - low
+
+        wick_up = upper_wick > lower_wick
+        wick_size = np.where(wick_up, upper_wick, lower_wick)
+        wick_50 = np.where(wick_up, (body_top + high) / 2, (low + body_bottom) / 2)
+        return wick_up, wick_size, wick_50
+
     @staticmethod
     def is_wick_50_percent_filled(current_price: float, wick_direction: str,
                                    wick_50_level: float) -> bool:
@@ -216,63 +372,189 @@ class TechnicalIndicators:
         return False
 
     @staticmethod
-    def check_h4_50_percent_coverage(df_h4: pd.DataFrame, df_m15: pd.DataFrame,
-                                      direction: str) -> Tuple[bool, float]:
+    def h4_largest_body_series(open_, close) -> np.ndarray:
         """
-        Check if previous H4 candle covers 50% of M15 Fibonacci range
+        Index of the largest-body H4 candle among the three before each bar
+
+        Element i is the position of the largest |close - open| among bars
+        i-3 .. i-1 (tail(4).head(3) of a window ending at bar i, so the
+        forming bar is skipped; the first wins on ties). Windows shorter than
+        four bars fall back to their first three bars.
 
         Args:
-            df_h4: H4 OHLC data
-            df_m15: M15 OHLC data
-            direction: 'BUY' or 'SELL'
+            open_, close: H4 price arrays (or Series)
 
         Returns:
-            (covers_50_percent, fib_50_level)
+            int64 array of bar positions aligned to the bars
         """
-        if len(df_h4) < 2 or len(df_m15) < 20:
-            return False, 0.0
+        body = np.abs(np.asarray(close, dtype=float) - np.asarray(open_, dtype=float))
+        count = len(body)
+        pick = np.zeros(count, dtype=np.int64)
+        if count >= 4:
+            previous = np.stack([body[0:-3], body[1:-2], body[2:-1]])
+            pick[3:] = np.arange(count - 3) + previous.argmax(axis=0)
+        for i in range(1, min(count, 3)):
+            pick[i] = int(np.argmax(body[:i + 1]))
+        return pick
+
+    @staticmethod
+    def h4_50_percent_coverage_series(m15_high, m15_low, h4_open, h4_close, h4_high, h4_low,
+                                      h4_count, direction: str, lookback: int = 20) -> Dict[str, np.ndarray]:
+        """
+        H4 50% coverage evaluated at every M15 bar in one pass
 
-        # Find swing high/low in M15 (recent 20 bars)
-        swing_high, swing_low = TechnicalIndicators.find_swing_high_low(df_m15, lookback=20)
+        For each M15 bar the swing high/low is the rolling `lookback`-bar
+        extreme ending at that bar and fib_50 its 50% retracement. The H4
+        window for the bar is the first h4_count[i] H4 bars; the largest-body
+        candle among its three bars before the forming one must span fib_50.
+
+        Args:
+            m15_high, m15_low: M15 price arrays (or Series)
+            h4_open, h4_close, h4_high, h4_low: H4 price arrays (or Series)
+            h4_count: Number of H4 bars visible at each M15 bar
+            direction: 'BUY' or 'SELL'
+            lookback: M15 bars in the swing
 
-        # Calculate Fibonacci
+        Returns:
+            Dict of arrays aligned to the M15 bars: swing_high, swing_low,
+            fib_50, candle_high, candle_low (of the picked H4 candle) and the
+            boolean 'covers' (False where fewer than lookback M15 or 2 H4 bars)
+        """
+        swing_high, swing_low = TechnicalIndicators.rolling_swing_series(m15_high, m15_low, lookback)
         if direction == 'SELL':
-            fib_levels = TechnicalIndicators.calculate_fibonacci_retracement(swing_high, swing_low)
+            fib_50 = swing_high - 0.500 * (swing_high - swing_low)
         else:  # BUY
-            fib_levels = TechnicalIndicators.calculate_fibonacci_retracement(swing_low, swing_high)
-
-        fib_50_level = fib_levels['50.0']
+            fib_50 = swing_low - 0.500 * (swing_low - swing_high)
+
+        h4_count = np.asarray(h4_count, dtype=np.int64)
+        pick = TechnicalIndicators.h4_largest_body_series(h4_open, h4_close)
+        if len(pick):
+            candle = pick[np.maximum(h4_count - 1, 0)]
+            candle_high = np.asarray(h4_high, dtype=float)[candle]
+            candle_low = np.asarray(h4_low, dtype=float)[candle]
+        else:
+            candle_high = candle_low = np.full(len(fib_50), np.nan)
+
+        with np.errstate(invalid='ignore'):
+            covers = (h4_count >= 2) & (candle_low <= fib_50) & (fib_50 <= candle_high)
+
+        return {
+            'swing_high': swing_high,
+            'swing_low': swing_low,
+            'fib_50': fib_50,
+            'candle_high': candle_high,
+            'candle_low': candle_low,
+            'covers': covers,
+        }
 
-        # Check previous H4 candle (find largest body)
-        # Look at last 3 H4 candles and pick the one with largest body
-        recent_h4 = df_h4.tail(4).head(3)  # Skip current incomplete candle
+    @staticmethod
+    def check_h4_50_percent_coverage(df_h4: pd.DataFrame, df_m15: Optional[pd.DataFrame],
+                                      direction: str, lookback: int = 20,
+                                      swing: Optional[Tuple[float, float]] = None) -> Tuple[bool, float]:
+        """
+        Check if previous H4 candle covers 50% of M15 Fibonacci range
 
-        bodies = []
-        for idx, candle in recent_h4.iterrows():
-            body_size = abs(candle['close'] - candle['open'])
-            bodies.append((body_size, candle))
+        Args:
+            df_h4: H4 OHLC data
+            df_m15: M15 OHLC data (unused when swing is given)
+            direction: 'BUY' or 'SELL'
+            lookback: M15 bars in the swing
+            swing: Precomputed (swing_high, swing_low) of the last `lookback` M15 bars,
+                   e.g. from streaming_indicators.swing()
 
-        if not bodies:
-            return False, fib_50_level
+        Returns:
+            (covers_50_percent, fib_50_level)
+        """
+        if swing is not None:
+            # A one-bar "window" whose high/low are the swing extremes
+            m15_high, m15_low = np.array([swing[0]]), np.array([swing[1]])
+            lookback = 1
+        elif df_m15 is None or len(df_m15) < lookback:
+            return False, 0.0
+        else:
+            # Only the last M15 bar is needed: its swing and the last 4 H4 bars
+            recent_m15 = df_m15.tail(lookback)
+            m15_high, m15_low = np.asarray(recent_m15['high']), np.asarray(recent_m15['low'])
 
-        # Get candle with largest body
-        largest_body_candle = max(bodies, key=lambda x: x[0])[1]
+        if len(df_h4) < 2:
+            return False, 0.0
 
-        # Check if this candle covered the 50% level
-        candle_high = largest_body_candle['high']
-        candle_low = largest_body_candle['low']
+        recent_h4 = df_h4.tail(4)
+        coverage = TechnicalIndicators.h4_50_percent_coverage_series(
+            m15_high, m15_low,
+            np.asarray(recent_h4['open']), np.asarray(recent_h4['close']),
+            np.asarray(recent_h4['high']), np.asarray(recent_h4['low']),
+            np.full(len(m15_high), len(recent_h4)), direction, lookback=lookback
+        )
 
-        covers_50 = candle_low <= fib_50_level <= candle_high
+        fib_50_level = coverage['fib_50'][-1]
+        candle_high = coverage['candle_high'][-1]
+        candle_low = coverage['candle_low'][-1]
+        covers_50 = bool(coverage['covers'][-1])
 
         logger.debug(
-            f"H4 50% Check: direction={direction}, "
-            f"fib_50={fib_50_level:.5f}, "
-            f"H4_range=[{candle_low:.5f}, {candle_high:.5f}], "
-            f"covers={covers_50}"
+            "H4 50%% Check: direction=%s, fib_50=%.5f, H4_range=[%.5f, %.5f], covers=%s",
+            direction, fib_50_level, candle_low, candle_high, covers_50
         )
 
         return covers_50, fib_50_level
 
+    @staticmethod
+    def purple_line_break_retest_series(open_, close, low, high, purple, direction: str,
+                                        lookback: int = 5, tolerance: float = 0.0002,
+                                        purple_at_lag: Optional[Callable[[int], np.ndarray]] = None) -> np.ndarray:
+        """
+        Break/retest of the purple line evaluated at every bar in one pass
+
+        Element i is True when one of bars i-lookback .. i-1 broke the purple
+        line (BUY: open at/below, close above; SELL: the reverse) and bar i
+        touches it again (BUY: low, SELL: high within tolerance of purple[i]).
+        The first `lookback` bars are always False.
+
+        Args:
+            open_, close, low, high: Price arrays (or Series)
+            purple: Purple line aligned to the bars
+            direction: 'BUY' or 'SELL'
+            lookback: Number of bars to look back for break
+            tolerance: Max distance for a retest touch
+            purple_at_lag: Optional lag -> array giving, for every bar i, the purple
+                value to test bar i-lag against (for EMAs re-seeded per window).
+                Default: the purple line itself.
+
+        Returns:
+            Boolean array aligned to the bars
+        """
+        open_ = np.asarray(open_, dtype=float)
+        close = np.asarray(close, dtype=float)
+        purple = np.asarray(purple, dtype=float)
+        count = len(close)
+        broken = np.zeros(count, dtype=bool)
+
+        with np.errstate(invalid='ignore'):
+            if purple_at_lag is None:
+                # Rolling "any break in the previous lookback bars" via a running count
+                if direction == 'BUY':
+                    breaks = (close > purple) & (open_ <= purple)
+                else:
+                    breaks = (close < purple) & (open_ >= purple)
+                running = np.concatenate(([0], np.cumsum(breaks)))
+                positions = np.arange(count)
+                broken = running[positions] > running[np.maximum(positions - lookback, 0)]
+            else:
+                positions = np.arange(count)
+                for lag in range(1, lookback + 1):
+                    lagged = np.asarray(purple_at_lag(lag), dtype=float)
+                    k = np.maximum(positions - lag, 0)
+                    if direction == 'BUY':
+                        broken |= (close[k] > lagged) & (open_[k] <= lagged)
+                    else:
+                        broken |= (close[k] < lagged) & (open_[k] >= lagged)
+
+            touch = np.asarray(low if direction == 'BUY' else high, dtype=float)
+            retest = np.abs(touch - purple) <= tolerance
+
+        return broken & retest & (np.arange(count) >= lookback)
+
     @staticmethod
     def detect_purple_line_break_retest(df: pd.DataFrame, purple_line: pd.Series,
                                         direction: str, lookback: int = 5) -> bool:
@@ -286,71 +568,143 @@ class TechnicalIndicators:
             lookback: Number of bars to look back for break
 
         Returns:
-            True if valid break-retest pattern detected
+            True if valid break-retest pattern detected on the last bar
         """
         if len(df) < lookback + 1 or len(purple_line) < lookback + 1:
             return False
 
-        recent_bars = df.tail(lookback + 1)
-        recent_purple = purple_line.tail(lookback + 1)
-
-        # Check for break followed by retest
-        break_detected = False
-        retest_detected = False
-
-        for i in range(len(recent_bars) - 1):
-            bar = recent_bars.iloc[i]
-            purple_val = recent_purple.iloc[i]
-
-            if direction == 'BUY':
-                # For BUY: price should break above purple line
-                if bar['close'] > purple_val and bar['open'] <= purple_val:
-                    break_detected = True
-            else:  # SELL
-                # For SELL: price should break below purple line
-                if bar['close'] < purple_val and bar['open'] >= purple_val:
-                    break_detected = True
+        window = slice(-(lookback + 1), None)
+        signal = TechnicalIndicators.purple_line_break_retest_series(
+            np.asarray(df['open'])[window], np.asarray(df['close'])[window],
+            np.asarray(df['low'])[window], np.asarray(df['high'])[window],
+            np.asarray(purple_line)[window], direction, lookback
+        )
+        return bool(signal[-1])
 
-        if break_detected:
-            # Check for retest in most recent bars
-            current_bar = recent_bars.iloc[-1]
-            current_purple = recent_purple.iloc[-1]
 
-            # Retest: price touches or slightly crosses purple line again
-            tolerance = 0.0002  # Small tolerance for "touch"
+# get() default that tells a miss apart from a cached None
+_MISSING = object()
 
-            if direction == 'BUY':
-                # Price should come back down to touch purple from above
-                retest_detected = abs(current_bar['low'] - current_purple) <= tolerance
-            else:  # SELL
-                # Price should come back up to touch purple from below
-                retest_detected = abs(current_bar['high'] - current_purple) <= tolerance
 
-        return break_detected and retest_detected
+class IndicatorCache:
+    """
+    LRU memo for indicator outputs, valid until the next bar
 
+    Entries are keyed by (symbol, timeframe, indicator, params,
+    last_bar_time). A new bar produces a new key, and storing it drops the
+    entry for the previous bar, so every symbol/indicator holds one live
+    result. Least recently used entries are evicted once the estimated
+    size exceeds max_bytes, which keeps memory flat in a 24/7 process.
+    """
 
-class IndicatorCache:
-    """Cache for calculated indicators to avoid recalculation"""
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Approximate memory cap for cached values
+        """
+        self.max_bytes = max_bytes
+        self.cache: "OrderedDict[tuple, Tuple[any, int]]" = OrderedDict()  # key -> (value, bytes)
+        self._latest: Dict[tuple, tuple] = {}  # key without bar time -> current key
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
-    def __init__(self):
-        self.cache = {}
-        self.max_age_seconds = 60  # Cache validity
+    @staticmethod
+    def _sizeof(value) -> int:
+        """Approximate memory footprint of a cached value"""
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True))
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, (tuple, list)):
+            return sys.getsizeof(value) + sum(IndicatorCache._sizeof(v) for v in value)
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(IndicatorCache._sizeof(v) for v in value.values())
+        return sys.getsizeof(value)
+
+    def _remove(self, key: tuple):
+        value, size = self.cache.pop(key)
+        self.bytes -= size
+        if self._latest.get(key[:-1]) == key:
+            del self._latest[key[:-1]]
+
+    def get(self, symbol: str, timeframe: str, indicator: str, params: tuple, last_bar_time,
+            default: any = None) -> Optional[any]:
+        """Cached value for this bar, or `default` on a miss"""
+        key = (symbol, timeframe, indicator, params, last_bar_time)
+        with self._lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return self.cache[key][0]
+            self.misses += 1
+            return default
+
+    def set(self, symbol: str, timeframe: str, indicator: str, params: tuple, last_bar_time, value: any):
+        """Store a value computed on the bar opened at last_bar_time"""
+        key = (symbol, timeframe, indicator, params, last_bar_time)
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+            previous = self._latest.get(key[:-1])
+            if previous is not None and previous in self.cache:
+                self._remove(previous)  # Superseded by the new bar
+
+            self.cache[key] = (value, size)
+            self._latest[key[:-1]] = key
+            self.bytes += size
+
+            while self.bytes > self.max_bytes and len(self.cache) > 1:
+                self._remove(next(iter(self.cache)))
+                self.evictions += 1
+
+    def get_or_compute(self, symbol: str, timeframe: str, indicator: str, params: tuple,
+                       last_bar_time, compute: Callable[[], any]) -> any:
+        """
+        Return the cached value for this bar or compute and store it
 
-    def get(self, key: str) -> Optional[any]:
-        """Retrieve from cache if valid"""
-        if key in self.cache:
-            timestamp, value = self.cache[key]
-            if (pd.Timestamp.now() - timestamp).total_seconds() < self.max_age_seconds:
-                return value
-        return None
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe of the bars the indicator was computed on
+            indicator: Indicator name
+            params: Hashable indicator parameters
+            last_bar_time: Open time of the newest bar used
+            compute: Callable producing the value on a miss
 
-    def set(self, key: str, value: any):
-        """Store in cache with timestamp"""
-        self.cache[key] = (pd.Timestamp.now(), value)
+        Returns:
+            Indicator value
+        """
+        value = self.get(symbol, timeframe, indicator, params, last_bar_time, _MISSING)
+        if value is _MISSING:
+            with latency.timer('indicator.' + indicator, symbol):
+                value = compute()
+            self.set(symbol, timeframe, indicator, params, last_bar_time, value)
+        return value
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and memory use"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.cache),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total * 100 if total else 0.0,
+            'evictions': self.evictions,
+        }
 
     def clear(self):
         """Clear all cache"""
-        self.cache.clear()
+        with self._lock:
+            self.cache.clear()
+            self._latest.clear()
+            self.bytes = 0
 
 
 # Global indicator instance
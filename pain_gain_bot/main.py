@@ -4,57 +4,45 @@ Can run PainBot, GainBot, or both simultaneously
 """
 
 import argparse
-import threading
-import time
 from .bots.pain_bot import PainBot
 from .bots.gain_bot import GainBot
+from .bots.runtime import TradingRuntime
 from .utils.logger import logger
+from .utils.latency import latency
+from .utils.metrics import metrics
 from .config import config, load_config, save_config
 
-def run_pain_bot():
-    """Run PainBot in separate thread"""
-    print("[DEBUG] Creating PainBot instance...")
-    bot = PainBot()
-    print("[DEBUG] PainBot instance created, calling initialize()...")
-    if bot.initialize():
-        print("[DEBUG] PainBot initialized successfully, calling run()...")
-        bot.run()
+def run_bots(bots):
+    """Run bots on the shared asyncio runtime (one MT5 session)"""
+    runtime = TradingRuntime(bots)
+    logger.debug("Runtime created, calling initialize()...")
+    if runtime.initialize():
+        logger.debug("Runtime initialized successfully, calling run()...")
+        runtime.run()
     else:
-        print("[DEBUG] PainBot initialization FAILED")
+        logger.debug("Runtime initialization FAILED")
+        runtime.shutdown()
+
+def run_pain_bot():
+    """Run PainBot"""
+    logger.debug("Creating PainBot instance...")
+    run_bots([PainBot()])
 
 def run_gain_bot():
-    """Run GainBot in separate thread"""
-    bot = GainBot()
-    if bot.initialize():
-        bot.run()
+    """Run GainBot"""
+    run_bots([GainBot()])
 
 def run_both_bots():
-    """Run both bots in parallel"""
+    """Run both bots on one event loop and one MT5 session"""
     logger.info("="*70)
     logger.info(" Pain/Gain Trading System - Dual Bot Mode")
     logger.info("="*70)
 
-    # Create threads for each bot
-    pain_thread = threading.Thread(target=run_pain_bot, name="PainBot-Thread")
-    gain_thread = threading.Thread(target=run_gain_bot, name="GainBot-Thread")
-
-    # Start both threads
-    pain_thread.start()
-    time.sleep(2)  # Stagger startup
-    gain_thread.start()
-
-    logger.info("[OK] Both bots started in parallel mode")
-
-    # Wait for both to complete
-    try:
-        pain_thread.join()
-        gain_thread.join()
-    except KeyboardInterrupt:
-        logger.info("\nShutting down both bots...")
+    run_bots([PainBot(), GainBot()])
 
 def main():
     """Main entry point with CLI arguments"""
-    print("[DEBUG] main() started")
+    logger.debug("main() started")
     parser = argparse.ArgumentParser(
         description="Pain/Gain Trading Bot System",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -64,6 +52,7 @@ Examples:
   python -m pain_gain_bot.main --bot gain          # Run GainBot only
   python -m pain_gain_bot.main --bot both          # Run both bots
   python -m pain_gain_bot.main --config my.json    # Use custom config
+  python -m pain_gain_bot.main --simulated         # Offline MT5 simulator
         """
     )
 
@@ -92,6 +81,12 @@ Examples:
         help='Use live account (WARNING: real money)'
     )
 
+    parser.add_argument(
+        '--simulated',
+        action='store_true',
+        help='Use the offline MT5 simulator (replays the local bar store)'
+    )
+
     parser.add_argument(
         '--save-config',
         action='store_true',
@@ -108,9 +103,11 @@ Examples:
 
     # Load config - use specified file or default config.json
     config_file = args.config or "config.json"
-    print(f"[DEBUG] Loading configuration from: {config_file}")
+    logger.debug("Loading configuration from: %s", config_file)
     logger.info(f"Loading configuration from: {config_file}")
     load_config(config_file)
+    logger.configure(config.alerts)
+    latency.configure(config.monitoring)
 
     # Override demo/live setting
     if args.demo:
@@ -124,6 +121,10 @@ Examples:
             logger.info("Live trading cancelled by user")
             return
 
+    if args.simulated:
+        config.data.mt5_backend = 'simulated'
+        logger.warning("[!] SIMULATED MT5 BACKEND - no terminal, replaying bar store")
+
     # Save config and exit if requested
     if args.save_config:
         config_file = args.config or "config.json"
@@ -136,6 +137,7 @@ Examples:
     logger.info("Configuration Summary:")
     logger.info(f"  Mode: {'DEMO' if config.broker.use_demo else 'LIVE'}")
     logger.info(f"  Broker: {config.broker.server}")
+    logger.info(f"  MT5 Backend: {config.data.mt5_backend}")
     logger.info(f"  Pain Symbols: {', '.join(config.symbols.pain_symbols)}")
     logger.info(f"  Gain Symbols: {', '.join(config.symbols.gain_symbols)}")
     logger.info(f"  Lot Size: {config.risk.lot_size}")
@@ -144,11 +146,19 @@ Examples:
     logger.info(f"  Session: {config.session.session_start} - {config.session.session_end}")
     logger.info("-"*70 + "\n")
 
+    # Metrics endpoint (a busy port must not stop the bots)
+    if config.monitoring.metrics_enabled:
+        try:
+            metrics.configure(config.monitoring)
+            logger.info(f"Metrics: http://{config.monitoring.metrics_host}:{config.monitoring.metrics_port}/metrics")
+        except OSError as e:
+            logger.error("Metrics endpoint not started", e)
+
     # Run selected bot(s)
-    print(f"[DEBUG] Selected bot mode: {args.bot}")
+    logger.debug("Selected bot mode: %s", args.bot)
     if args.bot == 'pain':
         logger.info("Starting PainBot (SELL strategy)...")
-        print("[DEBUG] Calling run_pain_bot()...")
+        logger.debug("Calling run_pain_bot()...")
         run_pain_bot()
 
     elif args.bot == 'gain':
@@ -7,8 +7,10 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from ..data.mt5_connector import connector
-from ..indicators.technical import indicators
+from ..indicators.streaming import streaming_indicators
 from ..utils.logger import logger
+from ..utils.latency import latency
+from ..utils.metrics import metrics
 from ..utils.trade_exporter import trade_exporter
 from ..config import config
 
@@ -29,15 +31,19 @@ class OrderManager:
         self.last_entry_time = {}  # symbol -> datetime
         self.consecutive_orders = {}  # symbol -> count
 
-    def can_open_new_order(self, symbol: str) -> Tuple[bool, str]:
+    def can_open_new_order(self, symbol: str, snapshot=None) -> Tuple[bool, str]:
         """
         Check if a new order can be opened based on timing and purple line rules
 
+        Args:
+            symbol: Trading symbol
+            snapshot: MarketSnapshot for this cycle (default: read from the connector)
+
         Returns:
             (can_open, reason)
         """
         # Check if we have an existing position for this symbol
-        positions = connector.get_positions(symbol)
+        positions = (snapshot or connector).get_positions(symbol)
         bot_positions = [p for p in positions if p['magic'] == self.magic_number]
 
         # Check consecutive order limit
@@ -57,13 +63,20 @@ class OrderManager:
                 return False, f"Waiting period not complete ({minutes_since_last:.1f}/{min_wait_minutes} min)"
 
         # Check purple line condition
-        purple_line_ok, reason = self.check_purple_line_position(symbol)
+        purple_line_ok, reason = self.check_purple_line_position(symbol, snapshot)
         if not purple_line_ok:
             return False, reason
 
         return True, "OK"
 
-    def check_purple_line_position(self, symbol: str) -> Tuple[bool, str]:
+    def _purple_line_m5(self, symbol: str, snapshot=None) -> Optional[float]:
+        """Current M5 purple line from the warm-up-correct streaming EMA"""
+        period = config.strategy.purple_line_ema
+        if not streaming_indicators.update(symbol, 'M5', [period], snapshot):
+            return None
+        return streaming_indicators.ema(symbol, 'M5', period)
+
+    def check_purple_line_position(self, symbol: str, snapshot=None) -> Tuple[bool, str]:
         """
         Verify that price remains on correct side of purple line
 
@@ -71,13 +84,11 @@ class OrderManager:
             (position_ok, reason)
         """
         try:
-            df_m5 = connector.get_bars(symbol, 'M5', count=10)
-            if df_m5 is None:
+            purple_val = self._purple_line_m5(symbol, snapshot)
+            if purple_val is None:
                 return False, "Cannot retrieve M5 data"
 
-            purple_line = indicators.calculate_purple_line(df_m5, config.strategy.purple_line_ema)
-            current_price = df_m5['close'].iloc[-1]
-            purple_val = purple_line.iloc[-1]
+            current_price = streaming_indicators.last_close(symbol, 'M5')
 
             if self.bot_type == 'PAIN':  # SELL bot
                 # Price must remain BELOW purple line for sells
@@ -94,8 +105,10 @@ class OrderManager:
             logger.error(f"Error checking purple line for {symbol}", e)
             return False, "Purple line check failed"
 
+    @latency.timed('order.execute')
     def execute_order(self, symbol: str, action: str, volume: float,
-                      sl: float = 0.0, tp: float = 0.0) -> Optional[Dict]:
+                      sl: float = 0.0, tp: float = 0.0, snapshot=None,
+                      signal_price: Optional[float] = None) -> Optional[Dict]:
         """
         Execute market order with all validations
 
@@ -105,24 +118,27 @@ class OrderManager:
             volume: Lot size
             sl: Stop loss price
             tp: Take profit price
+            snapshot: MarketSnapshot for the pre-trade checks (the order itself uses a fresh quote)
+            signal_price: Price the signal fired at (for slippage statistics)
 
         Returns:
             Order result or None
         """
-        print(f"[DEBUG] OrderManager.execute_order() called: {action} {volume} {symbol}")
+        logger.debug("OrderManager.execute_order() called: %s %s %s", action, volume, symbol)
         try:
             # Final validation
-            print(f"[DEBUG] Checking if can open new order for {symbol}")
-            can_open, reason = self.can_open_new_order(symbol)
-            print(f"[DEBUG] can_open_new_order result: {can_open}, reason: {reason}")
+            logger.debug("Checking if can open new order for %s", symbol)
+            can_open, reason = self.can_open_new_order(symbol, snapshot)
+            logger.debug("can_open_new_order result: %s, reason: %s", can_open, reason)
             if not can_open:
                 logger.warning(f"Cannot open order for {symbol}: {reason}")
-                print(f"[DEBUG] Cannot open order - returning None")
+                logger.debug("Cannot open order - returning None")
+                metrics.inc('paingain_orders_total', bot=self.bot_type, symbol=symbol, result='blocked')
                 return None
 
             # Send order
             comment = f"{self.bot_type}Bot|{datetime.now().strftime('%H%M%S')}"
-            print(f"[DEBUG] Sending order to MT5: {action} {volume} {symbol}")
+            logger.debug("Sending order to MT5: %s %s %s", action, volume, symbol)
 
             result = connector.send_order(
                 symbol=symbol,
@@ -131,10 +147,15 @@ class OrderManager:
                 sl=sl,
                 tp=tp,
                 magic=self.magic_number,
-                comment=comment
+                comment=comment,
+                signal_price=signal_price
             )
-            print(f"[DEBUG] connector.send_order() result: {result}")
+            logger.debug("connector.send_order() result: %s", result)
+            if snapshot is not None:
+                snapshot.invalidate_account()
 
+            metrics.inc('paingain_orders_total', bot=self.bot_type, symbol=symbol,
+                        result='sent' if result else 'rejected')
             if result:
                 # Track order
                 entry_time = datetime.now()
@@ -174,9 +195,10 @@ class OrderManager:
 
         except Exception as e:
             logger.error(f"Error executing order for {symbol}", e)
+            metrics.inc('paingain_orders_total', bot=self.bot_type, symbol=symbol, result='error')
             return None
 
-    def check_exit_conditions(self, ticket: int) -> Tuple[bool, str]:
+    def check_exit_conditions(self, ticket: int, snapshot=None) -> Tuple[bool, str]:
         """
         Check if position should be closed
 
@@ -197,13 +219,11 @@ class OrderManager:
                 return False, "Hold period not complete"
 
             # After hold period, check purple line break (stop loss condition)
-            df_m5 = connector.get_bars(symbol, 'M5', count=10)
-            if df_m5 is None:
+            purple_val = self._purple_line_m5(symbol, snapshot)
+            if purple_val is None:
                 return False, "Cannot retrieve M5 data"
 
-            purple_line = indicators.calculate_purple_line(df_m5, config.strategy.purple_line_ema)
-            current_price = df_m5['close'].iloc[-1]
-            purple_val = purple_line.iloc[-1]
+            current_price = streaming_indicators.last_close(symbol, 'M5')
 
             # Check for purple line break (SL condition)
             if action == 'SELL':
@@ -222,13 +242,15 @@ class OrderManager:
             logger.error(f"Error checking exit for ticket {ticket}", e)
             return False, "Exit check error"
 
-    def close_position(self, ticket: int, reason: str = "") -> bool:
+    @latency.timed('order.close', symbol_arg=None)
+    def close_position(self, ticket: int, reason: str = "", snapshot=None) -> bool:
         """
         Close position by ticket
 
         Args:
             ticket: Position ticket
             reason: Reason for closing
+            snapshot: MarketSnapshot for this cycle (its account is refreshed after the close)
 
         Returns:
             True if closed successfully
@@ -242,12 +264,14 @@ class OrderManager:
 
             # Get current price and account balance
             if position:
-                tick = connector.get_tick(position['symbol'])
+                tick = (snapshot or connector).get_tick(position['symbol'])
                 exit_price = tick['bid'] if position['action'] == 'SELL' else tick['ask'] if tick else None
             else:
                 exit_price = None
 
             success = connector.close_position(ticket)
+            if snapshot is not None:
+                snapshot.invalidate_account()
 
             if success and position:
                 logger.info(f"[OK] Position closed: Ticket {ticket} ({reason})")
@@ -290,28 +314,28 @@ class OrderManager:
             logger.error(f"Error closing position {ticket}", e)
             return False
 
-    def manage_positions(self):
+    def manage_positions(self, snapshot=None):
         """
         Monitor and manage all active positions
-        Call this method periodically
+        Call this method periodically (with the cycle's MarketSnapshot)
         """
-        print(f"[DEBUG] OrderManager.manage_positions() called, active positions: {len(self.active_positions)}")
+        logger.debug("OrderManager.manage_positions() called, active positions: %s", len(self.active_positions))
         tickets_to_close = []
 
         for ticket in list(self.active_positions.keys()):
-            print(f"[DEBUG] Checking exit conditions for ticket {ticket}")
-            should_close, reason = self.check_exit_conditions(ticket)
-            print(f"[DEBUG] Ticket {ticket}: should_close={should_close}, reason={reason}")
+            logger.debug("Checking exit conditions for ticket %s", ticket)
+            should_close, reason = self.check_exit_conditions(ticket, snapshot)
+            logger.debug("Ticket %s: should_close=%s, reason=%s", ticket, should_close, reason)
 
             if should_close:
                 tickets_to_close.append((ticket, reason))
 
         # Close positions
         if tickets_to_close:
-            print(f"[DEBUG] Closing {len(tickets_to_close)} positions")
+            logger.debug("Closing %s positions", len(tickets_to_close))
         for ticket, reason in tickets_to_close:
-            print(f"[DEBUG] Closing ticket {ticket}, reason: {reason}")
-            self.close_position(ticket, reason)
+            logger.debug("Closing ticket %s, reason: %s", ticket, reason)
+            self.close_position(ticket, reason, snapshot)
 
     def reset_daily_counters(self):
         """Reset daily tracking variables"""
@@ -16,6 +16,7 @@ class RiskManager:
         self.daily_start_balance = 0.0
         self.daily_profit = 0.0
         self.daily_loss = 0.0
+        self.daily_pnl = 0.0  # Balance minus start balance at the last update
         self.trades_today = 0
         self.last_reset_date = None
         self.trading_halted = False
@@ -23,15 +24,15 @@ class RiskManager:
 
     def initialize(self):
         """Initialize risk manager with current account balance"""
-        print("[DEBUG] RiskManager.initialize() called")
+        logger.debug("RiskManager.initialize() called")
         account_info = connector.get_account_info()
         if account_info:
             self.daily_start_balance = account_info['balance']
             self.last_reset_date = datetime.now().date()
             logger.info(f"Risk Manager initialized: Start balance ${self.daily_start_balance:.2f}")
-            print(f"[DEBUG] Risk manager initialized: balance=${self.daily_start_balance:.2f}")
+            logger.debug("Risk manager initialized: balance=$%.2f", self.daily_start_balance)
         else:
-            print("[DEBUG] Failed to get account info for risk manager initialization")
+            logger.debug("Failed to get account info for risk manager initialization")
 
     def check_daily_reset(self):
         """Check if we need to reset daily counters (new trading day)"""
@@ -48,6 +49,7 @@ class RiskManager:
 
         self.daily_profit = 0.0
         self.daily_loss = 0.0
+        self.daily_pnl = 0.0
         self.trades_today = 0
         self.trading_halted = False
         self.halt_reason = ""
@@ -55,37 +57,41 @@ class RiskManager:
 
         logger.info(f"📅 Daily reset: New balance ${self.daily_start_balance:.2f}")
 
-    def update_daily_pnl(self):
-        """Update daily P/L tracking"""
-        account_info = connector.get_account_info()
+    def update_daily_pnl(self, snapshot=None):
+        """Update daily P/L tracking (from the cycle's MarketSnapshot if given)"""
+        account_info = (snapshot or connector).get_account_info()
         if not account_info:
             return
 
         current_balance = account_info['balance']
         daily_pnl = current_balance - self.daily_start_balance
+        self.daily_pnl = daily_pnl
 
         if daily_pnl > 0:
             self.daily_profit = daily_pnl
         else:
             self.daily_loss = abs(daily_pnl)
 
-    def check_daily_limits(self) -> Tuple[bool, str]:
+    def check_daily_limits(self, snapshot=None) -> Tuple[bool, str]:
         """
         Check if daily loss or profit limits have been reached
 
+        Args:
+            snapshot: MarketSnapshot for this cycle (default: read from the connector)
+
         Returns:
             (can_trade, reason)
         """
-        print("[DEBUG] RiskManager.check_daily_limits() called")
-        self.update_daily_pnl()
-        print(f"[DEBUG] Daily P/L: profit=${self.daily_profit:.2f}, loss=${self.daily_loss:.2f}")
+        logger.debug("RiskManager.check_daily_limits() called")
+        self.update_daily_pnl(snapshot)
+        logger.debug("Daily P/L: profit=$%.2f, loss=$%.2f", self.daily_profit, self.daily_loss)
 
         # Check daily loss limit
         if self.daily_loss >= config.risk.daily_stop_usd:
             self.trading_halted = True
             self.halt_reason = f"Daily loss limit reached: ${self.daily_loss:.2f} >= ${config.risk.daily_stop_usd:.2f}"
             logger.warning(f"[!] TRADING HALTED: {self.halt_reason}")
-            print(f"[DEBUG] DAILY LOSS LIMIT HIT: {self.halt_reason}")
+            logger.debug("DAILY LOSS LIMIT HIT: %s", self.halt_reason)
             return False, self.halt_reason
 
         # Check daily profit target
@@ -93,14 +99,14 @@ class RiskManager:
             self.trading_halted = True
             self.halt_reason = f"Daily profit target reached: ${self.daily_profit:.2f} >= ${config.risk.daily_target_usd:.2f}"
             logger.info(f"[OK] TRADING HALTED: {self.halt_reason}")
-            print(f"[DEBUG] DAILY PROFIT TARGET HIT: {self.halt_reason}")
+            logger.debug("DAILY PROFIT TARGET HIT: %s", self.halt_reason)
             return False, self.halt_reason
 
         if self.trading_halted:
-            print(f"[DEBUG] Trading halted: {self.halt_reason}")
+            logger.debug("Trading halted: %s", self.halt_reason)
             return False, self.halt_reason
 
-        print("[DEBUG] Daily limits OK - can trade")
+        logger.debug("Daily limits OK - can trade")
         return True, "OK"
 
     def calculate_position_size(self, symbol: str, account_balance: float) -> float:
@@ -129,7 +135,7 @@ class RiskManager:
 
         return lot_size
 
-    def validate_trade(self, symbol: str, action: str, volume: float) -> Tuple[bool, str]:
+    def validate_trade(self, symbol: str, action: str, volume: float, snapshot=None) -> Tuple[bool, str]:
         """
         Validate if trade can be executed based on risk rules
 
@@ -137,12 +143,13 @@ class RiskManager:
             symbol: Trading symbol
             action: 'BUY' or 'SELL'
             volume: Requested lot size
+            snapshot: MarketSnapshot for this cycle
 
         Returns:
             (can_trade, reason)
         """
         # Check daily limits
-        can_trade, reason = self.check_daily_limits()
+        can_trade, reason = self.check_daily_limits(snapshot)
         if not can_trade:
             return False, reason
 
@@ -159,7 +166,7 @@ class RiskManager:
                 return False, f"Volume above maximum: {volume} > {symbol_info['volume_max']}"
 
         # Check spread
-        tick = connector.get_tick(symbol)
+        tick = (snapshot or connector).get_tick(symbol)
         if tick:
             spread = tick['spread']
             max_spread = config.risk.max_spread_pips * symbol_info.get('point', 0.00001)
@@ -186,7 +193,7 @@ class RiskManager:
         else:
             in_session = session_start <= now <= session_end
 
-        print(f"[DEBUG] is_trading_session(): now={now}, session={session_start}-{session_end}, in_session={in_session}")
+        logger.debug("is_trading_session(): now=%s, session=%s-%s, in_session=%s", now, session_start, session_end, in_session)
         return in_session
 
     def get_daily_stats(self) -> Dict:
@@ -213,7 +220,7 @@ class RiskManager:
     def record_trade(self, profit: float):
         """Record completed trade for statistics"""
         self.trades_today += 1
-        logger.debug(f"Trade recorded: Profit ${profit:.2f}, Total today: {self.trades_today}")
+        logger.debug("Trade recorded: Profit $%.2f, Total today: %s", profit, self.trades_today)
 
     def get_risk_status(self) -> Dict:
         """Get comprehensive risk status"""
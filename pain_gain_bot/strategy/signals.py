@@ -4,37 +4,97 @@ Implements multi-timeframe analysis and entry/exit signals
 """
 
 import pandas as pd
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 from datetime import datetime
 from ..data.mt5_connector import connector
-from ..indicators.technical import indicators
+from ..indicators.technical import indicators, indicator_cache
+from ..indicators.streaming import streaming_indicators
 from ..utils.logger import logger
+from ..utils.latency import latency
 from ..config import config
 
 class SignalEngine:
     """Generates trading signals based on Pain/Gain multi-timeframe rules"""
 
+    # Timeframes each confirmation stage reads (re-evaluated when one closes)
+    STAGE_TIMEFRAMES = {
+        'd1_bias': ('D1',),
+        'h4_50_percent': ('H4', 'M15'),
+        'h1_shingle': ('H1',),
+        'm30_m15_snake': ('M30', 'M15'),
+        'm5_m1_entry': ('M5', 'M1'),
+    }
+
     def __init__(self):
         self.daily_bias = None  # 'BUY' or 'SELL'
         self.wick_50_level = None
         self.day_stopped = False
         self.last_analysis_time = None
+        self.stage_results = {}  # (symbol, stage) -> last result
 
-    def analyze_daily_bias(self, symbol: str) -> Tuple[Optional[str], Optional[float]]:
+    def _stage(self, symbol: str, stage: str, closed_timeframes: Optional[Iterable[str]], evaluate):
+        """
+        Result of a confirmation stage, re-evaluated only when needed
+
+        Args:
+            symbol: Trading symbol
+            stage: Key of STAGE_TIMEFRAMES
+            closed_timeframes: Timeframes closed since the last cycle (None = always evaluate)
+            evaluate: Callable computing the stage result
+
+        Returns:
+            Fresh result if one of the stage's timeframes closed, else the cached one
+        """
+        key = (symbol, stage)
+        if closed_timeframes is None or key not in self.stage_results or \
+           set(closed_timeframes) & set(self.STAGE_TIMEFRAMES[stage]):
+            with latency.timer('signal.' + stage, symbol):
+                self.stage_results[key] = evaluate()
+        else:
+            logger.debug("Reusing %s result for %s", stage, symbol)
+        return self.stage_results[key]
+
+    @staticmethod
+    def outcome(signal: Dict) -> str:
+        """
+        Gate that ended a generate_signal() evaluation
+
+        Returns:
+            'signal' if every gate passed, 'no_tick' if no price was
+            available, else the confirmation key that failed (d1_bias,
+            day_stopped, h4_50_percent, h1_shingle, m30_m15_snake, m5_m1_entry)
+        """
+        if signal['action']:
+            return 'signal'
+        confirmations = signal['confirmations']
+        if not confirmations:
+            return 'd1_bias'
+        if 'day_stopped' not in confirmations:
+            return 'no_tick'
+        return next(reversed(confirmations))  # generate_signal returns at the first failed gate
+
+    def analyze_daily_bias(self, symbol: str, snapshot=None) -> Tuple[Optional[str], Optional[float]]:
         """
         Analyze D1 timeframe to determine trading bias for the day
 
+        Args:
+            symbol: Trading symbol
+            snapshot: MarketSnapshot for this cycle (default: read from the connector)
+
         Returns:
             (bias, wick_50_level) - bias is 'BUY', 'SELL', or None
         """
         try:
-            df_d1 = connector.get_bars(symbol, 'D1', count=5)
+            df_d1 = (snapshot or connector).get_bars(symbol, 'D1', count=5)
             if df_d1 is None or len(df_d1) < 2:
                 logger.warning(f"Insufficient D1 data for {symbol}")
                 return None, None
 
             # Check wick direction
-            direction, wick_size, wick_50_level = indicators.check_wick_direction(df_d1)
+            direction, wick_size, wick_50_level = indicator_cache.get_or_compute(
+                symbol, 'D1', 'wick_direction', (), df_d1.index[-1],
+                lambda: indicators.check_wick_direction(df_d1)
+            )
 
             if direction == 'UP':
                 bias = 'BUY'
@@ -76,30 +136,40 @@ class SignalEngine:
 
         return False
 
-    def check_h4_confirmation(self, symbol: str, bias: str) -> Tuple[bool, Optional[float]]:
+    def check_h4_confirmation(self, symbol: str, bias: str, snapshot=None) -> Tuple[bool, Optional[float]]:
         """
         Check H4 50% Fibonacci confirmation
 
         Args:
             symbol: Trading symbol
             bias: 'BUY' or 'SELL'
+            snapshot: MarketSnapshot for this cycle
 
         Returns:
             (confirmed, fib_50_level)
         """
         try:
-            df_h4 = connector.get_bars(symbol, 'H4', count=10)
-            df_m15 = connector.get_bars(symbol, 'M15', count=50)
+            lookback = config.strategy.swing_lookbacks.get('M15', 20)
+            if not streaming_indicators.update(symbol, 'M15', [], snapshot, swing_lookbacks=[lookback]):
+                return False, None
 
-            if df_h4 is None or df_m15 is None:
+            df_h4 = (snapshot or connector).get_bars(symbol, 'H4', count=10)
+            swing = streaming_indicators.swing(symbol, 'M15', lookback)
+
+            if df_h4 is None or swing is None:
                 return False, None
 
-            confirmed, fib_level = indicators.check_h4_50_percent_coverage(df_h4, df_m15, bias)
+            # H4 closes fall on M15 closes, so the newest M15 bar identifies the inputs
+            last_m15 = streaming_indicators.bars(symbol, 'M15').index[-1]
+            confirmed, fib_level = indicator_cache.get_or_compute(
+                symbol, 'M15', 'h4_50_percent', (bias, lookback), last_m15,
+                lambda: indicators.check_h4_50_percent_coverage(df_h4, None, bias, lookback, swing=swing)
+            )
 
             if confirmed:
-                logger.debug(f"[OK] H4 confirmation: 50% Fib at {fib_level:.5f}")
+                logger.debug("[OK] H4 confirmation: 50%% Fib at %.5f", fib_level)
             else:
-                logger.debug(f"✗ H4 not confirmed")
+                logger.debug("✗ H4 not confirmed")
 
             return confirmed, fib_level
 
@@ -107,36 +177,38 @@ class SignalEngine:
             logger.error(f"Error checking H4 confirmation for {symbol}", e)
             return False, None
 
-    def check_h1_structure(self, symbol: str, bias: str) -> bool:
+    def check_h1_structure(self, symbol: str, bias: str, snapshot=None) -> bool:
         """
         Check H1 shingle confirmation
 
         Args:
             symbol: Trading symbol
             bias: 'BUY' or 'SELL'
+            snapshot: MarketSnapshot for this cycle
 
         Returns:
             True if H1 structure confirms bias
         """
         try:
-            df_h1 = connector.get_bars(symbol, 'H1', count=100)
-            if df_h1 is None:
+            period = config.strategy.shingle_ema
+            if not streaming_indicators.update(symbol, 'H1', [period], snapshot):
                 return False
 
-            shingle, color = indicators.calculate_shingle(df_h1, config.strategy.shingle_ema)
-            current_price = df_h1['close'].iloc[-1]
+            shingle = streaming_indicators.ema(symbol, 'H1', period)
+            current_price = streaming_indicators.last_close(symbol, 'H1')
+            color = 'GREEN' if current_price > shingle else 'RED'
 
             if bias == 'BUY':
                 # Price should be above green shingle
-                confirmed = current_price > shingle.iloc[-1] and color == 'GREEN'
+                confirmed = current_price > shingle and color == 'GREEN'
             else:  # SELL
                 # Price should be below red shingle
-                confirmed = current_price < shingle.iloc[-1] and color == 'RED'
+                confirmed = current_price < shingle and color == 'RED'
 
             if confirmed:
-                logger.debug(f"[OK] H1 shingle: {color} - confirmed")
+                logger.debug("[OK] H1 shingle: %s - confirmed", color)
             else:
-                logger.debug(f"✗ H1 shingle: {color} - not confirmed")
+                logger.debug("✗ H1 shingle: %s - not confirmed", color)
 
             return confirmed
 
@@ -144,38 +216,25 @@ class SignalEngine:
             logger.error(f"Error checking H1 structure for {symbol}", e)
             return False
 
-    def check_m30_m15_filter(self, symbol: str, bias: str) -> bool:
+    def check_m30_m15_filter(self, symbol: str, bias: str, snapshot=None) -> bool:
         """
         Check M30 and M15 snake color filter
 
         Args:
             symbol: Trading symbol
             bias: 'BUY' or 'SELL'
+            snapshot: MarketSnapshot for this cycle
 
         Returns:
             True if both M30 and M15 snake colors match bias
         """
         try:
-            df_m30 = connector.get_bars(symbol, 'M30', count=100)
-            df_m15 = connector.get_bars(symbol, 'M15', count=100)
+            m30_color = self._snake_color(symbol, 'M30', snapshot)
+            m15_color = self._snake_color(symbol, 'M15', snapshot)
 
-            if df_m30 is None or df_m15 is None:
+            if m30_color is None or m15_color is None:
                 return False
 
-            # Calculate snake for M30
-            m30_fast, m30_slow, m30_color = indicators.calculate_snake(
-                df_m30,
-                config.strategy.snake_fast_ema,
-                config.strategy.snake_slow_ema
-            )
-
-            # Calculate snake for M15
-            m15_fast, m15_slow, m15_color = indicators.calculate_snake(
-                df_m15,
-                config.strategy.snake_fast_ema,
-                config.strategy.snake_slow_ema
-            )
-
             if bias == 'BUY':
                 # Both should be GREEN
                 confirmed = m30_color == 'GREEN' and m15_color == 'GREEN'
@@ -184,9 +243,9 @@ class SignalEngine:
                 confirmed = m30_color == 'RED' and m15_color == 'RED'
 
             if confirmed:
-                logger.debug(f"[OK] M30/M15 snake: {m30_color}/{m15_color} - confirmed")
+                logger.debug("[OK] M30/M15 snake: %s/%s - confirmed", m30_color, m15_color)
             else:
-                logger.debug(f"✗ M30/M15 snake: {m30_color}/{m15_color} - not confirmed")
+                logger.debug("✗ M30/M15 snake: %s/%s - not confirmed", m30_color, m15_color)
 
             return confirmed
 
@@ -194,41 +253,58 @@ class SignalEngine:
             logger.error(f"Error checking M30/M15 filter for {symbol}", e)
             return False
 
-    def check_m5_m1_entry(self, symbol: str, bias: str) -> Tuple[bool, Optional[float]]:
+    def _snake_color(self, symbol: str, timeframe: str, snapshot=None) -> Optional[str]:
+        """Current snake color from the streaming fast/slow EMAs"""
+        fast_period = config.strategy.snake_fast_ema
+        slow_period = config.strategy.snake_slow_ema
+
+        if not streaming_indicators.update(symbol, timeframe, [fast_period, slow_period], snapshot):
+            return None
+
+        fast = streaming_indicators.ema(symbol, timeframe, fast_period)
+        slow = streaming_indicators.ema(symbol, timeframe, slow_period)
+        return 'GREEN' if fast > slow else 'RED'
+
+    def check_m5_m1_entry(self, symbol: str, bias: str, snapshot=None) -> Tuple[bool, Optional[float]]:
         """
         Check M5 and M1 entry conditions with purple line break/retest
 
         Args:
             symbol: Trading symbol
             bias: 'BUY' or 'SELL'
+            snapshot: MarketSnapshot for this cycle
 
         Returns:
             (entry_signal, entry_price)
         """
         try:
-            df_m5 = connector.get_bars(symbol, 'M5', count=20)
-            df_m1 = connector.get_bars(symbol, 'M1', count=20)
+            strategy = config.strategy
+            m1_periods = [strategy.purple_line_ema, strategy.squid_period,
+                          strategy.snake_fast_ema, strategy.snake_slow_ema]
 
-            if df_m5 is None or df_m1 is None:
+            if not streaming_indicators.update(symbol, 'M5', [strategy.purple_line_ema], snapshot):
+                return False, None
+            if not streaming_indicators.update(symbol, 'M1', m1_periods, snapshot):
                 return False, None
 
-            # Calculate purple line for M5
-            purple_line_m5 = indicators.calculate_purple_line(df_m5, config.strategy.purple_line_ema)
+            df_m1 = streaming_indicators.bars(symbol, 'M1')
 
-            # Calculate purple line and squid for M1
-            purple_line_m1 = indicators.calculate_purple_line(df_m1, config.strategy.purple_line_ema)
-            squid_m1, squid_color_m1 = indicators.calculate_squid(df_m1, config.strategy.squid_period)
+            # Purple line for M5 (current value) and M1 (break/retest window)
+            purple_m5 = streaming_indicators.ema(symbol, 'M5', strategy.purple_line_ema)
+            purple_line_m1 = streaming_indicators.ema_values(symbol, 'M1', strategy.purple_line_ema, count=6)
 
-            # Calculate snake for M1
-            m1_fast, m1_slow, m1_color = indicators.calculate_snake(
-                df_m1,
-                config.strategy.snake_fast_ema,
-                config.strategy.snake_slow_ema
-            )
+            # Squid for M1 (color from slope)
+            squid_m1 = streaming_indicators.ema_values(symbol, 'M1', strategy.squid_period, count=2)
+            squid_color_m1 = 'GREEN' if len(squid_m1) < 2 or squid_m1.iloc[-1] > squid_m1.iloc[-2] else 'RED'
+
+            # Snake for M1
+            m1_fast = streaming_indicators.ema(symbol, 'M1', strategy.snake_fast_ema)
+            m1_slow = streaming_indicators.ema(symbol, 'M1', strategy.snake_slow_ema)
+            m1_color = 'GREEN' if m1_fast > m1_slow else 'RED'
 
             # Get current prices
-            current_price_m5 = df_m5['close'].iloc[-1]
-            current_price_m1 = df_m1['close'].iloc[-1]
+            current_price_m5 = streaming_indicators.last_close(symbol, 'M5')
+            current_price_m1 = streaming_indicators.last_close(symbol, 'M1')
 
             # Check break-retest pattern
             break_retest = indicators.detect_purple_line_break_retest(
@@ -245,9 +321,9 @@ class SignalEngine:
                 # 3. M5 touching purple line or green squid
                 # 4. M1 aligned with M5
 
-                condition_1 = current_price_m1 > m1_fast.iloc[-1] and m1_color == 'GREEN'
+                condition_1 = current_price_m1 > m1_fast and m1_color == 'GREEN'
                 condition_2 = break_retest
-                condition_3 = abs(current_price_m5 - purple_line_m5.iloc[-1]) < 0.001  # Close to purple line
+                condition_3 = abs(current_price_m5 - purple_m5) < 0.001  # Close to purple line
 
                 entry_signal = condition_1 and condition_2 and condition_3
 
@@ -266,9 +342,9 @@ class SignalEngine:
                 # 3. M5 touching purple line or red squid
                 # 4. M1 aligned with M5
 
-                condition_1 = current_price_m1 < m1_fast.iloc[-1] and m1_color == 'RED'
+                condition_1 = current_price_m1 < m1_fast and m1_color == 'RED'
                 condition_2 = break_retest
-                condition_3 = abs(current_price_m5 - purple_line_m5.iloc[-1]) < 0.001
+                condition_3 = abs(current_price_m5 - purple_m5) < 0.001
 
                 entry_signal = condition_1 and condition_2 and condition_3
 
@@ -286,10 +362,20 @@ class SignalEngine:
             logger.error(f"Error checking M5/M1 entry for {symbol}", e)
             return False, None
 
-    def generate_signal(self, symbol: str) -> Dict:
+    @latency.timed('signal.generate')
+    def generate_signal(self, symbol: str, closed_timeframes: Optional[Iterable[str]] = None,
+                        snapshot=None) -> Dict:
         """
         Generate complete trading signal with all confirmations
 
+        Args:
+            symbol: Trading symbol
+            closed_timeframes: Timeframes whose bar just closed (from the bar-close
+                scheduler). Stages whose timeframes did not close reuse their last
+                result and no entry is checked without an M1/M5 close. None
+                evaluates every stage.
+            snapshot: MarketSnapshot for this cycle (default: read from the connector)
+
         Returns:
             Dictionary with signal details:
             {
@@ -300,7 +386,7 @@ class SignalEngine:
                 'timestamp': datetime
             }
         """
-        print(f"[DEBUG] SignalEngine.generate_signal() called for {symbol}")
+        logger.debug("SignalEngine.generate_signal() called for %s", symbol)
         signal = {
             'action': None,
             'symbol': symbol,
@@ -311,95 +397,101 @@ class SignalEngine:
 
         try:
             # Step 1: Check/refresh daily bias
-            print(f"[DEBUG] Step 1: Checking daily bias for {symbol}")
-            if self.daily_bias is None or self.last_analysis_time is None or \
+            logger.debug("Step 1: Checking daily bias for %s", symbol)
+            if closed_timeframes is not None:
+                bias, wick_level = self._stage(symbol, 'd1_bias', closed_timeframes,
+                                               lambda: self.analyze_daily_bias(symbol, snapshot))
+                self.daily_bias, self.wick_50_level = bias, wick_level
+            elif self.daily_bias is None or self.last_analysis_time is None or \
                (datetime.now() - self.last_analysis_time).total_seconds() > 3600:
-                print(f"[DEBUG] Analyzing daily bias (refresh needed)")
-                bias, wick_level = self.analyze_daily_bias(symbol)
+                logger.debug("Analyzing daily bias (refresh needed)")
+                bias, wick_level = self.analyze_daily_bias(symbol, snapshot)
                 self.last_analysis_time = datetime.now()
             else:
                 bias = self.daily_bias
-                print(f"[DEBUG] Using cached daily bias: {bias}")
+                logger.debug("Using cached daily bias: %s", bias)
 
             if bias is None:
-                logger.debug(f"{symbol}: No daily bias")
-                print(f"[DEBUG] No daily bias detected - returning")
+                logger.debug("%s: No daily bias", symbol)
                 return signal
 
             signal['confirmations']['d1_bias'] = bias
-            print(f"[DEBUG] Daily bias: {bias}")
+            logger.debug("Daily bias: %s", bias)
 
             # Step 2: Check if daily stop reached
-            print(f"[DEBUG] Step 2: Checking daily stop condition")
-            tick = connector.get_tick(symbol)
+            logger.debug("Step 2: Checking daily stop condition")
+            tick = (snapshot or connector).get_tick(symbol)
             if tick is None:
-                print(f"[DEBUG] No tick data - returning")
+                logger.debug("No tick data - returning")
                 return signal
 
             current_price = tick['bid'] if bias == 'SELL' else tick['ask']
-            print(f"[DEBUG] Current price: {current_price}")
+            logger.debug("Current price: %s", current_price)
 
             if self.check_daily_stop_condition(symbol, current_price):
-                logger.debug(f"{symbol}: Daily stop reached")
-                print(f"[DEBUG] Daily stop reached - returning")
+                logger.debug("%s: Daily stop reached", symbol)
                 signal['confirmations']['day_stopped'] = True
                 return signal
 
             signal['confirmations']['day_stopped'] = False
 
             # Step 3: H4 50% confirmation
-            print(f"[DEBUG] Step 3: Checking H4 confirmation")
-            h4_confirmed, fib_level = self.check_h4_confirmation(symbol, bias)
+            logger.debug("Step 3: Checking H4 confirmation")
+            h4_confirmed, fib_level = self._stage(symbol, 'h4_50_percent', closed_timeframes,
+                                                  lambda: self.check_h4_confirmation(symbol, bias, snapshot))
             signal['confirmations']['h4_50_percent'] = h4_confirmed
-            print(f"[DEBUG] H4 confirmed: {h4_confirmed}")
+            logger.debug("H4 confirmed: %s", h4_confirmed)
 
             if not h4_confirmed:
-                logger.debug(f"{symbol}: H4 not confirmed")
-                print(f"[DEBUG] H4 not confirmed - returning")
+                logger.debug("%s: H4 not confirmed", symbol)
                 return signal
 
             # Step 4: H1 structure
-            print(f"[DEBUG] Step 4: Checking H1 structure")
-            h1_confirmed = self.check_h1_structure(symbol, bias)
+            logger.debug("Step 4: Checking H1 structure")
+            h1_confirmed = self._stage(symbol, 'h1_shingle', closed_timeframes,
+                                       lambda: self.check_h1_structure(symbol, bias, snapshot))
             signal['confirmations']['h1_shingle'] = h1_confirmed
-            print(f"[DEBUG] H1 confirmed: {h1_confirmed}")
+            logger.debug("H1 confirmed: %s", h1_confirmed)
 
             if not h1_confirmed:
-                logger.debug(f"{symbol}: H1 not confirmed")
-                print(f"[DEBUG] H1 not confirmed - returning")
+                logger.debug("%s: H1 not confirmed", symbol)
                 return signal
 
             # Step 5: M30/M15 filter
-            print(f"[DEBUG] Step 5: Checking M30/M15 filter")
-            m30_m15_confirmed = self.check_m30_m15_filter(symbol, bias)
+            logger.debug("Step 5: Checking M30/M15 filter")
+            m30_m15_confirmed = self._stage(symbol, 'm30_m15_snake', closed_timeframes,
+                                            lambda: self.check_m30_m15_filter(symbol, bias, snapshot))
             signal['confirmations']['m30_m15_snake'] = m30_m15_confirmed
-            print(f"[DEBUG] M30/M15 confirmed: {m30_m15_confirmed}")
+            logger.debug("M30/M15 confirmed: %s", m30_m15_confirmed)
 
             if not m30_m15_confirmed:
-                logger.debug(f"{symbol}: M30/M15 not confirmed")
-                print(f"[DEBUG] M30/M15 not confirmed - returning")
+                logger.debug("%s: M30/M15 not confirmed", symbol)
                 return signal
 
             # Step 6: M5/M1 entry
-            print(f"[DEBUG] Step 6: Checking M5/M1 entry")
-            entry_signal, entry_price = self.check_m5_m1_entry(symbol, bias)
+            logger.debug("Step 6: Checking M5/M1 entry")
+            if closed_timeframes is None or \
+               set(closed_timeframes) & set(self.STAGE_TIMEFRAMES['m5_m1_entry']):
+                with latency.timer('signal.m5_m1_entry', symbol):
+                    entry_signal, entry_price = self.check_m5_m1_entry(symbol, bias, snapshot)
+            else:
+                entry_signal, entry_price = False, None  # Entries only fire on a bar close
             signal['confirmations']['m5_m1_entry'] = entry_signal
-            print(f"[DEBUG] M5/M1 entry signal: {entry_signal}, price: {entry_price}")
+            logger.debug("M5/M1 entry signal: %s, price: %s", entry_signal, entry_price)
 
             if entry_signal:
                 signal['action'] = bias
                 signal['price'] = entry_price
                 logger.info(f"[*] {bias} SIGNAL for {symbol} at {entry_price:.5f}")
-                print(f"[DEBUG] SIGNAL GENERATED: {bias} at {entry_price}")
+                logger.debug("SIGNAL GENERATED: %s at %s", bias, entry_price)
             else:
-                logger.debug(f"{symbol}: M5/M1 entry not confirmed")
-                print(f"[DEBUG] M5/M1 entry not confirmed - returning")
+                logger.debug("%s: M5/M1 entry not confirmed", symbol)
 
             return signal
 
         except Exception as e:
             logger.error(f"Error generating signal for {symbol}", e)
-            print(f"[DEBUG] Exception in generate_signal(): {type(e).__name__}: {e}")
+            logger.debug("Exception in generate_signal(): %s: %s", type(e).__name__, e)
             return signal
 
 
@@ -1,5 +1,8 @@
 """Utility modules for Pain/Gain trading bot"""
 
 from .logger import TradingLogger, AlertManager, logger
+from .latency import LatencyHistogram, LatencyTracker, latency
+from .metrics import MetricsExporter, metrics
 
-__all__ = ['TradingLogger', 'AlertManager', 'logger']
+__all__ = ['TradingLogger', 'AlertManager', 'logger', 'LatencyHistogram', 'LatencyTracker', 'latency',
+           'MetricsExporter', 'metrics']
@@ -0,0 +1,214 @@
+"""
+Hot-path latency instrumentation
+Monotonic-clock timers aggregated into per-(stage, symbol) histograms
+"""
+
+import functools
+import inspect
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Shared no-op context returned by timer() while instrumentation is off
+_NULL_TIMER = nullcontext()
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of durations in microseconds
+
+    Values below 2**SIGNIFICANT_BITS are counted exactly; larger values
+    keep their top SIGNIFICANT_BITS bits, so every bucket is within ~3%
+    of the values it holds whatever the magnitude (1 us to hours) and
+    recording is a couple of integer operations and a dict increment.
+    """
+
+    SIGNIFICANT_BITS = 6
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, micros: int):
+        """Count one duration (microseconds)"""
+        shift = max(micros.bit_length() - self.SIGNIFICANT_BITS, 0)
+        bucket = (shift << self.SIGNIFICANT_BITS) | (micros >> shift)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        if self.count == 0 or micros < self.min:
+            self.min = micros
+        if micros > self.max:
+            self.max = micros
+        self.count += 1
+        self.total += micros
+
+    def _bucket_value(self, bucket: int) -> int:
+        """Highest value that falls into a bucket"""
+        shift = bucket >> self.SIGNIFICANT_BITS
+        low = (bucket & ((1 << self.SIGNIFICANT_BITS) - 1)) << shift
+        return low + (1 << shift) - 1
+
+    def percentile(self, percent: float) -> int:
+        """
+        Duration at a percentile
+
+        Args:
+            percent: 0-100
+
+        Returns:
+            Microseconds (0 if nothing was recorded)
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, int(self.count * percent / 100.0 + 0.5))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(self._bucket_value(bucket), self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        """Count, mean and percentiles in microseconds"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class _Timer:
+    """Context manager recording the time spent in its block"""
+
+    __slots__ = ('tracker', 'stage', 'symbol', 'started')
+
+    def __init__(self, tracker: 'LatencyTracker', stage: str, symbol: str):
+        self.tracker = tracker
+        self.stage = stage
+        self.symbol = symbol
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracker.record(self.stage, self.symbol, time.perf_counter_ns() - self.started)
+        return False
+
+
+class LatencyTracker:
+    """
+    Per-stage latency histograms for the trading loop
+
+    Wrap a block with `with latency.timer('mt5.order_send', symbol):` or a
+    function with `@latency.timed('signal.generate')`. While disabled
+    (monitoring.latency_enabled = false, the default) timer() returns a
+    shared no-op context and timed() wrappers call straight through, so
+    instrumented code pays one attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+
+    def configure(self, monitoring=None):
+        """
+        Apply monitoring settings
+
+        Args:
+            monitoring: MonitoringConfig (latency_enabled); disabled when None
+        """
+        self.enabled = bool(getattr(monitoring, 'latency_enabled', False))
+
+    def record(self, stage: str, symbol: str, nanoseconds: int):
+        """Add one duration to the (stage, symbol) histogram"""
+        key = (stage, symbol or '')
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.record(nanoseconds // 1000)
+
+    def timer(self, stage: str, symbol: str = ''):
+        """
+        Context manager timing its block (no-op while disabled)
+
+        Args:
+            stage: Stage name, e.g. 'mt5.copy_rates' or 'signal.h1_shingle'
+            symbol: Symbol the work was for ('' for account-wide calls)
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage, symbol)
+
+    def timed(self, stage: str, symbol_arg: Optional[str] = 'symbol') -> Callable:
+        """
+        Decorator timing every call of a function
+
+        Args:
+            stage: Stage name
+            symbol_arg: Parameter holding the symbol (None to record under '')
+        """
+        def decorator(func):
+            params = list(inspect.signature(func).parameters)
+            position = params.index(symbol_arg) if symbol_arg in params else None
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                if position is not None and position < len(args):
+                    symbol = args[position]
+                else:
+                    symbol = kwargs.get(symbol_arg, '') if symbol_arg else ''
+                started = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(stage, symbol, time.perf_counter_ns() - started)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[Tuple[str, str], Dict]:
+        """Summary (see LatencyHistogram.summary) per (stage, symbol)"""
+        with self._lock:
+            return {key: histogram.summary() for key, histogram in sorted(self._histograms.items())}
+
+    def report(self) -> str:
+        """Text table of every histogram, in microseconds"""
+        rows = self.snapshot()
+        if not rows:
+            return "Latency: no samples"
+
+        elapsed = time.monotonic() - self.started
+        lines: List[str] = [
+            f"Latency over {elapsed / 60:.1f} min (microseconds)",
+            f"{'stage':<24} {'symbol':<14} {'count':>8} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"
+        ]
+        for (stage, symbol), row in rows.items():
+            lines.append(
+                f"{stage:<24} {symbol or '-':<14} {row['count']:>8} {row['mean']:>9.0f} "
+                f"{row['p50']:>9} {row['p90']:>9} {row['p99']:>9} {row['max']:>9}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        """Drop all samples"""
+        with self._lock:
+            self._histograms.clear()
+            self.started = time.monotonic()
+
+
+# Global latency tracker
+latency = LatencyTracker()
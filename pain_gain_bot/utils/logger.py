@@ -3,15 +3,26 @@ Logging and alerting system for Pain/Gain trading bots
 Provides file logging, console output, and alert notifications
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
 import traceback
 
 class TradingLogger:
-    """Enhanced logger with trading-specific features"""
+    """
+    Enhanced logger with trading-specific features
+
+    Callers only put records on an in-memory queue (QueueHandler); a
+    background QueueListener thread writes them to the log files and the
+    console, so the trading loop never waits on disk or terminal I/O.
+    Debug output is gated by the logger level: logger.debug("x=%s", x)
+    is a single level check when DEBUG is off, and the message is only
+    formatted when it is enabled.
+    """
 
     def __init__(self, name: str = "PainGainBot", log_dir: str = "logs"):
         self.name = name
@@ -20,10 +31,7 @@ class TradingLogger:
 
         # Create logger
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.DEBUG)
-
-        # Clear existing handlers
-        self.logger.handlers.clear()
+        self.logger.propagate = False
 
         # Create formatters
         self.detailed_formatter = logging.Formatter(
@@ -35,90 +43,143 @@ class TradingLogger:
             datefmt='%H:%M:%S'
         )
 
-        # File handlers
-        self._setup_file_handlers()
+        self._queue = queue.SimpleQueue()
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self.trade_handler = None
+        atexit.register(self.stop)
+
+        # Defaults match AlertConfig until configure() is called with the loaded config
+        self.configure()
+
+    def configure(self, alerts=None):
+        """
+        Apply logging settings and restart the background writer
+
+        Args:
+            alerts: AlertConfig (log_level, log_to_file, log_to_console,
+                log_rotation, log_max_mb, log_backup_count); defaults when None
+        """
+        level = getattr(alerts, 'log_level', 'INFO')
+        to_file = getattr(alerts, 'log_to_file', True)
+        to_console = getattr(alerts, 'log_to_console', True)
+
+        self.stop()
+        self.logger.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+
+        handlers = []
+        if to_file:
+            handlers += self._setup_file_handlers(
+                getattr(alerts, 'log_rotation', 'midnight'),
+                getattr(alerts, 'log_max_mb', 10.0),
+                getattr(alerts, 'log_backup_count', 14)
+            )
+        if to_console:
+            handlers.append(self._setup_console_handler())
 
-        # Console handler
-        self._setup_console_handler()
+        # Callers only enqueue; the listener thread does all formatting and I/O
+        self.logger.handlers.clear()
+        self.logger.addHandler(logging.handlers.QueueHandler(self._queue))
+        self._listener = logging.handlers.QueueListener(self._queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+
+    def _file_handler(self, filename: str, rotation: str, max_mb: float, backup_count: int) -> logging.Handler:
+        """Rotating file handler (daily at midnight, or by size)"""
+        path = self.log_dir / filename
+        if rotation == 'size':
+            return logging.handlers.RotatingFileHandler(
+                path, maxBytes=int(max_mb * 1024 * 1024), backupCount=backup_count,
+                encoding='utf-8', delay=True
+            )
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when='midnight', backupCount=backup_count, encoding='utf-8', delay=True
+        )
 
-    def _setup_file_handlers(self):
+    def _setup_file_handlers(self, rotation: str, max_mb: float, backup_count: int):
         """Set up file handlers for different log types"""
         # Main log file
-        main_log = self.log_dir / f"trading_{datetime.now().strftime('%Y%m%d')}.log"
-        main_handler = logging.FileHandler(main_log, encoding='utf-8')
+        main_handler = self._file_handler("trading.log", rotation, max_mb, backup_count)
         main_handler.setLevel(logging.DEBUG)
         main_handler.setFormatter(self.detailed_formatter)
-        self.logger.addHandler(main_handler)
 
         # Error log file
-        error_log = self.log_dir / f"errors_{datetime.now().strftime('%Y%m%d')}.log"
-        error_handler = logging.FileHandler(error_log, encoding='utf-8')
+        error_handler = self._file_handler("errors.log", rotation, max_mb, backup_count)
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(self.detailed_formatter)
-        self.logger.addHandler(error_handler)
 
-        # Trade log file
-        trade_log = self.log_dir / f"trades_{datetime.now().strftime('%Y%m%d')}.log"
-        self.trade_handler = logging.FileHandler(trade_log, encoding='utf-8')
+        # Trade log file (only records logged through trade())
+        self.trade_handler = self._file_handler("trades.log", rotation, max_mb, backup_count)
         self.trade_handler.setLevel(logging.INFO)
         self.trade_handler.setFormatter(self.detailed_formatter)
+        self.trade_handler.addFilter(lambda record: getattr(record, 'trade', False))
+
+        return [main_handler, error_handler, self.trade_handler]
 
-    def _setup_console_handler(self):
+    def _setup_console_handler(self) -> logging.Handler:
         """Set up console output handler"""
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(self.simple_formatter)
-        self.logger.addHandler(console_handler)
-
-    def debug(self, message: str):
-        """Log debug message"""
-        self.logger.debug(message)
-
-    def info(self, message: str):
+        return console_handler
+
+    def stop(self):
+        """Write out queued records and stop the background writer"""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+    @property
+    def debug_enabled(self) -> bool:
+        """True when debug messages are recorded (guard for costly debug-only work)"""
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def debug(self, message: str, *args):
+        """Log debug message (args are %-formatted only if DEBUG is enabled)"""
+        self.logger.debug(message, *args, stacklevel=2)
+
+    def info(self, message: str, *args):
         """Log info message"""
-        self.logger.info(message)
+        self.logger.info(message, *args, stacklevel=2)
 
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log warning message"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args, stacklevel=2)
 
     def error(self, message: str, exception: Optional[Exception] = None):
         """Log error message with optional exception"""
         if exception:
-            self.logger.error(f"{message}\n{traceback.format_exc()}")
+            self.logger.error(f"{message}\n{traceback.format_exc()}", stacklevel=2)
         else:
-            self.logger.error(message)
+            self.logger.error(message, stacklevel=2)
 
     def critical(self, message: str):
         """Log critical message"""
-        self.logger.critical(message)
+        self.logger.critical(message, stacklevel=2)
 
     def trade(self, action: str, symbol: str, details: dict):
         """Log trade-specific event"""
         trade_msg = f"TRADE | {action} | {symbol} | {details}"
-        self.logger.info(trade_msg)
-        self.trade_handler.handle(self.logger.makeRecord(
-            self.name, logging.INFO, "", 0, trade_msg, (), None
-        ))
+        self.logger.info(trade_msg, extra={'trade': True}, stacklevel=2)
 
     def signal(self, signal_type: str, symbol: str, timeframe: str, details: dict):
         """Log trading signal"""
         signal_msg = f"SIGNAL | {signal_type} | {symbol} | {timeframe} | {details}"
-        self.logger.info(signal_msg)
+        self.logger.info(signal_msg, stacklevel=2)
 
     def performance(self, metrics: dict):
         """Log performance metrics"""
         perf_msg = f"PERFORMANCE | {metrics}"
-        self.logger.info(perf_msg)
+        self.logger.info(perf_msg, stacklevel=2)
 
     def connection(self, status: str, details: str = ""):
         """Log connection events"""
         conn_msg = f"CONNECTION | {status} | {details}"
-        self.logger.info(conn_msg)
+        self.logger.info(conn_msg, stacklevel=2)
 
     def exception(self, message: str):
         """Log exception with full traceback"""
-        self.logger.exception(message)
+        self.logger.exception(message, stacklevel=2)
 
 
 class AlertManager:
@@ -0,0 +1,191 @@
+"""
+Prometheus-style metrics endpoint
+Counters and gauges served as text exposition format from a local HTTP thread
+"""
+
+import atexit
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Metric families: name -> (type, help)
+METRICS = {
+    'paingain_iterations_total': ('counter', 'Bot cycles started'),
+    'paingain_signals_total': ('counter', 'Signal evaluations by the gate that ended them (signal = all gates passed)'),
+    'paingain_orders_total': ('counter', 'Order attempts by result (sent, blocked, rejected, error)'),
+    'paingain_open_positions': ('gauge', 'Positions tracked by the order manager'),
+    'paingain_daily_pnl_usd': ('gauge', 'Daily P/L from the risk manager'),
+    'paingain_daily_start_balance_usd': ('gauge', 'Account balance at the daily reset'),
+    'paingain_trades_today': ('gauge', 'Trades recorded by the risk manager today'),
+    'paingain_trading_halted': ('gauge', '1 while the daily loss limit or profit target halts trading'),
+    'paingain_bar_cache_requests_total': ('counter', 'Connector bar cache lookups by result'),
+    'paingain_indicator_cache_requests_total': ('counter', 'Indicator cache lookups by result'),
+    'paingain_indicator_cache_bytes': ('gauge', 'Estimated memory held by the indicator cache'),
+    'paingain_stage_latency_seconds': ('summary', 'Stage latency (monitoring.latency_enabled)'),
+    'paingain_order_executions_total': ('counter', 'send_order calls by outcome (filled, rejected)'),
+    'paingain_order_retries_total': ('counter', 'Orders resent after a requote, price change or price off'),
+    'paingain_order_retcodes_total': ('counter', 'order_send results other than DONE by retcode'),
+    'paingain_order_ack_seconds': ('summary', 'order_send submit-to-ack latency of filled orders'),
+    'paingain_order_slippage_points': ('summary', 'Fill slippage versus the quote the order was priced at (positive = adverse)'),
+    'paingain_order_signal_drift_points': ('summary', 'Fill versus the signal price: spread, quote movement and slippage (positive = adverse)'),
+}
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _family(name: str) -> str:
+    """Metric family of a sample name (summary _sum/_count samples belong to their summary)"""
+    for suffix in ('_sum', '_count'):
+        if name not in METRICS and name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+class MetricsExporter:
+    """
+    In-process metric registry with an embedded /metrics endpoint
+
+    The trading loop only updates in-memory counters (inc/set: a dict
+    update under a lock). State that already lives in memory elsewhere -
+    risk manager P/L, cache statistics, latency histograms - is read by
+    collectors at scrape time. Collectors must not call the terminal, so a
+    scrape never waits on or blocks the terminal thread. The HTTP server
+    runs in its own daemon thread.
+    """
+
+    def __init__(self):
+        self._values: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        atexit.register(self.stop)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """Add to a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = float(value)
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """
+        Register a callable run at every scrape
+
+        Args:
+            collector: Returns (name, labels, value) samples from in-memory state
+        """
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """Unregister a collector"""
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    # ------------------------------------------------------------------
+    # Exposition
+    # ------------------------------------------------------------------
+    def samples(self) -> List[Sample]:
+        """Every current sample (recorded values and collector output)"""
+        with self._lock:
+            samples = [(name, dict(labels), value) for (name, labels), value in self._values.items()]
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                samples.extend(collector())
+            except Exception:
+                pass  # A broken collector must not take the endpoint down
+        return samples
+
+    def render(self) -> str:
+        """Samples in the Prometheus text exposition format"""
+        families: Dict[str, List[str]] = {}
+        for name, labels, value in self.samples():
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in sorted(labels.items()))
+            line = f"{name}{{{label_text}}} {value!r}" if label_text else f"{name} {value!r}"
+            families.setdefault(_family(name), []).append(line)
+
+        lines = []
+        for family in sorted(families):
+            kind, help_text = METRICS.get(family, ('untyped', ''))
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            lines.extend(sorted(families[family]))
+        return '\n'.join(lines) + '\n'
+
+    # ------------------------------------------------------------------
+    # HTTP server
+    # ------------------------------------------------------------------
+    def configure(self, monitoring=None):
+        """
+        Start or stop the endpoint
+
+        Args:
+            monitoring: MonitoringConfig (metrics_enabled, metrics_host, metrics_port);
+                stopped when None
+        """
+        self.stop()
+        if getattr(monitoring, 'metrics_enabled', False):
+            self.start(getattr(monitoring, 'metrics_host', '127.0.0.1'),
+                       getattr(monitoring, 'metrics_port', 9108))
+
+    def start(self, host: str = '127.0.0.1', port: int = 9108) -> int:
+        """
+        Serve /metrics in a background thread
+
+        Returns:
+            Port actually bound (useful with port 0)
+        """
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the trading log
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsExporter", daemon=True)
+        self._thread.start()
+        return self._server.server_address[1]
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    def stop(self):
+        """Stop the endpoint (recorded values are kept)"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+
+# Global metrics exporter
+metrics = MetricsExporter()
@@ -3,19 +3,29 @@ Trade history exporter - Exports bot trades to CSV files
 Similar to backtest output format
 """
 
+import atexit
 import csv
 import json
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict
 from ..utils.logger import logger
+from .trade_journal import TradeJournal, TRADE_COLUMNS
 
 
 class TradeExporter:
     """
-    Exports trading history to CSV and JSON files
+    Records trades in the trade journal and exports them on demand
+
+    Opens and closes are appended to <output_dir>/journal.db (see
+    TradeJournal), so recording costs the same however long the history
+    is, and trades opened before a restart can still be closed. CSV, JSON
+    and Parquet files are only written when an export is requested
+    (at bot shutdown).
     """
 
+    JOURNAL_FILE = "journal.db"
+
     def __init__(self, output_dir: str = "trade_history"):
         """
         Initialize trade exporter
@@ -25,8 +35,14 @@ class TradeExporter:
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
-        self.trades = []
-        print(f"[DEBUG] TradeExporter initialized: output_dir={self.output_dir}")
+        self.journal = TradeJournal(self.output_dir / self.JOURNAL_FILE)
+        atexit.register(self.journal.close)
+        logger.debug("TradeExporter initialized: output_dir=%s", self.output_dir)
+
+    @property
+    def trades(self) -> List[Dict]:
+        """Trades opened or closed this session (from the journal)"""
+        return self.journal.trades(session_only=True)
 
     def record_trade_open(self, trade_data: Dict):
         """
@@ -44,7 +60,7 @@ class TradeExporter:
                 - tp: Take profit
                 - bot_type: PAIN or GAIN
         """
-        print(f"[DEBUG] TradeExporter.record_trade_open() called: Ticket {trade_data.get('ticket')}")
+        logger.debug("TradeExporter.record_trade_open() called: Ticket %s", trade_data.get('ticket'))
 
         trade_record = {
             'ticket': trade_data.get('ticket'),
@@ -64,9 +80,9 @@ class TradeExporter:
             'balance_after': None
         }
 
-        self.trades.append(trade_record)
+        self.journal.record_open(trade_record)
         logger.info(f"[EXPORT] Trade recorded: {trade_record['action']} {trade_record['symbol']} @ {trade_record['entry_price']}")
-        print(f"[DEBUG] Trade record added to exporter, total trades: {len(self.trades)}")
+        logger.debug("Trade %s appended to journal", trade_record['ticket'])
 
     def record_trade_close(self, ticket: int, close_data: Dict):
         """
@@ -81,165 +97,132 @@ class TradeExporter:
                 - pnl: Profit/Loss
                 - balance_after: Account balance after close
         """
-        print(f"[DEBUG] TradeExporter.record_trade_close() called: Ticket {ticket}")
+        logger.debug("TradeExporter.record_trade_close() called: Ticket %s", ticket)
 
-        # Find the trade record
-        trade = None
-        for t in self.trades:
-            if t['ticket'] == ticket and t['status'] == 'OPEN':
-                trade = t
-                break
+        # Close the open trade by ticket (also finds trades opened before a restart)
+        trade = self.journal.record_close(ticket, {
+            'exit_price': close_data.get('exit_price'),
+            'exit_time': close_data.get('exit_time', datetime.now()).isoformat(),
+            'exit_reason': close_data.get('exit_reason', 'Unknown'),
+            'pnl': close_data.get('pnl', 0.0),
+            'balance_after': close_data.get('balance_after')
+        })
 
         if trade is None:
-            print(f"[DEBUG] WARNING: Trade {ticket} not found in exporter records")
+            logger.debug("WARNING: Trade %s not found in exporter records", ticket)
             logger.warning(f"[EXPORT] Trade {ticket} not found for closing")
             return
 
-        # Update with close data
-        trade['status'] = 'CLOSED'
-        trade['exit_price'] = close_data.get('exit_price')
-        trade['exit_time'] = close_data.get('exit_time', datetime.now()).isoformat()
-        trade['exit_reason'] = close_data.get('exit_reason', 'Unknown')
-        trade['pnl'] = close_data.get('pnl', 0.0)
-        trade['balance_after'] = close_data.get('balance_after')
-
         logger.info(f"[EXPORT] Trade closed: Ticket {ticket} | P/L: ${trade['pnl']:.2f}")
-        print(f"[DEBUG] Trade {ticket} updated with close data")
+        logger.debug("Trade %s close appended to journal", ticket)
 
-        # Auto-export after each trade closes
-        self.export_to_csv()
+    def _export_path(self, filename: str, extension: str) -> Path:
+        if filename is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"trade_history_{timestamp}.{extension}"
+        return self.output_dir / filename
 
-    def export_to_csv(self, filename: str = None):
+    def export_to_csv(self, filename: str = None, session_only: bool = True):
         """
-        Export all trades to CSV file
+        Export trades from the journal to a CSV file
 
         Args:
             filename: Custom filename (optional, auto-generated if not provided)
+            session_only: Only trades opened or closed this session (False = full history)
         """
-        if not self.trades:
-            print("[DEBUG] No trades to export")
+        stats = self.journal.statistics(session_only)
+        if stats['total_trades'] + stats['open_trades'] == 0:
+            logger.debug("No trades to export")
             return
 
-        if filename is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"trade_history_{timestamp}.csv"
-
-        filepath = self.output_dir / filename
-
-        print(f"[DEBUG] Exporting {len(self.trades)} trades to {filepath}")
+        filepath = self._export_path(filename, 'csv')
+        logger.debug("Exporting %s trades to %s", stats['total_trades'] + stats['open_trades'], filepath)
 
         try:
             with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                # Define CSV columns (same as backtest format)
-                fieldnames = [
-                    'ticket',
-                    'symbol',
-                    'bot_type',
-                    'action',
-                    'volume',
-                    'entry_price',
-                    'entry_time',
-                    'exit_price',
-                    'exit_time',
-                    'exit_reason',
-                    'sl',
-                    'tp',
-                    'pnl',
-                    'balance_after',
-                    'status'
-                ]
-
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                # Same columns as the backtest format, streamed from the journal
+                writer = csv.DictWriter(f, fieldnames=TRADE_COLUMNS)
                 writer.writeheader()
-                writer.writerows(self.trades)
+                writer.writerows(self.journal.iter_trades(session_only))
 
             logger.info(f"[EXPORT] Trade history exported: {filepath}")
-            print(f"[DEBUG] Export successful: {filepath}")
+            logger.debug("Export successful: %s", filepath)
 
             # Also print summary
-            closed_trades = [t for t in self.trades if t['status'] == 'CLOSED']
-            if closed_trades:
-                total_pnl = sum(t['pnl'] for t in closed_trades if t['pnl'] is not None)
-                winning = [t for t in closed_trades if t.get('pnl', 0) > 0]
-                win_rate = (len(winning) / len(closed_trades)) * 100 if closed_trades else 0
-
+            if stats['total_trades']:
                 print(f"\n[EXPORT] === Trade Summary ===")
-                print(f"[EXPORT] Total trades: {len(closed_trades)}")
-                print(f"[EXPORT] Winning trades: {len(winning)} ({win_rate:.1f}%)")
-                print(f"[EXPORT] Total P/L: ${total_pnl:.2f}")
+                print(f"[EXPORT] Total trades: {stats['total_trades']}")
+                print(f"[EXPORT] Winning trades: {stats['winning_trades']} ({stats['win_rate']:.1f}%)")
+                print(f"[EXPORT] Total P/L: ${stats['total_pnl']:.2f}")
                 print(f"[EXPORT] CSV saved: {filepath}")
                 print(f"[EXPORT] ========================\n")
 
         except Exception as e:
             logger.error(f"[EXPORT] Failed to export CSV: {e}")
-            print(f"[DEBUG] Export failed: {type(e).__name__}: {e}")
+            logger.debug("Export failed: %s: %s", type(e).__name__, e)
 
-    def export_to_json(self, filename: str = None):
+    def export_to_json(self, filename: str = None, session_only: bool = True):
         """
-        Export all trades to JSON file
+        Export trades from the journal to a JSON file
 
         Args:
             filename: Custom filename (optional)
+            session_only: Only trades opened or closed this session (False = full history)
         """
-        if not self.trades:
-            print("[DEBUG] No trades to export to JSON")
+        trades = self.journal.trades(session_only)
+        if not trades:
+            logger.debug("No trades to export to JSON")
             return
 
-        if filename is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"trade_history_{timestamp}.json"
-
-        filepath = self.output_dir / filename
-
-        print(f"[DEBUG] Exporting {len(self.trades)} trades to JSON: {filepath}")
+        filepath = self._export_path(filename, 'json')
+        logger.debug("Exporting %s trades to JSON: %s", len(trades), filepath)
 
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.trades, f, indent=2, default=str)
+                json.dump(trades, f, indent=2, default=str)
 
             logger.info(f"[EXPORT] Trade history exported to JSON: {filepath}")
-            print(f"[DEBUG] JSON export successful: {filepath}")
+            logger.debug("JSON export successful: %s", filepath)
 
         except Exception as e:
             logger.error(f"[EXPORT] Failed to export JSON: {e}")
-            print(f"[DEBUG] JSON export failed: {type(e).__name__}: {e}")
+            logger.debug("JSON export failed: %s: %s", type(e).__name__, e)
 
-    def get_statistics(self) -> Dict:
+    def export_to_parquet(self, filename: str = None, session_only: bool = False):
+        """
+        Export trades from the journal to a Parquet file (needs pyarrow)
+
+        Args:
+            filename: Custom filename (optional)
+            session_only: Only trades opened or closed this session (default: full history)
+        """
+        import pandas as pd
+
+        trades = self.journal.trades(session_only)
+        if not trades:
+            logger.debug("No trades to export to Parquet")
+            return
+
+        filepath = self._export_path(filename, 'parquet')
+        try:
+            pd.DataFrame(trades, columns=TRADE_COLUMNS).to_parquet(filepath, index=False)
+            logger.info(f"[EXPORT] Trade history exported to Parquet: {filepath}")
+        except ImportError as e:
+            logger.error(f"[EXPORT] Parquet export needs pyarrow (pip install pyarrow): {e}")
+        except Exception as e:
+            logger.error(f"[EXPORT] Failed to export Parquet: {e}")
+
+    def get_statistics(self, session_only: bool = True) -> Dict:
         """
         Calculate trading statistics
 
+        Args:
+            session_only: Only trades opened or closed this session (False = full history)
+
         Returns:
             Dictionary with statistics
         """
-        closed_trades = [t for t in self.trades if t['status'] == 'CLOSED']
-
-        if not closed_trades:
-            return {
-                'total_trades': 0,
-                'winning_trades': 0,
-                'losing_trades': 0,
-                'win_rate': 0,
-                'total_pnl': 0,
-                'avg_win': 0,
-                'avg_loss': 0
-            }
-
-        winning = [t for t in closed_trades if t.get('pnl', 0) > 0]
-        losing = [t for t in closed_trades if t.get('pnl', 0) <= 0]
-        total_pnl = sum(t.get('pnl', 0) for t in closed_trades)
-
-        return {
-            'total_trades': len(closed_trades),
-            'open_trades': len([t for t in self.trades if t['status'] == 'OPEN']),
-            'winning_trades': len(winning),
-            'losing_trades': len(losing),
-            'win_rate': (len(winning) / len(closed_trades)) * 100,
-            'total_pnl': total_pnl,
-            'avg_win': sum(t['pnl'] for t in winning) / len(winning) if winning else 0,
-            'avg_loss': sum(t['pnl'] for t in losing) / len(losing) if losing else 0,
-            'best_trade': max((t.get('pnl', 0) for t in closed_trades), default=0),
-            'worst_trade': min((t.get('pnl', 0) for t in closed_trades), default=0)
-        }
+        return self.journal.statistics(session_only)
 
     def print_summary(self):
         """
@@ -0,0 +1,261 @@
+"""
+Append-only trade journal
+Records trade open/close events in SQLite (WAL mode) with a per-ticket index
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Columns of a trade row (same order as the CSV export)
+TRADE_COLUMNS = [
+    'ticket',
+    'symbol',
+    'bot_type',
+    'action',
+    'volume',
+    'entry_price',
+    'entry_time',
+    'exit_price',
+    'exit_time',
+    'exit_reason',
+    'sl',
+    'tp',
+    'pnl',
+    'balance_after',
+    'status'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    session TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ticket ON events (ticket);
+CREATE INDEX IF NOT EXISTS events_session ON events (session, ticket);
+CREATE TABLE IF NOT EXISTS trades (
+    ticket INTEGER PRIMARY KEY,
+    symbol TEXT,
+    bot_type TEXT,
+    action TEXT,
+    volume REAL,
+    entry_price REAL,
+    entry_time TEXT,
+    exit_price REAL,
+    exit_time TEXT,
+    exit_reason TEXT,
+    sl REAL,
+    tp REAL,
+    pnl REAL,
+    balance_after REAL,
+    status TEXT,
+    session TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_session ON trades (session);
+"""
+
+
+class TradeJournal:
+    """
+    Event-sourced trade history in a single SQLite file
+
+    Every open and close is appended to the `events` table; the `trades`
+    table is a projection of those events keyed by ticket, updated in the
+    same transaction, so recording a trade is one indexed insert/update
+    regardless of how much history the journal holds. Every event is
+    committed as it is recorded: in WAL mode with synchronous=NORMAL a
+    commit is an append to the WAL file without an fsync, so a crashed or
+    killed process loses nothing it recorded (only an OS crash or power
+    loss can drop the newest commits). WAL also keeps readers and exports
+    from blocking the writer.
+
+    The journal survives restarts: a trade opened before a restart can
+    still be closed by ticket, and rebuild() replays the event log if the
+    projection is ever lost.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file (created on first write)
+        """
+        self.path = Path(path)
+        self.session = datetime.now().isoformat(timespec='microseconds')
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use (WAL, NORMAL sync)"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _append(self, ticket: int, event: str, data: Dict):
+        self.conn.execute(
+            "INSERT INTO events (ticket, event, recorded_at, session, data) VALUES (?, ?, ?, ?, ?)",
+            (ticket, event, datetime.now().isoformat(), self.session, json.dumps(data, default=str))
+        )
+
+    def _apply(self, event: str, data: Dict, session: str) -> bool:
+        """Update the trades projection with one event"""
+        if event == 'OPEN':
+            row = {column: data.get(column) for column in TRADE_COLUMNS}
+            row['session'] = session
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO trades ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                list(row.values())
+            )
+            return True
+
+        updated = self.conn.execute(
+            "UPDATE trades SET status = 'CLOSED', exit_price = ?, exit_time = ?, exit_reason = ?,"
+            " pnl = ?, balance_after = ? WHERE ticket = ? AND status = 'OPEN'",
+            (data.get('exit_price'), data.get('exit_time'), data.get('exit_reason'),
+             data.get('pnl'), data.get('balance_after'), data['ticket'])
+        )
+        return updated.rowcount > 0
+
+    def record_open(self, trade: Dict):
+        """
+        Append an OPEN event
+
+        Args:
+            trade: Trade row (TRADE_COLUMNS; times as ISO strings)
+        """
+        with self._lock:
+            self._append(trade['ticket'], 'OPEN', trade)
+            self._apply('OPEN', trade, self.session)
+            self.conn.commit()
+
+    def record_close(self, ticket: int, close: Dict) -> Optional[Dict]:
+        """
+        Append a CLOSE event for an open trade
+
+        Args:
+            ticket: Position ticket
+            close: exit_price, exit_time (ISO string), exit_reason, pnl, balance_after
+
+        Returns:
+            The closed trade row, or None if no open trade has this ticket
+        """
+        with self._lock:
+            data = {**close, 'ticket': ticket}
+            if not self._apply('CLOSE', data, self.session):
+                return None
+            self._append(ticket, 'CLOSE', data)
+            self.conn.commit()
+            return self.get(ticket)
+
+    def rebuild(self) -> int:
+        """
+        Recreate the trades projection by replaying the event log
+
+        Returns:
+            Number of events replayed
+        """
+        with self._lock:
+            conn = self.conn
+            conn.execute("DELETE FROM trades")
+            count = 0
+            for row in conn.execute("SELECT event, session, data FROM events ORDER BY id").fetchall():
+                self._apply(row['event'], json.loads(row['data']), row['session'])
+                count += 1
+            conn.commit()
+            return count
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _where(self, session_only: bool, status: Optional[str] = None):
+        clauses, params = [], []
+        if session_only:
+            # Any event this session: a trade opened before a restart and closed after it counts
+            clauses.append("ticket IN (SELECT ticket FROM events WHERE session = ?)")
+            params.append(self.session)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def get(self, ticket: int) -> Optional[Dict]:
+        """Trade row by ticket"""
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(TRADE_COLUMNS)} FROM trades WHERE ticket = ?", (ticket,)
+            ).fetchone()
+            return dict(row) if row else None
+
+    def iter_trades(self, session_only: bool = False, status: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Trade rows in ticket order, streamed from the database
+
+        Args:
+            session_only: Only trades opened or closed by this process
+            status: 'OPEN' or 'CLOSED' (default: both)
+        """
+        where, params = self._where(session_only, status)
+        with self._lock:
+            cursor = self.conn.execute(
+                f"SELECT {', '.join(TRADE_COLUMNS)} FROM trades{where} ORDER BY ticket", params
+            )
+            rows = cursor.fetchmany(1000)
+        while rows:
+            yield from (dict(row) for row in rows)
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+
+    def trades(self, session_only: bool = False, status: Optional[str] = None) -> List[Dict]:
+        """All matching trade rows as a list"""
+        return list(self.iter_trades(session_only, status))
+
+    def statistics(self, session_only: bool = False) -> Dict:
+        """Aggregate P/L statistics of closed trades (computed in SQL)"""
+        where, params = self._where(session_only, 'CLOSED')
+        open_where, open_params = self._where(session_only, 'OPEN')
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) AS total, SUM(pnl > 0) AS wins, COALESCE(SUM(pnl), 0) AS total_pnl,"
+                " AVG(CASE WHEN pnl > 0 THEN pnl END) AS avg_win,"
+                " AVG(CASE WHEN pnl <= 0 THEN pnl END) AS avg_loss,"
+                f" MAX(pnl) AS best, MIN(pnl) AS worst FROM trades{where}", params
+            ).fetchone()
+            open_trades = self.conn.execute(f"SELECT COUNT(*) FROM trades{open_where}", open_params).fetchone()[0]
+
+        total, wins = row['total'], row['wins'] or 0
+        return {
+            'total_trades': total,
+            'open_trades': open_trades,
+            'winning_trades': wins,
+            'losing_trades': total - wins,
+            'win_rate': (wins / total) * 100 if total else 0,
+            'total_pnl': row['total_pnl'],
+            'avg_win': row['avg_win'] or 0,
+            'avg_loss': row['avg_loss'] or 0,
+            'best_trade': row['best'] or 0,
+            'worst_trade': row['worst'] or 0
+        }
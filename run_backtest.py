@@ -5,12 +5,16 @@ Usage:
     python run_backtest.py --symbol "PainX 400" --days 7
     python run_backtest.py --symbol "GainX 400" --days 30 --bot gain
     python run_backtest.py --symbol "PainX 400" --days 30 --relaxed  # Weakened constraints
+    python run_backtest.py --symbol "PainX 400" --days 365 --vectorized  # Whole-history evaluation
+    python run_backtest.py --symbol "PainX 400" --days 30 --ticks  # Bid/ask fills on recorded ticks
 """
 
 import argparse
 from datetime import datetime, timedelta
 from pain_gain_bot.backtest.historical_backtester import HistoricalBacktester
 from pain_gain_bot.backtest.relaxed_backtester import RelaxedBacktester
+from pain_gain_bot.backtest.vectorized_backtester import VectorizedBacktester
+from pain_gain_bot.backtest.tick_replay import TickReplayBacktester
 
 def main():
     parser = argparse.ArgumentParser(description="Run backtest for Pain/Gain trading strategy")
@@ -67,8 +71,25 @@ def main():
         help='Use relaxed mode (weakened constraints, more trades)'
     )
 
+    parser.add_argument(
+        '--vectorized',
+        action='store_true',
+        help='Evaluate all 6 steps over the whole history at once (strict mode only)'
+    )
+
+    parser.add_argument(
+        '--ticks',
+        action='store_true',
+        help='Fill entries and exits on recorded bid/ask ticks (strict mode only)'
+    )
+
     args = parser.parse_args()
 
+    if args.relaxed and args.vectorized:
+        parser.error("--vectorized is only available in strict mode")
+    if args.ticks and (args.relaxed or args.vectorized):
+        parser.error("--ticks is only available in strict step-by-step mode")
+
     # Calculate dates
     if args.end:
         end_date = datetime.strptime(args.end, '%Y-%m-%d')
@@ -97,6 +118,11 @@ def main():
     else:
         print(f"Mode: STRICT (all 6 steps required)")
 
+    if args.vectorized:
+        print(f"Engine: VECTORIZED (full-history series, same signals as step-by-step)")
+    if args.ticks:
+        print(f"Execution: TICK REPLAY (bid/ask fills, spread and slippage checks)")
+
     print(f"\nStarting backtest...\n")
 
     # Run backtest with selected backtester
@@ -106,6 +132,18 @@ def main():
             end_date=end_date.strftime('%Y-%m-%d'),
             initial_balance=args.balance
         )
+    elif args.ticks:
+        backtester = TickReplayBacktester(
+            start_date=start_date.strftime('%Y-%m-%d'),
+            end_date=end_date.strftime('%Y-%m-%d'),
+            initial_balance=args.balance
+        )
+    elif args.vectorized:
+        backtester = VectorizedBacktester(
+            start_date=start_date.strftime('%Y-%m-%d'),
+            end_date=end_date.strftime('%Y-%m-%d'),
+            initial_balance=args.balance
+        )
     else:
         backtester = HistoricalBacktester(
             start_date=start_date.strftime('%Y-%m-%d'),
@@ -0,0 +1,123 @@
+"""
+Run backtests for many symbols and both bots in parallel
+
+Usage:
+    python run_parallel_backtest.py --days 30                         # All symbols x both bots
+    python run_parallel_backtest.py --symbols "PainX 400" "GainX 400" --bots pain
+    python run_parallel_backtest.py --days 365 --workers 16 --export yearly
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from pain_gain_bot.config import config
+from pain_gain_bot.backtest.parallel import BacktestJob, ParallelBacktestRunner, ENGINES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Pain/Gain backtests in parallel")
+
+    parser.add_argument(
+        '--symbols',
+        nargs='+',
+        help='Symbols to backtest (default: all configured Pain and Gain symbols)'
+    )
+
+    parser.add_argument(
+        '--bots',
+        nargs='+',
+        choices=['pain', 'gain'],
+        default=['pain', 'gain'],
+        help='Bot types to run for every symbol (default: pain gain)'
+    )
+
+    parser.add_argument(
+        '--days',
+        type=int,
+        default=30,
+        help='Number of days to backtest (default: 30)'
+    )
+
+    parser.add_argument(
+        '--start',
+        type=str,
+        help='Start date in YYYY-MM-DD format (overrides --days)'
+    )
+
+    parser.add_argument(
+        '--end',
+        type=str,
+        help='End date in YYYY-MM-DD format (default: today)'
+    )
+
+    parser.add_argument(
+        '--balance',
+        type=float,
+        default=500.0,
+        help='Initial balance per job in USD (default: 500)'
+    )
+
+    parser.add_argument(
+        '--engine',
+        choices=sorted(ENGINES),
+        default='vectorized',
+        help='Backtest engine (default: vectorized)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes (default: one per CPU core)'
+    )
+
+    parser.add_argument(
+        '--export',
+        type=str,
+        default='parallel_backtest',
+        help='Prefix for the exported CSV files (default: parallel_backtest)'
+    )
+
+    args = parser.parse_args()
+
+    end_date = datetime.strptime(args.end, '%Y-%m-%d') if args.end else datetime.now()
+    start_date = datetime.strptime(args.start, '%Y-%m-%d') if args.start else end_date - timedelta(days=args.days)
+
+    symbols = args.symbols or config.symbols.pain_symbols + config.symbols.gain_symbols
+    jobs = [
+        BacktestJob(
+            symbol=symbol,
+            bot_type=bot.upper(),
+            start_date=start_date.strftime('%Y-%m-%d'),
+            end_date=end_date.strftime('%Y-%m-%d'),
+            initial_balance=args.balance,
+            engine=args.engine,
+        )
+        for symbol in symbols
+        for bot in args.bots
+    ]
+
+    print("\n" + "="*70)
+    print(" Pain/Gain Parallel Backtesting")
+    print("="*70)
+    print(f"\nSymbols: {', '.join(symbols)}")
+    print(f"Bots: {', '.join(b.upper() for b in args.bots)}")
+    print(f"Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+    print(f"Engine: {args.engine.upper()}\n")
+
+    runner = ParallelBacktestRunner(jobs, max_workers=args.workers)
+    runner.run()
+
+    print("\n" + runner.summary()[['symbol', 'bot_type', 'total_trades', 'win_rate',
+                                    'total_pnl', 'final_balance']].to_string(index=False))
+
+    report = runner.combined_report()
+    print(f"\nCombined: {report['total_trades']} trades | Win rate: {report['win_rate']:.1f}% | "
+          f"P/L: ${report['total_pnl']:.2f} | Failed jobs: {report['failed_jobs']}")
+
+    runner.export_results(args.export)
+    print("="*70 + "\n")
+
+    return runner.results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Search strategy parameters with the vectorized backtester
+
+Usage:
+    python run_parameter_sweep.py --symbol "PainX 400" --days 60 --method lhs --samples 1000
+    python run_parameter_sweep.py --method grid --param snake_fast_ema=5,8,13 --param snake_slow_ema=21,34
+    python run_parameter_sweep.py --method random --samples 200 --param shingle_ema=30:80 --param hold_minutes=3:10
+
+Parameters are StrategyConfig fields. NAME=a,b,c lists values; NAME=low:high
+is an inclusive integer range. Without --param the default ranges are used.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from pain_gain_bot.backtest.sweep import (
+    DEFAULT_SPACE, ParameterSweep, grid_combinations, random_combinations, latin_hypercube
+)
+
+
+def parse_param(text: str):
+    """NAME=a,b,c -> (NAME, [a, b, c]); NAME=low:high -> (NAME, (low, high))"""
+    name, _, values = text.partition('=')
+    if ':' in values:
+        low, high = values.split(':')
+        return name.strip(), (int(low), int(high))
+    return name.strip(), [int(v) for v in values.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parameter sweep for the Pain/Gain strategy")
+
+    parser.add_argument(
+        '--symbol',
+        type=str,
+        default="PainX 400",
+        help='Symbol to backtest (default: "PainX 400")'
+    )
+
+    parser.add_argument(
+        '--bot',
+        choices=['pain', 'gain'],
+        default='pain',
+        help='Bot type: pain=SELL, gain=BUY (default: pain)'
+    )
+
+    parser.add_argument(
+        '--days',
+        type=int,
+        default=30,
+        help='Number of days to backtest (default: 30)'
+    )
+
+    parser.add_argument(
+        '--start',
+        type=str,
+        help='Start date in YYYY-MM-DD format (overrides --days)'
+    )
+
+    parser.add_argument(
+        '--end',
+        type=str,
+        help='End date in YYYY-MM-DD format (default: today)'
+    )
+
+    parser.add_argument(
+        '--balance',
+        type=float,
+        default=500.0,
+        help='Initial balance in USD (default: 500)'
+    )
+
+    parser.add_argument(
+        '--method',
+        choices=['grid', 'random', 'lhs'],
+        default='lhs',
+        help='Sampling: full grid, uniform random or Latin hypercube (default: lhs)'
+    )
+
+    parser.add_argument(
+        '--samples',
+        type=int,
+        default=200,
+        help='Number of combinations for random/lhs (default: 200)'
+    )
+
+    parser.add_argument(
+        '--param',
+        action='append',
+        default=[],
+        help='NAME=a,b,c or NAME=low:high (repeatable)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Random seed for random/lhs sampling (default: 42)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes (default: one per CPU core)'
+    )
+
+    parser.add_argument(
+        '--rank-by',
+        type=str,
+        default='total_pnl',
+        help='Result column to rank by (default: total_pnl)'
+    )
+
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=10,
+        help='Rows to print (default: 10)'
+    )
+
+    parser.add_argument(
+        '--export',
+        type=str,
+        help='Export the ranked table to CSV'
+    )
+
+    args = parser.parse_args()
+
+    end_date = datetime.strptime(args.end, '%Y-%m-%d') if args.end else datetime.now()
+    start_date = datetime.strptime(args.start, '%Y-%m-%d') if args.start else end_date - timedelta(days=args.days)
+
+    space = dict(parse_param(p) for p in args.param) if args.param else dict(DEFAULT_SPACE)
+
+    if args.method == 'grid':
+        grid = {name: list(range(v[0], v[1] + 1)) if isinstance(v, tuple) else v for name, v in space.items()}
+        combinations = grid_combinations(grid)
+    else:
+        ranges = {name: v if isinstance(v, tuple) else (min(v), max(v)) for name, v in space.items()}
+        sampler = random_combinations if args.method == 'random' else latin_hypercube
+        combinations = sampler(ranges, args.samples, args.seed)
+
+    print("\n" + "="*70)
+    print(" Pain/Gain Parameter Sweep")
+    print("="*70)
+    print(f"\nSymbol: {args.symbol}")
+    print(f"Bot type: {args.bot.upper()} ({'SELL' if args.bot == 'pain' else 'BUY'})")
+    print(f"Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+    print(f"Method: {args.method.upper()} | Combinations: {len(combinations)}")
+    print(f"Parameters: {', '.join(space)}\n")
+
+    sweep = ParameterSweep(
+        args.symbol,
+        'PAIN' if args.bot == 'pain' else 'GAIN',
+        start_date.strftime('%Y-%m-%d'),
+        end_date.strftime('%Y-%m-%d'),
+        initial_balance=args.balance,
+        max_workers=args.workers,
+    )
+    results = sweep.run(combinations, rank_by=args.rank_by)
+
+    print(f"\nTop {args.top} by {args.rank_by}:")
+    print(results.head(args.top).to_string())
+
+    filename = args.export or f"sweep_{args.symbol.replace(' ', '_')}_{args.bot}.csv"
+    sweep.export_results(filename)
+    print("="*70 + "\n")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
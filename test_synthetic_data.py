@@ -0,0 +1,107 @@
+"""
+Test script to verify synthetic data generation and resampling
+"""
+
+import tempfile
+import numpy as np
+from pain_gain_bot.data.store import BarStore
+from pain_gain_bot.data.resample import resample_rates, sync_resampled
+from pain_gain_bot.data.synthetic import SpikeIndexGenerator, bars_to_ticks
+from pain_gain_bot.data.mt5_api import mt5
+from pain_gain_bot.data.mt5_connector import connector
+from pain_gain_bot.config import config
+
+print("Testing synthetic data generation...\n")
+
+# Same seed must give the same bars
+print("1. Checking reproducibility...")
+first = SpikeIndexGenerator('PainX 400', seed=7).generate('2024-01-01', 10)
+second = SpikeIndexGenerator('PainX 400', seed=7).generate('2024-01-01', 10)
+assert np.array_equal(first, second)
+assert len(first) == 10 * 1440
+assert (first['high'] >= np.maximum(first['open'], first['close'])).all()
+assert (first['low'] <= np.minimum(first['open'], first['close'])).all()
+print("   [OK] Same seed, same bars\n")
+
+# Spikes point the right way
+print("2. Checking spike direction...")
+pain_moves = np.diff(np.log(first['close']))
+gain = SpikeIndexGenerator('GainX 400', seed=7).generate('2024-01-01', 10)
+gain_moves = np.diff(np.log(gain['close']))
+assert abs(pain_moves.min()) > pain_moves.max()
+assert gain_moves.max() > abs(gain_moves.min())
+print("   [OK] PainX spikes down, GainX spikes up\n")
+
+# Resampled bars must match the M1 bars they aggregate
+print("3. Checking resampling...")
+h4 = resample_rates(first, 'H4')
+bucket = first[:240]
+assert len(h4) == 10 * 6
+assert h4['time'][0] == first['time'][0]
+assert h4['open'][0] == bucket['open'][0]
+assert h4['high'][0] == bucket['high'].max()
+assert h4['low'][0] == bucket['low'].min()
+assert h4['close'][0] == bucket['close'][-1]
+assert h4['tick_volume'][0] == bucket['tick_volume'].sum()
+print("   [OK] H4 bars aggregate M1 correctly\n")
+
+# Store round trip
+print("4. Checking bar store output...")
+store = BarStore(tempfile.mkdtemp())
+written = SpikeIndexGenerator('GainX 600', seed=3).write_to_store('2024-01-01', 45, store, chunk_days=20)
+assert written == 45 * 1440
+assert len(store.read('GainX 600', 'D1')) == 45
+assert np.array_equal(store.read('GainX 600', 'M1'),
+                      SpikeIndexGenerator('GainX 600', seed=3).generate('2024-01-01', 45, chunk_days=20))
+print(f"   [OK] {written} M1 bars and D1..M5 written to {store.root}\n")
+
+# Higher timeframes built incrementally from stored M1 bars
+print("5. Checking incremental resampling...")
+base = BarStore(tempfile.mkdtemp())
+m1 = store.read('GainX 600', 'M1')
+for start in range(0, len(m1), 7000):
+    base.append('GainX 600', 'M1', m1[start:start + 7000])
+    sync_resampled('GainX 600', 'M1', ['M5', 'H4', 'D1'], store=base, offset=0)
+for timeframe in ('M5', 'H4', 'D1'):
+    built = base.read('GainX 600', timeframe)
+    # The last bucket waits for a later M1 bar
+    assert len(built) == len(store.read('GainX 600', timeframe)) - 1
+    assert np.array_equal(built, store.read('GainX 600', timeframe)[:-1])
+print("   [OK] M5, H4 and D1 match the one-pass resample\n")
+
+# Tick paths must reach the bar extremes and stream back in order
+print("6. Checking recorded ticks...")
+ticks = bars_to_ticks(m1[:1440], spread_points=2, digits=2)
+bids = ticks['bid'].reshape(-1, 4)
+assert len(ticks) == 4 * 1440
+assert np.array_equal(bids[:, 0], m1['open'][:1440]) and np.array_equal(bids[:, 3], m1['close'][:1440])
+assert np.array_equal(bids.max(axis=1), m1['high'][:1440]) and np.array_equal(bids.min(axis=1), m1['low'][:1440])
+assert (ticks['ask'] > ticks['bid']).all() and (np.diff(ticks['time_msc']) > 0).all()
+written = SpikeIndexGenerator('GainX 600', seed=3).write_ticks_to_store('2024-01-01', 45, store, chunk_days=20)
+assert written == 4 * 45 * 1440
+chunks = list(store.iter_ticks('GainX 600', '2024-01-02', '2024-01-03', chunk_size=1000))
+streamed = np.concatenate(chunks)
+assert max(len(chunk) for chunk in chunks) == 1000 and len(streamed) == 4 * 1440 + 1
+assert np.array_equal(streamed[:4 * 1440], bars_to_ticks(m1[1440:2880], 2, 2))
+print(f"   [OK] {written} ticks stored, streamed back in {len(chunks)} chunks\n")
+
+# Cached series must still show the forming bar as it moves
+print("7. Checking the connector bar cache against the simulator...")
+config.data.bar_store_dir = str(store.root)
+config.simulator.speed = 0
+mt5.use('simulated')
+mt5.set_time('2024-01-20 10:01:30')
+first = connector.get_bars('GainX 600', 'M15', 50)
+mt5.advance(300)
+second = connector.get_bars('GainX 600', 'M15', 50)
+assert first.index.equals(second.index)
+assert first.iloc[:-1].equals(second.iloc[:-1])
+assert first['close'].iloc[-1] != second['close'].iloc[-1]
+assert second['close'].iloc[-1] == mt5.symbol_info_tick('GainX 600').bid
+mt5.advance(900)
+third = connector.get_bars('GainX 600', 'M15', 50)
+assert third.equals(connector._fetch_bars('GainX 600', 'M15', 50))
+assert connector.bar_cache_stats == {'hits': 1, 'refreshes': 1, 'full_fetches': 1}
+print(f"   [OK] Forming close {first['close'].iloc[-1]} -> {second['close'].iloc[-1]} within one M15 bar\n")
+
+print("Test complete!")
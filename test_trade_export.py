@@ -2,8 +2,11 @@
 Test script to verify trade export functionality
 """
 
+import subprocess
+import sys
+import tempfile
 from datetime import datetime
-from pain_gain_bot.utils.trade_exporter import trade_exporter
+from pain_gain_bot.utils.trade_exporter import TradeExporter, trade_exporter
 
 print("Testing trade export functionality...\n")
 
@@ -48,4 +51,38 @@ if os.path.exists(trade_history_dir):
 else:
     print(f"\n4. ERROR: {trade_history_dir}/ directory does not exist!")
 
+# Journal must survive a restart: close a trade opened by a previous process
+print("\n5. Simulating restart with an open trade...")
+journal_dir = tempfile.mkdtemp()
+before = TradeExporter(journal_dir)
+before.record_trade_open({'ticket': 1, 'symbol': 'GainX 600', 'action': 'BUY', 'volume': 0.01,
+                          'entry_price': 100.0, 'bot_type': 'GAIN'})
+before.record_trade_open({'ticket': 2, 'symbol': 'GainX 600', 'action': 'BUY', 'volume': 0.01,
+                          'entry_price': 100.5, 'bot_type': 'GAIN'})
+before.journal.close()
+
+after = TradeExporter(journal_dir)
+after.record_trade_close(1, {'exit_price': 101.0, 'exit_reason': 'Hold period complete',
+                             'pnl': 1.0, 'balance_after': 501.0})
+assert after.journal.get(1)['status'] == 'CLOSED'
+assert after.get_statistics(session_only=False)['total_pnl'] == 1.0
+# Closed this session, so it belongs to the session export; ticket 2 saw no event yet
+assert [trade['ticket'] for trade in after.journal.trades(session_only=True)] == [1]
+assert after.get_statistics()['total_trades'] == 1 and after.get_statistics()['open_trades'] == 0
+assert after.journal.rebuild() == 3 and after.journal.get(1)['pnl'] == 1.0
+after.export_to_csv('history.csv', session_only=False)
+print(f"   [OK] Trade opened before the restart closed and exported from {journal_dir}")
+
+# A killed process must not lose a recorded trade (no close(), no atexit)
+print("\n6. Simulating a crash right after a trade opens...")
+crash_dir = tempfile.mkdtemp()
+subprocess.run([sys.executable, '-c', (
+    "import os, sys; from pain_gain_bot.utils.trade_journal import TradeJournal; "
+    "TradeJournal(sys.argv[1]).record_open({'ticket': 7, 'symbol': 'PainX 400', 'action': 'SELL', "
+    "'volume': 0.01, 'entry_price': 50.0, 'status': 'OPEN'}); os._exit(0)"
+), f"{crash_dir}/journal.db"], check=True)
+survivor = TradeExporter(crash_dir)
+assert [trade['ticket'] for trade in survivor.journal.trades()] == [7]
+print("   [OK] Trade recorded before the crash is in the reopened journal")
+
 print("\nTest complete!")